@@ -0,0 +1,177 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark of the deduplication of results of
+:py:class:`hatemile.util.html.bs.bshtmldomparser.BeautifulSoupHTMLDOMParser`
+queries.
+
+Execute it in the root directory of project:
+
+.. code-block:: bash
+
+    python -m benchmarks.benchmark_find
+"""
+
+import argparse
+import functools
+import timeit
+from hatemile.util.html.bs.bshtmldomparser import BeautifulSoupHTMLDOMParser
+
+#: The number of elements of synthetic documents used by default.
+DEFAULT_SIZES = [1000, 2000, 5000, 10000, 20000, 50000, 100000]
+
+#: The maximum number of elements that the linear scan deduplication is
+#: executed by default.
+DEFAULT_LEGACY_LIMIT = 20000
+
+
+def create_document(size):
+    """
+    Returns a synthetic HTML document.
+
+    :param size: The number of elements of document.
+    :type size: int
+    :return: The HTML code of document.
+    :rtype: str
+    """
+
+    rows = []
+    for index in range(0, (size - 4) // 4):
+        rows.append(
+            '<tr><td class="cell">'
+            + str(index)
+            + '</td><td><a href="#'
+            + str(index)
+            + '">link</a></td></tr>'
+        )
+    return (
+        '<html><body><table><tbody>'
+        + ''.join(rows)
+        + '</tbody></table></body></html>'
+    )
+
+
+def legacy_find(parser, selector):
+    """
+    Find all elements in the parser by selector, removing the repeated elements
+    with a linear scan of results, like the old implementation.
+
+    :param parser: The HTML parser.
+    :type parser: hatemile.util.html.htmldomparser.HTMLDOMParser
+    :param selector: The selector.
+    :type selector: str
+    :return: The elements found.
+    :rtype: list(bs4.element.Tag)
+    """
+
+    results = []
+    for sel in selector.split(','):
+        for result in parser.get_parser().select(sel):
+            found = False
+            for item in results:
+                if item is result:
+                    found = True
+                    break
+            if not found:
+                results.append(result)
+    return results
+
+
+def current_find(parser, selector):
+    """
+    Find all elements in the parser by selector, with the current
+    implementation, searching the results.
+
+    :param parser: The HTML parser.
+    :type parser: hatemile.util.html.htmldomparser.HTMLDOMParser
+    :param selector: The selector.
+    :type selector: str
+    :return: The elements found.
+    :rtype: list(hatemile.util.html.htmldomelement.HTMLDOMElement)
+    """
+
+    return parser.find(selector).list_results()
+
+
+def measure(function, repeat):
+    """
+    Returns the best time of execution of function.
+
+    :param function: The function.
+    :type function: function
+    :param repeat: The number of executions.
+    :type repeat: int
+    :return: The best time, in seconds.
+    :rtype: float
+    """
+
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main():
+    """
+    Execute the benchmark and print the times of each size of document.
+    """
+
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=DEFAULT_SIZES,
+        help='The number of elements of synthetic documents.'
+    )
+    argument_parser.add_argument(
+        '--legacy-limit',
+        type=int,
+        default=DEFAULT_LEGACY_LIMIT,
+        help='The maximum size that the linear scan is measured.'
+    )
+    argument_parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='The number of executions of each measure.'
+    )
+    arguments = argument_parser.parse_args()
+
+    selector = '*,td,a'
+    print(
+        'elements'.rjust(10)
+        + 'results'.rjust(10)
+        + 'linear (s)'.rjust(12)
+        + 'set (s)'.rjust(12)
+    )
+    for size in arguments.sizes:
+        parser = BeautifulSoupHTMLDOMParser(create_document(size))
+        results = len(current_find(parser, selector))
+        legacy_time = '-'
+        if size <= arguments.legacy_limit:
+            legacy_time = str(round(measure(
+                functools.partial(legacy_find, parser, selector),
+                arguments.repeat
+            ), 4))
+        current_time = str(round(measure(
+            functools.partial(current_find, parser, selector),
+            arguments.repeat
+        ), 4))
+        print(
+            str(size).rjust(10)
+            + str(results).rjust(10)
+            + legacy_time.rjust(12)
+            + current_time.rjust(12)
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark of the execution of all accessibility solutions by
+:py:class:`hatemile.util.accessibilitypipeline.AccessibilityPipeline`,
+compared with the sequential calls of methods documented in README, with and
+without the index of elements of parser.
+
+Execute it in the root directory of project:
+
+.. code-block:: bash
+
+    python -m benchmarks.benchmark_pipeline
+"""
+
+import argparse
+import re
+import time
+from hatemile.implementation.assoc import AccessibleAssociationImplementation
+from hatemile.implementation.css import AccessibleCSSImplementation
+from hatemile.implementation.display import AccessibleDisplayImplementation
+from hatemile.implementation.event import AccessibleEventImplementation
+from hatemile.implementation.form import AccessibleFormImplementation
+from hatemile.implementation.navig import AccessibleNavigationImplementation
+from hatemile.util.accessibilitypipeline import AccessibilityPipeline
+from hatemile.util.configure import Configure
+from hatemile.util.css.tinycss.tinycssparser import TinyCSSParser
+from hatemile.util.html.bs.bshtmldomparser import BeautifulSoupHTMLDOMParser
+
+#: The number of blocks of synthetic documents used by default.
+DEFAULT_SIZES = [10, 25, 50, 100, 200]
+
+#: The maximum number of blocks that the solutions are executed without the
+#: index of elements by default.
+DEFAULT_RESCANS_LIMIT = 50
+
+#: The HTML code of a block of synthetic documents.
+BLOCK = (
+    '<div class="block"><h2>Section {index}</h2>'
+    + '<p title="Paragraph {index}" aria-labelledby="header-{index}">'
+    + '<a href="/{index}" target="_blank">Link</a>'
+    + '<span lang="pt-BR">Texto</span></p>'
+    + '<form><label for="field-{index}">Name</label>'
+    + '<input id="field-{index}" type="email" required maxlength="20">'
+    + '</form>'
+    + '<table><tr><th id="header-{index}">Header</th></tr>'
+    + '<tr><td headers="header-{index}">Value</td></tr></table>'
+    + '<div role="alert" aria-busy="true" onclick="run()">Alert</div>'
+    + '<img src="{index}.png" alt="Image" longdesc="{index}.html">'
+    + '<button accesskey="b">Button</button></div>'
+)
+
+
+def create_document(size):
+    """
+    Returns a synthetic HTML document.
+
+    :param size: The number of blocks of document.
+    :type size: int
+    :return: The HTML code of document.
+    :rtype: str
+    """
+
+    blocks = []
+    for index in range(0, size):
+        blocks.append(BLOCK.replace('{index}', str(index)))
+    return (
+        '<!DOCTYPE html><html lang="en"><head><title>Benchmark</title>'
+        + '<style>p{speak:spell-out}</style></head><body>'
+        + ''.join(blocks)
+        + '</body></html>'
+    )
+
+
+def create_solutions(html_code, configure, use_index):
+    """
+    Returns the parser and the solutions for a HTML code.
+
+    :param html_code: The HTML code.
+    :type html_code: str
+    :param configure: The configuration of HaTeMiLe.
+    :type configure: hatemile.util.configure.Configure
+    :param use_index: Use the index of elements of parser.
+    :type use_index: bool
+    :return: The parser and the solutions of events, forms, navigation,
+             association, CSS and display.
+    :rtype: tuple
+    """
+
+    parser = BeautifulSoupHTMLDOMParser(html_code, use_index)
+    css_parser = TinyCSSParser(parser, 'http://localhost/')
+    return (
+        parser,
+        AccessibleEventImplementation(parser),
+        AccessibleFormImplementation(parser),
+        AccessibleNavigationImplementation(parser, configure),
+        AccessibleAssociationImplementation(parser),
+        AccessibleCSSImplementation(parser, css_parser, configure),
+        AccessibleDisplayImplementation(parser, configure)
+    )
+
+
+def run_sequential(solutions):
+    """
+    Execute all accessibility solutions with the sequential calls documented
+    in README.
+
+    :param solutions: The parser and the solutions.
+    :type solutions: tuple
+    :return: The HTML code generated.
+    :rtype: str
+    """
+
+    (
+        parser,
+        event,
+        form,
+        navigation,
+        association,
+        css,
+        display
+    ) = solutions
+    event.make_accessible_all_drag_and_drop_events()
+    event.make_accessible_all_click_events()
+    event.make_accessible_all_hover_events()
+    form.mark_all_required_fields()
+    form.mark_all_range_fields()
+    form.mark_all_autocomplete_fields()
+    form.mark_all_invalid_fields()
+    navigation.provide_navigation_by_all_headings()
+    navigation.provide_navigation_by_all_skippers()
+    navigation.provide_navigation_to_all_long_descriptions()
+    association.associate_all_data_cells_with_header_cells()
+    association.associate_all_labels_with_fields()
+    css.provide_all_speak_properties()
+    display.display_all_shortcuts()
+    display.display_all_roles()
+    display.display_all_cell_headers()
+    display.display_all_waiaria_states()
+    display.display_all_links_attributes()
+    display.display_all_titles()
+    display.display_all_languages()
+    display.display_all_alternative_text_images()
+    navigation.provide_navigation_by_all_skippers()
+    display.display_all_shortcuts()
+    return parser.get_html()
+
+
+def run_pipeline(solutions):
+    """
+    Execute all accessibility solutions with the pipeline.
+
+    :param solutions: The parser and the solutions.
+    :type solutions: tuple
+    :return: The HTML code generated.
+    :rtype: str
+    """
+
+    pipeline = AccessibilityPipeline(solutions[0])
+    pipeline.add_default_steps(*solutions[1:])
+    pipeline.run()
+    return solutions[0].get_html()
+
+
+def normalize_ids(html):
+    """
+    Returns the HTML code without the random part of IDs generated by
+    HaTeMiLe, to compare the HTML code generated by different executions.
+
+    :param html: The HTML code.
+    :type html: str
+    :return: The HTML code without random parts of IDs.
+    :rtype: str
+    """
+
+    return re.sub(r'(id-hatemile-[a-z]+-)[0-9a-f]+', r'\1', html)
+
+
+def measure(function, html_code, configure, use_index, repeat):
+    """
+    Returns the best time of execution of all accessibility solutions in a
+    HTML code, without the time of parsing.
+
+    :param function: The function that execute the solutions.
+    :type function: function
+    :param html_code: The HTML code.
+    :type html_code: str
+    :param configure: The configuration of HaTeMiLe.
+    :type configure: hatemile.util.configure.Configure
+    :param use_index: Use the index of elements of parser.
+    :type use_index: bool
+    :param repeat: The number of executions.
+    :type repeat: int
+    :return: The best time, in seconds, and the HTML code generated.
+    :rtype: tuple(float, str)
+    """
+
+    best_time = None
+    html = None
+    for _ in range(0, repeat):
+        solutions = create_solutions(html_code, configure, use_index)
+        start = time.perf_counter()
+        html = function(solutions)
+        elapsed = time.perf_counter() - start
+        if (best_time is None) or (elapsed < best_time):
+            best_time = elapsed
+    return (best_time, html)
+
+
+def main():
+    """
+    Execute the benchmark and print the times of each size of document.
+    """
+
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=DEFAULT_SIZES,
+        help='The number of blocks of synthetic documents.'
+    )
+    argument_parser.add_argument(
+        '--rescans-limit',
+        type=int,
+        default=DEFAULT_RESCANS_LIMIT,
+        help='The maximum size that the solutions are measured without index.'
+    )
+    argument_parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='The number of executions of each measure.'
+    )
+    arguments = argument_parser.parse_args()
+
+    configure = Configure()
+    print(
+        'blocks'.rjust(10)
+        + 'rescans (s)'.rjust(13)
+        + 'sequential (s)'.rjust(16)
+        + 'pipeline (s)'.rjust(14)
+        + 'same output'.rjust(13)
+    )
+    for size in arguments.sizes:
+        html_code = create_document(size)
+        rescans_time = '-'
+        rescans_html = None
+        if size <= arguments.rescans_limit:
+            rescans_time, rescans_html = measure(
+                run_sequential,
+                html_code,
+                configure,
+                False,
+                arguments.repeat
+            )
+            rescans_time = str(round(rescans_time, 4))
+        sequential_time, sequential_html = measure(
+            run_sequential,
+            html_code,
+            configure,
+            True,
+            arguments.repeat
+        )
+        pipeline_time, pipeline_html = measure(
+            run_pipeline,
+            html_code,
+            configure,
+            True,
+            arguments.repeat
+        )
+        pipeline_html = normalize_ids(pipeline_html)
+        print(
+            str(size).rjust(10)
+            + rescans_time.rjust(13)
+            + str(round(sequential_time, 4)).rjust(16)
+            + str(round(pipeline_time, 4)).rjust(14)
+            + str(
+                (
+                    (rescans_html is None)
+                    or (normalize_ids(rescans_html) == pipeline_html)
+                )
+                and (normalize_ids(sequential_html) == pipeline_html)
+            ).rjust(13)
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,708 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of functions to apply all accessibility solutions of HaTeMiLe in many
+documents, in parallel processes.
+"""
+
+import collections
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import mmap
+import os
+import time
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from hatemile import helper
+from hatemile.implementation.assoc import AccessibleAssociationImplementation
+from hatemile.implementation.css import AccessibleCSSImplementation
+from hatemile.implementation.display import AccessibleDisplayImplementation
+from hatemile.implementation.event import AccessibleEventImplementation
+from hatemile.implementation.form import AccessibleFormImplementation
+from hatemile.implementation.navig import AccessibleNavigationImplementation
+from hatemile.util.accessibilitypipeline import AccessibilityPipeline
+from hatemile.util.cache.resultcache import ResultCache
+from hatemile.util.cache.stylesheetcache import StyleSheetCache
+from hatemile.util.configure import Configure
+from hatemile.util.css.tinycss.tinycssparser import TinyCSSParser
+from hatemile.util.html.bs.bshtmldomparser import BeautifulSoupHTMLDOMParser
+
+#: The names of accessibility solutions, in the order that are applied.
+SOLUTIONS = ('event', 'form', 'navigation', 'association', 'css', 'display')
+
+#: The number of characters read at once of HTML files.
+CHUNK_SIZE = 65536
+
+#: The state of current worker process, loaded once by process.
+WORKER_STATE = {}
+
+#: The file of symbols used by the CSS solution.
+SYMBOLS_FILE = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__)
+)), 'symbols.xml')
+
+#: The file of skippers used by the navigation solution.
+SKIPPERS_FILE = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__)
+)), 'skippers.xml')
+
+
+def read_html_file(html_file):
+    """
+    Returns the content of a HTML file, read in chunks.
+
+    :param html_file: The path of HTML file or the file object, opened in text
+                      or binary mode.
+    :type html_file: str or os.PathLike or io.IOBase
+    :return: The HTML code, not decoded if the file object was opened in
+             binary mode.
+    :rtype: str or bytes
+    """
+
+    helper.require_not_none(html_file)
+
+    if isinstance(html_file, (str, os.PathLike)):
+        with open(html_file, 'r', encoding='utf-8') as opened_file:
+            return read_html_file(opened_file)
+    chunks = []
+    chunk = html_file.read(CHUNK_SIZE)
+    while chunk:
+        chunks.append(chunk)
+        chunk = html_file.read(CHUNK_SIZE)
+    if chunks and isinstance(chunks[0], bytes):
+        return b''.join(chunks)
+    return ''.join(chunks)
+
+
+@contextlib.contextmanager
+def map_html_file(html_file):
+    """
+    Map a HTML file in memory, to parse it without read it in a copy.
+
+    :param html_file: The path of HTML file.
+    :type html_file: str or os.PathLike
+    :return: The context manager that returns the HTML code, not decoded.
+    :rtype: contextlib.AbstractContextManager
+    """
+
+    helper.require_not_none(html_file)
+
+    with open(html_file, 'rb') as opened_file:
+        if os.fstat(opened_file.fileno()).st_size == 0:
+            yield b''
+        else:
+            with mmap.mmap(
+                opened_file.fileno(),
+                0,
+                access=mmap.ACCESS_READ
+            ) as html_code:
+                yield html_code
+
+
+@functools.lru_cache(maxsize=None)
+def _get_file_hash(file_name):
+    """
+    Returns the hash of content of a file. The file is read only once by
+    process.
+
+    :param file_name: The path of file.
+    :type file_name: str
+    :return: The SHA-256 hash of content of file.
+    :rtype: bytes
+    """
+
+    with open(file_name, 'rb') as opened_file:
+        return hashlib.sha256(opened_file.read()).digest()
+
+
+def _update_hash(hash_object, data):
+    """
+    Add a data, preceded by its length, in a hash.
+
+    :param hash_object: The hash.
+    :type hash_object: hashlib._Hash
+    :param data: The data.
+    :type data: bytes or memoryview
+    """
+
+    hash_object.update(len(data).to_bytes(8, 'big'))
+    hash_object.update(data)
+
+
+def get_cache_key(
+    html_code,
+    configure,
+    current_url=None,
+    solutions=None,
+    user_agent=None
+):
+    """
+    Returns the key of the result of a HTML code in a result cache. The key is
+    a hash of HTML code, of parameters of configuration, of files of symbols
+    and skippers, of shortcut prefix of user agent, of current URL and of
+    solutions applied, so the key changes when any of them changes.
+
+    :param html_code: The HTML code, not decoded or decoded.
+    :type html_code: str or bytes or bytearray or mmap.mmap
+    :param configure: The configuration of HaTeMiLe.
+    :type configure: hatemile.util.configure.Configure
+    :param current_url: The current URL of page.
+    :type current_url: str
+    :param solutions: The names of solutions applied, of SOLUTIONS, or None to
+                      apply all solutions.
+    :type solutions: collections.abc.Collection
+    :param user_agent: The user agent of the user.
+    :type user_agent: str
+    :return: The key, as a hexadecimal SHA-256 hash.
+    :rtype: str
+    """
+
+    helper.require_not_none(html_code, configure)
+    helper.require_valid_type(html_code, str, bytes, bytearray, mmap.mmap)
+    helper.require_valid_type(configure, Configure)
+    helper.require_valid_type(current_url, str)
+    helper.require_valid_type(user_agent, str)
+
+    if solutions is None:
+        solutions = SOLUTIONS
+    hash_object = hashlib.sha256()
+    # The decoded HTML codes and the HTML codes not decoded with same bytes
+    # can have different results, because of the declared encoding.
+    if isinstance(html_code, str):
+        _update_hash(hash_object, b'str')
+        _update_hash(
+            hash_object,
+            html_code.encode('utf-8', 'surrogatepass')
+        )
+    else:
+        _update_hash(hash_object, b'bytes')
+        with memoryview(html_code) as data:
+            _update_hash(hash_object, data)
+    _update_hash(hash_object, json.dumps(
+        configure.get_parameters(),
+        sort_keys=True
+    ).encode('utf-8'))
+    _update_hash(hash_object, _get_file_hash(SYMBOLS_FILE))
+    _update_hash(hash_object, _get_file_hash(SKIPPERS_FILE))
+    _update_hash(hash_object, json.dumps([
+        AccessibleDisplayImplementation.get_shortcut_prefix(
+            user_agent,
+            configure.get_parameter('attribute-accesskey-default')
+        ),
+        current_url,
+        [solution for solution in SOLUTIONS if solution in solutions]
+    ]).encode('utf-8'))
+    return hash_object.hexdigest()
+
+
+def _apply_solutions(
+    html_code,
+    configure,
+    current_url,
+    solutions,
+    user_agent,
+    fragment_cache,
+    stylesheet_cache
+):
+    """
+    Apply the accessibility solutions of HaTeMiLe in a HTML code.
+
+    :param html_code: The HTML code, not decoded or decoded, or the file
+                      object with the HTML code.
+    :type html_code: str or bytes or bytearray or mmap.mmap or io.IOBase
+    :param configure: The configuration of HaTeMiLe.
+    :type configure: hatemile.util.configure.Configure
+    :param current_url: The current URL of page.
+    :type current_url: str
+    :param solutions: The names of solutions applied.
+    :type solutions: collections.abc.Collection
+    :param user_agent: The user agent of the user.
+    :type user_agent: str
+    :param fragment_cache: The cache of results of fragments or None to not
+                           memoize the fragments.
+    :type fragment_cache: hatemile.util.cache.resultcache.ResultCache
+    :param stylesheet_cache: The cache of linked stylesheets or None to
+                             download the stylesheets of page.
+    :type stylesheet_cache: hatemile.util.cache.stylesheetcache.StyleSheetCache
+    :return: The HTML code more accessible or None if a memoized fragment was
+             changed, so the HTML code must be processed without the cache of
+             fragments.
+    :rtype: str
+    """
+
+    parser = BeautifulSoupHTMLDOMParser(html_code)
+    implementations = {
+        'event': AccessibleEventImplementation(parser),
+        'form': AccessibleFormImplementation(parser),
+        'navigation': AccessibleNavigationImplementation(parser, configure),
+        'association': AccessibleAssociationImplementation(parser),
+        'css': None,
+        'display': AccessibleDisplayImplementation(
+            parser,
+            configure,
+            user_agent
+        )
+    }
+    if 'css' in solutions:
+        implementations['css'] = AccessibleCSSImplementation(
+            parser,
+            TinyCSSParser(parser, current_url, cache=stylesheet_cache),
+            configure
+        )
+    fragment_context = ''
+    if fragment_cache is not None:
+        # The key of a empty page identifies the options of processing.
+        fragment_context = get_cache_key(
+            '',
+            configure,
+            solutions=solutions,
+            user_agent=user_agent
+        )
+    pipeline = AccessibilityPipeline(parser, fragment_cache, fragment_context)
+    pipeline.add_default_steps(*[
+        implementations[solution] if solution in solutions else None
+        for solution in SOLUTIONS
+    ])
+    html = None
+    if pipeline.run():
+        html = parser.get_html()
+    parser.clear_parser()
+    return html
+
+
+def make_accessible(
+    html_code,
+    configure,
+    current_url=None,
+    solutions=None,
+    user_agent=None,
+    cache=None,
+    fragment_cache=None,
+    stylesheet_cache=None
+):
+    """
+    Apply the accessibility solutions of HaTeMiLe in a HTML code.
+
+    :param html_code: The HTML code, not decoded or decoded, or the file
+                      object with the HTML code.
+    :type html_code: str or bytes or bytearray or mmap.mmap or io.IOBase
+    :param configure: The configuration of HaTeMiLe.
+    :type configure: hatemile.util.configure.Configure
+    :param current_url: The current URL of page.
+    :type current_url: str
+    :param solutions: The names of solutions applied, of SOLUTIONS, or None to
+                      apply all solutions.
+    :type solutions: collections.abc.Collection
+    :param user_agent: The user agent of the user.
+    :type user_agent: str
+    :param cache: The cache of results, searched by the key of HTML code
+                  before the HTML code is parsed, or None to not use a cache.
+    :type cache: hatemile.util.cache.resultcache.ResultCache
+    :param fragment_cache: The cache of results of fragments shared by many
+                           pages, as headers, navigations, footers and forms,
+                           or None to not memoize the fragments.
+    :type fragment_cache: hatemile.util.cache.resultcache.ResultCache
+    :param stylesheet_cache: The cache of linked stylesheets, shared by many
+                             pages, or None to download the stylesheets of
+                             page.
+    :type stylesheet_cache: hatemile.util.cache.stylesheetcache.StyleSheetCache
+    :return: The HTML code more accessible.
+    :rtype: str
+    """
+
+    helper.require_not_none(html_code, configure)
+    helper.require_valid_type(
+        html_code,
+        str,
+        bytes,
+        bytearray,
+        mmap.mmap,
+        io.IOBase
+    )
+    helper.require_valid_type(configure, Configure)
+    helper.require_valid_type(current_url, str)
+    helper.require_valid_type(user_agent, str)
+    helper.require_valid_type(cache, ResultCache)
+    helper.require_valid_type(fragment_cache, ResultCache)
+    helper.require_valid_type(stylesheet_cache, StyleSheetCache)
+
+    if solutions is None:
+        solutions = SOLUTIONS
+    for solution in solutions:
+        if solution not in SOLUTIONS:
+            raise ValueError('Invalid solution: ' + str(solution))
+
+    if (
+        ((cache is not None) or (fragment_cache is not None))
+        and (isinstance(html_code, io.IOBase))
+    ):
+        # The HTML code is read once, to compute its key and to process it
+        # again without the fragment cache.
+        html_code = read_html_file(html_code)
+    key = None
+    if cache is not None:
+        key = get_cache_key(
+            html_code,
+            configure,
+            current_url,
+            solutions,
+            user_agent
+        )
+        html = cache.get(key)
+        if html is not None:
+            return html
+
+    html = _apply_solutions(
+        html_code,
+        configure,
+        current_url,
+        solutions,
+        user_agent,
+        fragment_cache,
+        stylesheet_cache
+    )
+    if html is None:
+        html = _apply_solutions(
+            html_code,
+            configure,
+            current_url,
+            solutions,
+            user_agent,
+            None,
+            stylesheet_cache
+        )
+    if key is not None:
+        cache.put(key, html)
+    return html
+
+
+def _initialize_worker(
+    file_name,
+    locale_configuration,
+    fragment_cache,
+    stylesheet_cache
+):
+    """
+    Load the configuration of HaTeMiLe once in the worker process.
+
+    :param file_name: The full path of configuration file.
+    :type file_name: str
+    :param locale_configuration: The locale of configuration.
+    :type locale_configuration: tuple(str, str)
+    :param fragment_cache: The cache of results of fragments of the worker
+                           process.
+    :type fragment_cache: hatemile.util.cache.resultcache.ResultCache
+    :param stylesheet_cache: The cache of linked stylesheets of the worker
+                             process.
+    :type stylesheet_cache: hatemile.util.cache.stylesheetcache.StyleSheetCache
+    """
+
+    WORKER_STATE['configure'] = Configure(file_name, locale_configuration)
+    WORKER_STATE['fragment_cache'] = fragment_cache
+    WORKER_STATE['stylesheet_cache'] = stylesheet_cache
+
+
+def _process_document(document, solutions, user_agent):
+    """
+    Apply the accessibility solutions of HaTeMiLe in a document, in the
+    worker process.
+
+    :param document: The HTML code, the path of HTML file or a tuple with one
+                     of them and the current URL of page. The HTML files are
+                     mapped in memory.
+    :type document: str or bytes or os.PathLike or tuple
+    :param solutions: The names of solutions applied or None to apply all
+                      solutions.
+    :type solutions: tuple(str)
+    :param user_agent: The user agent of the user.
+    :type user_agent: str
+    :return: The HTML code more accessible and the time, in seconds, to read
+             and process the document.
+    :rtype: tuple(str, float)
+    """
+
+    start = time.perf_counter()
+    current_url = None
+    if isinstance(document, tuple):
+        document, current_url = document
+    if isinstance(document, os.PathLike):
+        with map_html_file(document) as html_code:
+            html = make_accessible(
+                html_code,
+                WORKER_STATE['configure'],
+                current_url,
+                solutions,
+                user_agent,
+                fragment_cache=WORKER_STATE['fragment_cache'],
+                stylesheet_cache=WORKER_STATE['stylesheet_cache']
+            )
+    else:
+        html = make_accessible(
+            document,
+            WORKER_STATE['configure'],
+            current_url,
+            solutions,
+            user_agent,
+            fragment_cache=WORKER_STATE['fragment_cache'],
+            stylesheet_cache=WORKER_STATE['stylesheet_cache']
+        )
+    return (html, time.perf_counter() - start)
+
+
+def _get_document_key(document, configure, solutions, user_agent):
+    """
+    Returns the key of the result of a document in a result cache.
+
+    :param document: The HTML code, the path of HTML file or a tuple with one
+                     of them and the current URL of page. The HTML files are
+                     mapped in memory.
+    :type document: str or bytes or os.PathLike or tuple
+    :param configure: The configuration of HaTeMiLe.
+    :type configure: hatemile.util.configure.Configure
+    :param solutions: The names of solutions applied or None to apply all
+                      solutions.
+    :type solutions: tuple(str)
+    :param user_agent: The user agent of the user.
+    :type user_agent: str
+    :return: The key of document.
+    :rtype: str
+    """
+
+    current_url = None
+    if isinstance(document, tuple):
+        document, current_url = document
+    if isinstance(document, os.PathLike):
+        with map_html_file(document) as html_code:
+            return get_cache_key(
+                html_code,
+                configure,
+                current_url,
+                solutions,
+                user_agent
+            )
+    return get_cache_key(
+        document,
+        configure,
+        current_url,
+        solutions,
+        user_agent
+    )
+
+
+def _get_result(entry, with_times, cache, return_exceptions):
+    """
+    Returns the result of a document processed by a worker process or found
+    in cache.
+
+    :param entry: The future of processing of document and the key of
+                  document, if the result must be kept in cache, or None.
+    :type entry: tuple(concurrent.futures.Future, str)
+    :param with_times: Return the time to read and process the document with
+                       the HTML code.
+    :type with_times: bool
+    :param cache: The cache of results.
+    :type cache: hatemile.util.cache.resultcache.ResultCache
+    :param return_exceptions: Return the exception raised by the processing
+                              of document, instead of raise it.
+    :type return_exceptions: bool
+    :return: The HTML code more accessible, or the exception, or a tuple with
+             it and the time, or None as time of a exception.
+    :rtype: str or Exception or tuple(str, float)
+    """
+
+    future, key = entry
+    try:
+        html, elapsed = future.result()
+    except Exception as error:  # pylint: disable=broad-except
+        if not return_exceptions:
+            raise
+        html = error
+        elapsed = None
+    else:
+        if key is not None:
+            cache.put(key, html)
+    if with_times:
+        return (html, elapsed)
+    return html
+
+
+def make_all_accessible(
+    documents,
+    max_workers=None,
+    max_in_flight=None,
+    file_name=None,
+    locale_configuration=None,
+    solutions=None,
+    with_times=False,
+    user_agent=None,
+    cache=None,
+    fragment_cache=None,
+    stylesheet_cache=None,
+    return_exceptions=False
+):
+    """
+    Apply the accessibility solutions of HaTeMiLe in many documents, in a
+    pool of processes. The configuration, the symbols and the skippers are
+    loaded once by process and the results are returned in the order of
+    documents, while the next documents are processed. The documents found in
+    cache are not sent to processes.
+
+    :param documents: The documents. Each document is a HTML code, decoded or
+                      not, the path of HTML file as a os.PathLike object or a
+                      tuple with one of them and the current URL of page, used
+                      to load the linked stylesheets. A str is always a HTML
+                      code, so the paths must be os.PathLike objects, as
+                      pathlib.Path.
+    :type documents: collections.abc.Iterable
+    :param max_workers: The number of processes or None to use the number of
+                        processors.
+    :type max_workers: int
+    :param max_in_flight: The maximum number of documents sent to processes
+                          and not returned or None to use the double of number
+                          of processes.
+    :type max_in_flight: int
+    :param file_name: The full path of configuration file.
+    :type file_name: str
+    :param locale_configuration: The locale of configuration.
+    :type locale_configuration: tuple(str, str)
+    :param solutions: The names of solutions applied, of SOLUTIONS, or None to
+                      apply all solutions.
+    :type solutions: collections.abc.Collection
+    :param with_times: Return the time, in seconds, to read and process each
+                       document with the HTML code.
+    :type with_times: bool
+    :param user_agent: The user agent of the user.
+    :type user_agent: str
+    :param cache: The cache of results, searched by the key of each document
+                  before the document is sent to processes, or None to not
+                  use a cache.
+    :type cache: hatemile.util.cache.resultcache.ResultCache
+    :param fragment_cache: The cache of results of fragments shared by many
+                           pages or None to not memoize the fragments. Each
+                           process uses a copy of cache, so a cache in memory
+                           is not shared by processes.
+    :type fragment_cache: hatemile.util.cache.resultcache.ResultCache
+    :param stylesheet_cache: The cache of linked stylesheets, shared by the
+                             pages, or None to download the stylesheets of
+                             each page. Each process uses a copy of cache, so
+                             only the stylesheets kept in a directory are
+                             shared by processes.
+    :type stylesheet_cache: hatemile.util.cache.stylesheetcache.StyleSheetCache
+    :param return_exceptions: Return the exception raised by the processing
+                              of a document in place of its HTML code, with
+                              None as time, and continue with the next
+                              documents, instead of raise the exception.
+    :type return_exceptions: bool
+    :return: The HTML code more accessible of each document or, if with_times
+             is True, a tuple with the HTML code and the time.
+    :rtype: collections.abc.Iterator
+    """
+
+    helper.require_not_none(documents)
+    helper.require_valid_type(max_workers, int)
+    helper.require_valid_type(max_in_flight, int)
+    helper.require_valid_type(file_name, str)
+    helper.require_valid_type(locale_configuration, tuple)
+    helper.require_valid_type(user_agent, str)
+    helper.require_valid_type(cache, ResultCache)
+    helper.require_valid_type(fragment_cache, ResultCache)
+    helper.require_valid_type(stylesheet_cache, StyleSheetCache)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = max_workers * 2
+    if max_workers < 1:
+        raise ValueError(
+            'max_workers must be at least 1: ' + str(max_workers)
+        )
+    if max_in_flight < 1:
+        raise ValueError(
+            'max_in_flight must be at least 1: ' + str(max_in_flight)
+        )
+    if solutions is not None:
+        solutions = tuple(solutions)
+        for solution in solutions:
+            if solution not in SOLUTIONS:
+                raise ValueError('Invalid solution: ' + str(solution))
+    configure = None
+    if cache is not None:
+        configure = Configure(file_name, locale_configuration)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_initialize_worker,
+        initargs=(
+            file_name,
+            locale_configuration,
+            fragment_cache,
+            stylesheet_cache
+        )
+    ) as executor:
+        futures = collections.deque()
+        try:
+            for document in documents:
+                if len(futures) >= max_in_flight:
+                    yield _get_result(
+                        futures.popleft(),
+                        with_times,
+                        cache,
+                        return_exceptions
+                    )
+                key = None
+                if cache is not None:
+                    start = time.perf_counter()
+                    try:
+                        key = _get_document_key(
+                            document,
+                            configure,
+                            solutions,
+                            user_agent
+                        )
+                    except Exception as error:  # pylint: disable=broad-except
+                        if not return_exceptions:
+                            raise
+                        future = Future()
+                        future.set_exception(error)
+                        futures.append((future, None))
+                        continue
+                    html = cache.get(key)
+                    if html is not None:
+                        future = Future()
+                        future.set_result(
+                            (html, time.perf_counter() - start)
+                        )
+                        futures.append((future, None))
+                        continue
+                futures.append((
+                    executor.submit(
+                        _process_document,
+                        document,
+                        solutions,
+                        user_agent
+                    ),
+                    key
+                ))
+            while futures:
+                yield _get_result(
+                    futures.popleft(),
+                    with_times,
+                    cache,
+                    return_exceptions
+                )
+        finally:
+            for future, _ in futures:
+                future.cancel()
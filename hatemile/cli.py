@@ -0,0 +1,479 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of the command-line tool of HaTeMiLe, that apply the accessibility
+solutions in HTML files, in the standard input or in the HTML files of
+directories.
+"""
+
+import argparse
+import collections
+import os
+import pathlib
+import stat
+import sys
+import tempfile
+import time
+from hatemile import helper
+from hatemile.batch import SOLUTIONS
+from hatemile.batch import make_all_accessible
+from hatemile.batch import read_html_file
+from hatemile.util.cache.fileresultcache import FileResultCache
+from hatemile.util.cache.stylesheetcache import StyleSheetCache
+
+#: The name of input that represents the standard input.
+STANDARD_INPUT = '-'
+
+#: The extensions of HTML files processed in directories by default.
+DEFAULT_EXTENSIONS = ['.html', '.htm']
+
+
+def write_file_atomically(file_name, content):
+    """
+    Write a content in a file, replacing the file only after the content was
+    written completely, so the file never has a partial content.
+
+    :param file_name: The path of file.
+    :type file_name: str or os.PathLike
+    :param content: The content of file.
+    :type content: str
+    """
+
+    helper.require_not_none(file_name, content)
+    helper.require_valid_type(content, str)
+
+    directory = os.path.dirname(os.path.abspath(file_name))
+    os.makedirs(directory, exist_ok=True)
+    temporary_file = tempfile.NamedTemporaryFile(
+        'w',
+        encoding='utf-8',
+        dir=directory,
+        prefix='.' + os.path.basename(file_name) + '.',
+        suffix='.tmp',
+        delete=False
+    )
+    try:
+        with temporary_file:
+            temporary_file.write(content)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        if os.path.exists(file_name):
+            mode = stat.S_IMODE(os.stat(file_name).st_mode)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(temporary_file.name, mode)
+        os.replace(temporary_file.name, file_name)
+    except BaseException:
+        if os.path.exists(temporary_file.name):
+            os.remove(temporary_file.name)
+        raise
+
+
+def find_html_files(directory, extensions):
+    """
+    Returns the HTML files of a directory and its subdirectories, while the
+    directories are walked.
+
+    :param directory: The path of directory.
+    :type directory: str
+    :param extensions: The extensions of HTML files.
+    :type extensions: list(str)
+    :return: The paths of HTML files, relative to directory.
+    :rtype: collections.abc.Iterator
+    """
+
+    extensions = tuple(extension.lower() for extension in extensions)
+    for root, directories, files in os.walk(directory):
+        directories.sort()
+        for file_name in sorted(files):
+            if file_name.lower().endswith(extensions):
+                yield os.path.relpath(os.path.join(root, file_name), directory)
+
+
+def find_jobs(inputs, output, in_place, extensions):
+    """
+    Returns the files that will be processed and where the results will be
+    written.
+
+    :param inputs: The paths of files and directories or STANDARD_INPUT.
+    :type inputs: list(str)
+    :param output: The path of output file, if only a file is processed, or
+                   the path of output directory or None to write in standard
+                   output.
+    :type output: str
+    :param in_place: Replace the input files by results.
+    :type in_place: bool
+    :param extensions: The extensions of HTML files of directories.
+    :type extensions: list(str)
+    :return: The path of each input file, or STANDARD_INPUT, with the path of
+             output file, or None to write in standard output.
+    :rtype: collections.abc.Iterator
+    :raise ValueError: If the standard input is used with other inputs or
+                       if many inputs have the same output file.
+    """
+
+    output_names = set()
+    for input_name, output_name in _find_all_jobs(
+        inputs,
+        output,
+        in_place,
+        extensions
+    ):
+        if output_name is not None:
+            key = os.path.normcase(os.path.abspath(output_name))
+            if key in output_names:
+                raise ValueError(
+                    'Many inputs have the same output file: ' + output_name
+                )
+            output_names.add(key)
+        yield (input_name, output_name)
+
+
+def _find_all_jobs(inputs, output, in_place, extensions):
+    """
+    Returns the files that will be processed and where the results will be
+    written, without check the outputs.
+
+    :param inputs: The paths of files and directories or STANDARD_INPUT.
+    :type inputs: list(str)
+    :param output: The path of output file, if only a file is processed, or
+                   the path of output directory or None to write in standard
+                   output.
+    :type output: str
+    :param in_place: Replace the input files by results.
+    :type in_place: bool
+    :param extensions: The extensions of HTML files of directories.
+    :type extensions: list(str)
+    :return: The path of each input file, or STANDARD_INPUT, with the path of
+             output file, or None to write in standard output.
+    :rtype: collections.abc.Iterator
+    """
+
+    single = (len(inputs) == 1) and (not os.path.isdir(inputs[0]))
+    for input_name in inputs:
+        if os.path.isdir(input_name):
+            for relative_name in find_html_files(input_name, extensions):
+                file_name = os.path.join(input_name, relative_name)
+                if in_place:
+                    yield (file_name, file_name)
+                else:
+                    yield (file_name, os.path.join(output, relative_name))
+        elif (input_name == STANDARD_INPUT) or (not in_place):
+            if single:
+                yield (input_name, output)
+            elif input_name == STANDARD_INPUT:
+                raise ValueError(
+                    'The standard input can not be used with other inputs.'
+                )
+            else:
+                yield (
+                    input_name,
+                    os.path.join(output, os.path.basename(input_name))
+                )
+        else:
+            yield (input_name, input_name)
+
+
+def report_error(input_name, error):
+    """
+    Write the error of processing of a file in standard error.
+
+    :param input_name: The path of input file or STANDARD_INPUT.
+    :type input_name: str
+    :param error: The error.
+    :type error: Exception
+    """
+
+    sys.stderr.write(
+        'hatemile: '
+        + input_name
+        + ': '
+        + type(error).__name__
+        + ': '
+        + str(error)
+        + '\n'
+    )
+
+
+def create_argument_parser():
+    """
+    Returns the parser of arguments of command-line tool.
+
+    :return: The parser of arguments.
+    :rtype: argparse.ArgumentParser
+    """
+
+    argument_parser = argparse.ArgumentParser(
+        prog='hatemile',
+        description='Convert HTML code in HTML code more accessible.'
+    )
+    argument_parser.add_argument(
+        'inputs',
+        nargs='*',
+        default=[STANDARD_INPUT],
+        help=(
+            'The HTML files or directories with HTML files. Use "-" or omit'
+            + ' to read the standard input.'
+        )
+    )
+    argument_parser.add_argument(
+        '-o',
+        '--output',
+        help=(
+            'The output file, if only a file is processed, or the output'
+            + ' directory. By default, the result of a file is written in the'
+            + ' standard output.'
+        )
+    )
+    argument_parser.add_argument(
+        '-i',
+        '--in-place',
+        action='store_true',
+        help='Replace the input files by results.'
+    )
+    argument_parser.add_argument(
+        '-s',
+        '--solutions',
+        nargs='+',
+        choices=SOLUTIONS,
+        default=list(SOLUTIONS),
+        help='The accessibility solutions applied. By default, all.'
+    )
+    argument_parser.add_argument(
+        '-j',
+        '--workers',
+        type=int,
+        default=None,
+        help='The number of processes. By default, the number of processors.'
+    )
+    argument_parser.add_argument(
+        '--max-in-flight',
+        type=int,
+        default=None,
+        help=(
+            'The maximum number of files processed at same time. By default,'
+            + ' the double of number of processes.'
+        )
+    )
+    argument_parser.add_argument(
+        '--extensions',
+        nargs='+',
+        default=DEFAULT_EXTENSIONS,
+        help='The extensions of HTML files of directories.'
+    )
+    argument_parser.add_argument(
+        '--url',
+        default=None,
+        help='The URL of pages, used to load the linked stylesheets.'
+    )
+    argument_parser.add_argument(
+        '--user-agent',
+        default=None,
+        help='The user agent of users, used to describe the shortcuts.'
+    )
+    argument_parser.add_argument(
+        '--cache',
+        default=None,
+        help=(
+            'The directory of cache of results. The files found in cache are'
+            + ' not processed again.'
+        )
+    )
+    argument_parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=FileResultCache.DEFAULT_MAX_SIZE,
+        help='The maximum size, in bytes, of each cache of results.'
+    )
+    argument_parser.add_argument(
+        '--fragment-cache',
+        default=None,
+        help=(
+            'The directory of cache of results of fragments shared by many'
+            + ' pages, as headers, navigations, footers and forms.'
+        )
+    )
+    argument_parser.add_argument(
+        '--stylesheet-cache',
+        default=None,
+        help=(
+            'The directory of cache of linked stylesheets, downloaded once by'
+            + ' the pages and revalidated by its HTTP headers.'
+        )
+    )
+    argument_parser.add_argument(
+        '--configuration',
+        default=None,
+        help='The configuration file of HaTeMiLe.'
+    )
+    argument_parser.add_argument(
+        '--locale',
+        default=None,
+        help='The locale of configuration, as "en_US" or "pt_BR".'
+    )
+    argument_parser.add_argument(
+        '-q',
+        '--quiet',
+        action='store_true',
+        help='Not print the time summary of files.'
+    )
+    return argument_parser
+
+
+def main(arguments=None):
+    """
+    Execute the command-line tool.
+
+    :param arguments: The arguments of command-line or None to use the
+                      arguments of process.
+    :type arguments: list(str)
+    :return: The exit status.
+    :rtype: int
+    """
+
+    argument_parser = create_argument_parser()
+    arguments = argument_parser.parse_args(arguments)
+
+    if arguments.in_place and (arguments.output is not None):
+        argument_parser.error('--output can not be used with --in-place.')
+    if arguments.in_place and (STANDARD_INPUT in arguments.inputs):
+        argument_parser.error('--in-place can not be used with "-".')
+    for input_name in arguments.inputs:
+        if (input_name != STANDARD_INPUT) and (not os.path.exists(input_name)):
+            argument_parser.error('No such file or directory: ' + input_name)
+    single = (
+        (len(arguments.inputs) == 1)
+        and (not os.path.isdir(arguments.inputs[0]))
+    )
+    if (not single) and (not arguments.in_place) and (
+        arguments.output is None
+    ):
+        argument_parser.error(
+            '--output or --in-place is required to process many files.'
+        )
+    try:
+        jobs = list(find_jobs(
+            arguments.inputs,
+            arguments.output,
+            arguments.in_place,
+            arguments.extensions
+        ))
+    except ValueError as error:
+        argument_parser.error(str(error))
+
+    locale_configuration = None
+    if arguments.locale is not None:
+        locale_configuration = (arguments.locale, 'UTF-8')
+    outputs = collections.deque()
+    cache = None
+    fragment_cache = None
+    stylesheet_cache = None
+    try:
+        if arguments.cache is not None:
+            cache = FileResultCache(arguments.cache, arguments.cache_size)
+        if arguments.fragment_cache is not None:
+            fragment_cache = FileResultCache(
+                arguments.fragment_cache,
+                arguments.cache_size
+            )
+        if arguments.stylesheet_cache is not None:
+            stylesheet_cache = StyleSheetCache(
+                arguments.stylesheet_cache,
+                max_file_size=arguments.cache_size
+            )
+    except OSError as error:
+        argument_parser.error(str(error))
+
+    def iter_documents():
+        """
+        Returns the documents processed, keeping the outputs of each one.
+
+        :return: The documents.
+        :rtype: collections.abc.Iterator
+        """
+
+        for input_name, output_name in jobs:
+            outputs.append((input_name, output_name))
+            if input_name == STANDARD_INPUT:
+                document = read_html_file(sys.stdin.buffer)
+            else:
+                document = pathlib.Path(input_name)
+            if arguments.url is not None:
+                document = (document, arguments.url)
+            yield document
+
+    start = time.perf_counter()
+    count = 0
+    failures = 0
+    try:
+        for html, elapsed in make_all_accessible(
+            iter_documents(),
+            max_workers=arguments.workers,
+            max_in_flight=arguments.max_in_flight,
+            file_name=arguments.configuration,
+            locale_configuration=locale_configuration,
+            solutions=arguments.solutions,
+            with_times=True,
+            user_agent=arguments.user_agent,
+            cache=cache,
+            fragment_cache=fragment_cache,
+            stylesheet_cache=stylesheet_cache,
+            return_exceptions=True
+        ):
+            input_name, output_name = outputs.popleft()
+            if isinstance(html, Exception):
+                report_error(input_name, html)
+                failures += 1
+                continue
+            if output_name is None:
+                sys.stdout.write(html)
+                sys.stdout.flush()
+            else:
+                try:
+                    write_file_atomically(output_name, html)
+                except OSError as error:
+                    report_error(input_name, error)
+                    failures += 1
+                    continue
+            count += 1
+            if not arguments.quiet:
+                sys.stderr.write(
+                    input_name + ': ' + str(round(elapsed, 3)) + 's\n'
+                )
+    except (OSError, ValueError) as error:
+        sys.stderr.write('hatemile: ' + str(error) + '\n')
+        return 1
+    if not arguments.quiet:
+        sys.stderr.write(
+            str(count)
+            + ' file(s) in '
+            + str(round(time.perf_counter() - start, 3))
+            + 's\n'
+        )
+        if failures > 0:
+            sys.stderr.write(str(failures) + ' file(s) failed\n')
+        if cache is not None:
+            sys.stderr.write(
+                'cache hit rate: '
+                + str(round(cache.get_hit_rate() * 100, 1))
+                + '%\n'
+            )
+    if failures > 0:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -22,6 +22,13 @@ from hatemile.util.idgenerator import IDGenerator
 from hatemile.util.html.htmldomparser import HTMLDOMParser
 
 
+#: The selector of tables.
+TABLES_SELECTOR = 'table'
+
+#: The selector of labels.
+LABELS_SELECTOR = 'label'
+
+
 class AccessibleAssociationImplementation(AccessibleAssociation):
     """
     The AccessibleAssociationImplementation class is official implementation of
@@ -255,7 +262,7 @@ class AccessibleAssociationImplementation(AccessibleAssociation):
             self._associate_data_cells_with_header_cells_of_row(footer)
 
     def associate_all_data_cells_with_header_cells(self):
-        tables = self.parser.find('table').list_results()
+        tables = self.parser.find(TABLES_SELECTOR).list_results()
         for table in tables:
             if CommonFunctions.is_valid_element(table):
                 self.associate_data_cells_with_header_cells(table)
@@ -263,10 +270,9 @@ class AccessibleAssociationImplementation(AccessibleAssociation):
     def associate_label_with_field(self, label):
         if label.get_tag_name() == 'LABEL':
             if label.has_attribute('for'):
-                field = self.parser.find(
-                    '#'
-                    + label.get_attribute('for')
-                ).first_result()
+                field = self.parser.get_element_by_id(
+                    label.get_attribute('for')
+                )
             else:
                 field = self.parser.find(label).find_descendants(
                     'input,select,textarea'
@@ -296,7 +302,7 @@ class AccessibleAssociationImplementation(AccessibleAssociation):
                 )
 
     def associate_all_labels_with_fields(self):
-        labels = self.parser.find('label').list_results()
+        labels = self.parser.find(LABELS_SELECTOR).list_results()
         for label in labels:
             if CommonFunctions.is_valid_element(label):
                 self.associate_label_with_field(label)
@@ -14,6 +14,7 @@
 Module of AccessibleCSSImplementation class.
 """
 
+import functools
 import os
 import re
 from xml.dom import minidom
@@ -319,6 +320,32 @@ class AccessibleCSSImplementation(AccessibleCSS):
 
         return children
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _read_symbols(file_name):
+        """
+        Returns the attributes of symbols of a symbol configuration file. The
+        file is read only once by process.
+
+        :param file_name: The file path of symbol configuration.
+        :type file_name: str
+        :return: The symbol and the name of description parameter of each
+                 symbol.
+        :rtype: tuple(tuple(str, str))
+        """
+
+        xmldoc = minidom.parse(file_name)
+        symbols_xml = xmldoc.getElementsByTagName(
+            'symbols'
+        )[0].getElementsByTagName('symbol')
+        return tuple(
+            (
+                symbol_xml.attributes['symbol'].value,
+                symbol_xml.attributes['description'].value
+            )
+            for symbol_xml in symbols_xml
+        )
+
     def _set_symbols(self, file_name, configure):
         """
         Load the symbols with configuration.
@@ -334,16 +361,12 @@ class AccessibleCSSImplementation(AccessibleCSS):
             file_name = os.path.join(os.path.dirname(os.path.dirname(
                 os.path.dirname(os.path.realpath(__file__))
             )), 'symbols.xml')
-        xmldoc = minidom.parse(file_name)
-        symbols_xml = xmldoc.getElementsByTagName(
-            'symbols'
-        )[0].getElementsByTagName('symbol')
-        for symbol_xml in symbols_xml:
+        for symbol, description in (
+            AccessibleCSSImplementation._read_symbols(file_name)
+        ):
             self.symbols.append({
-                'symbol': symbol_xml.attributes['symbol'].value,
-                'description': configure.get_parameter(
-                    symbol_xml.attributes['description'].value
-                )
+                'symbol': symbol,
+                'description': configure.get_parameter(description)
             })
 
     def _get_formated_symbol(self, symbol):
@@ -1005,13 +1028,8 @@ class AccessibleCSSImplementation(AccessibleCSS):
             'speak-as'
         ])
         for rule in rules:
-            speak_elements = self.html_parser.find(
-                rule.get_selector()
-            ).list_results()
-            for speak_element in speak_elements:
-                if speak_element == element:
-                    self._provide_speak_properties_with_rule(element, rule)
-                    break
+            if element.matches(rule.get_selector()):
+                self._provide_speak_properties_with_rule(element, rule)
 
     def provide_all_speak_properties(self):
         selector = None
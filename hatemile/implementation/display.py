@@ -23,6 +23,37 @@ from hatemile.util.idgenerator import IDGenerator
 from hatemile.util.html.htmldomparser import HTMLDOMParser
 
 
+#: The selector of elements with shortcuts.
+SHORTCUTS_SELECTOR = '[accesskey]'
+
+#: The selector of elements with roles.
+ROLES_SELECTOR = '[role]'
+
+#: The selector of table cells with headers.
+CELL_HEADERS_SELECTOR = 'td[headers],th[headers]'
+
+#: The selector of elements with WAI-ARIA states.
+WAIARIA_STATES_SELECTOR = (
+    '[aria-busy=true],[aria-checked],[aria-dropeffect],'
+    + '[aria-expanded],[aria-grabbed],[aria-haspopup],[aria-level],'
+    + '[aria-orientation],[aria-pressed],[aria-selected],[aria-sort],'
+    + '[aria-required=true],[aria-valuemin],[aria-valuemax],'
+    + '[aria-autocomplete]'
+)
+
+#: The selector of links with attributes.
+LINK_ATTRIBUTES_SELECTOR = 'a[download],a[target="_blank"]'
+
+#: The selector of elements with titles.
+TITLES_SELECTOR = 'body [title]'
+
+#: The selector of elements with languages.
+LANGUAGES_SELECTOR = 'html[lang],body[lang],body [lang],body [hreflang]'
+
+#: The selector of images.
+IMAGES_SELECTOR = 'img'
+
+
 class AccessibleDisplayImplementation(AccessibleDisplay):
     """
     The AccessibleDisplayImplementation class is official implementation of
@@ -149,9 +180,11 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
         self.parser = parser
         self.configure = configure
         self.id_generator = IDGenerator('display')
-        self.shortcut_prefix = self._get_shortcut_prefix(
-            user_agent,
-            configure.get_parameter('attribute-accesskey-default')
+        self.shortcut_prefix = (
+            AccessibleDisplayImplementation.get_shortcut_prefix(
+                user_agent,
+                configure.get_parameter('attribute-accesskey-default')
+            )
         )
         self.attribute_accesskey_before = configure.get_parameter(
             'attribute-accesskey-before'
@@ -439,7 +472,8 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
         self.list_shortcuts_before = None
         self.list_shortcuts_after = None
 
-    def _get_shortcut_prefix(self, user_agent, standart_prefix):
+    @staticmethod
+    def get_shortcut_prefix(user_agent, standart_prefix):
         """
         Returns the shortcut prefix of browser.
 
@@ -450,7 +484,6 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
         :return: The shortcut prefix of browser.
         :rtype: str
         """
-        # pylint: disable=no-self-use
 
         if user_agent is not None:
             user_agent = user_agent.lower()
@@ -555,9 +588,9 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
                     element.get_attribute('aria-describedby').strip()
                 )
             for description_id in description_ids:
-                element_description = self.parser.find(
-                    '#' + description_id
-                ).first_result()
+                element_description = self.parser.get_element_by_id(
+                    description_id
+                )
                 if element_description is not None:
                     description = element_description.get_text_content()
                     break
@@ -701,11 +734,9 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
         elif tag_name in controls:
             labels = []
             if element.has_attribute('id'):
-                labels = self.parser.find(
-                    'label[for="'
-                    + element.get_attribute('id')
-                    + '"]'
-                ).list_results()
+                labels = self.parser.get_labels_for(
+                    element.get_attribute('id')
+                )
             if not labels:
                 labels = self.parser.find(element).find_ancestors(
                     'label'
@@ -870,9 +901,9 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
                 if (
                     (self.list_shortcuts_before is not None)
                     and (
-                        self.parser.find(
+                        not self.parser.find(
                             self.list_shortcuts_before
-                        ).find_children(selector).first_result() is None
+                        ).find_children(selector).exists()
                     )
                 ):
                     self.list_shortcuts_before.append_element(
@@ -881,9 +912,9 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
                 if (
                     (self.list_shortcuts_after)
                     and (
-                        self.parser.find(
+                        not self.parser.find(
                             self.list_shortcuts_after
-                        ).find_children(selector).first_result() is None
+                        ).find_children(selector).exists()
                     )
                 ):
                     self.list_shortcuts_after.append_element(
@@ -891,7 +922,7 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
                     )
 
     def display_all_shortcuts(self):
-        elements = self.parser.find('[accesskey]').list_results()
+        elements = self.parser.find(SHORTCUTS_SELECTOR).list_results()
         for element in elements:
             if CommonFunctions.is_valid_element(element):
                 self.display_shortcut(element)
@@ -913,7 +944,7 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
                 )
 
     def display_all_roles(self):
-        elements = self.parser.find('[role]').list_results()
+        elements = self.parser.find(ROLES_SELECTOR).list_results()
         for element in elements:
             if CommonFunctions.is_valid_element(element):
                 self.display_role(element)
@@ -926,7 +957,7 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
                 table_cell.get_attribute('headers')
             )
             for id_header in ids_headers:
-                header = self.parser.find('#' + id_header).first_result()
+                header = self.parser.get_element_by_id(id_header)
                 if header is not None:
                     if text_header == '':
                         text_header = header.get_text_content().strip()
@@ -948,7 +979,7 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
                 )
 
     def display_all_cell_headers(self):
-        elements = self.parser.find('td[headers],th[headers]').list_results()
+        elements = self.parser.find(CELL_HEADERS_SELECTOR).list_results()
         for element in elements:
             if CommonFunctions.is_valid_element(element):
                 self.display_cell_header(element)
@@ -1209,13 +1240,7 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
                 )
 
     def display_all_waiaria_states(self):
-        elements = self.parser.find(
-            '[aria-busy=true],[aria-checked],[aria-dropeffect],'
-            + '[aria-expanded],[aria-grabbed],[aria-haspopup],[aria-level],'
-            + '[aria-orientation],[aria-pressed],[aria-selected],[aria-sort],'
-            + '[aria-required=true],[aria-valuemin],[aria-valuemax],'
-            + '[aria-autocomplete]'
-        ).list_results()
+        elements = self.parser.find(WAIARIA_STATES_SELECTOR).list_results()
         for element in elements:
             if CommonFunctions.is_valid_element(element):
                 self.display_waiaria_states(element)
@@ -1240,9 +1265,7 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
             )
 
     def display_all_links_attributes(self):
-        elements = self.parser.find(
-            'a[download],a[target="_blank"]'
-        ).list_results()
+        elements = self.parser.find(LINK_ATTRIBUTES_SELECTOR).list_results()
         for element in elements:
             if CommonFunctions.is_valid_element(element):
                 self.display_link_attributes(element)
@@ -1265,7 +1288,7 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
             )
 
     def display_all_titles(self):
-        elements = self.parser.find('body [title]').list_results()
+        elements = self.parser.find(TITLES_SELECTOR).list_results()
         for element in elements:
             if CommonFunctions.is_valid_element(element):
                 self.display_title(element)
@@ -1289,9 +1312,7 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
             )
 
     def display_all_languages(self):
-        elements = self.parser.find(
-            'html[lang],body[lang],body [lang],body [hreflang]'
-        ).list_results()
+        elements = self.parser.find(LANGUAGES_SELECTOR).list_results()
         for element in elements:
             if CommonFunctions.is_valid_element(element):
                 self.display_language(element)
@@ -1319,7 +1340,7 @@ class AccessibleDisplayImplementation(AccessibleDisplay):
             image.set_attribute('aria-hidden', 'true')
 
     def display_all_alternative_text_images(self):
-        images = self.parser.find('img').list_results()
+        images = self.parser.find(IMAGES_SELECTOR).list_results()
         for image in images:
             if CommonFunctions.is_valid_element(image):
                 self.display_alternative_text_image(image)
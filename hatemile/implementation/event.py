@@ -22,6 +22,21 @@ from hatemile.util.idgenerator import IDGenerator
 from hatemile.util.html.htmldomparser import HTMLDOMParser
 
 
+#: The selector of elements with drag events.
+DRAGGABLE_ELEMENTS_SELECTOR = '[ondrag],[ondragstart],[ondragend]'
+
+#: The selector of elements with drop events.
+DROPPABLE_ELEMENTS_SELECTOR = (
+    '[ondrop],[ondragenter],[ondragleave],[ondragover]'
+)
+
+#: The selector of elements with hover events.
+HOVER_ELEMENTS_SELECTOR = '[onmouseover],[onmouseout]'
+
+#: The selector of elements with click events.
+CLICK_ELEMENTS_SELECTOR = '[onclick],[onmousedown],[onmouseup],[ondblclick]'
+
+
 class AccessibleEventImplementation(AccessibleEvent):
     """
     The AccessibleEventImplementation class is official implementation of
@@ -116,12 +131,10 @@ class AccessibleEventImplementation(AccessibleEvent):
                 )
                 common_functions_script.append_text(common_functions_content)
                 head.prepend_element(common_functions_script)
-            if (
-                self.parser.find(
-                    '#'
-                    + AccessibleEventImplementation.ID_SCRIPT_EVENT_LISTENER
-                ).first_result() is None
-            ):
+            if not self.parser.find(
+                '#'
+                + AccessibleEventImplementation.ID_SCRIPT_EVENT_LISTENER
+            ).exists():
                 event_listener_file = open(
                     os.path.join(
                         os.path.dirname(os.path.dirname(os.path.dirname(
@@ -161,10 +174,10 @@ class AccessibleEventImplementation(AccessibleEvent):
                 self.script_list.append_text('var dragElements = [];')
                 self.script_list.append_text('var dropElements = [];')
                 local.append_element(self.script_list)
-            if self.parser.find(
+            if not self.parser.find(
                     '#'
                     + AccessibleEventImplementation.ID_FUNCTION_SCRIPT_FIX
-            ).first_result() is None:
+            ).exists():
                 include_file = open(
                     os.path.join(
                         os.path.dirname(os.path.dirname(os.path.dirname(
@@ -224,14 +237,14 @@ class AccessibleEventImplementation(AccessibleEvent):
 
     def make_accessible_all_drag_and_drop_events(self):
         draggable_elements = self.parser.find(
-            '[ondrag],[ondragstart],[ondragend]'
+            DRAGGABLE_ELEMENTS_SELECTOR
         ).list_results()
         for draggable_element in draggable_elements:
             if CommonFunctions.is_valid_element(draggable_element):
                 self.make_accessible_drag_events(draggable_element)
 
         droppable_elements = self.parser.find(
-            '[ondrop],[ondragenter],[ondragleave],[ondragover]'
+            DROPPABLE_ELEMENTS_SELECTOR
         ).list_results()
         for droppable_element in droppable_elements:
             if CommonFunctions.is_valid_element(droppable_element):
@@ -243,9 +256,7 @@ class AccessibleEventImplementation(AccessibleEvent):
         self._add_event_in_element(element, 'hover')
 
     def make_accessible_all_hover_events(self):
-        elements = self.parser.find(
-            '[onmouseover],[onmouseout]'
-        ).list_results()
+        elements = self.parser.find(HOVER_ELEMENTS_SELECTOR).list_results()
         for element in elements:
             if CommonFunctions.is_valid_element(element):
                 self.make_accessible_hover_events(element)
@@ -256,9 +267,7 @@ class AccessibleEventImplementation(AccessibleEvent):
         self._add_event_in_element(element, 'active')
 
     def make_accessible_all_click_events(self):
-        elements = self.parser.find(
-            '[onclick],[onmousedown],[onmouseup],[ondblclick]'
-        ).list_results()
+        elements = self.parser.find(CLICK_ELEMENTS_SELECTOR).list_results()
         for element in elements:
             if CommonFunctions.is_valid_element(element):
                 self.make_accessible_click_events(element)
@@ -23,6 +23,31 @@ from hatemile.util.html.htmldomparser import HTMLDOMParser
 from .event import AccessibleEventImplementation
 
 
+#: The selector of required fields.
+REQUIRED_FIELDS_SELECTOR = '[required]'
+
+#: The selector of range fields.
+RANGE_FIELDS_SELECTOR = '[min],[max]'
+
+#: The selector of fields that can have autocomplete.
+AUTOCOMPLETE_FIELDS_SELECTOR = (
+    'input[autocomplete],textarea[autocomplete],'
+    + 'form[autocomplete] input,form[autocomplete] textarea,'
+    + '[list],[form]'
+)
+
+#: The selector of fields with validation.
+INVALID_FIELDS_SELECTOR = (
+    '[required],input[pattern],input[minlength],input[maxlength],'
+    + 'textarea[minlength],textarea[maxlength],input[type=week],'
+    + 'input[type=month],input[type=datetime-local],'
+    + 'input[type=datetime],input[type=time],input[type=date],'
+    + 'input[type=number],input[type=range],input[type=email],'
+    + 'input[type=url],[aria-required=true],input[aria-valuemin],'
+    + 'input[aria-valuemax]'
+)
+
+
 class AccessibleFormImplementation(AccessibleForm):
     """
     The AccessibleFormImplementation class is official implementation of
@@ -124,9 +149,9 @@ class AccessibleFormImplementation(AccessibleForm):
                     'form'
                 ).first_result()
                 if (form is None) and (field.has_attribute('form')):
-                    form = self.parser.find(
-                        '#' + field.get_attribute('form')
-                    ).first_result()
+                    form = self.parser.get_element_by_id(
+                        field.get_attribute('form')
+                    )
                 if (form is not None) and (form.has_attribute('autocomplete')):
                     value = form.get_attribute('autocomplete').lower()
             if value == 'on':
@@ -135,7 +160,7 @@ class AccessibleFormImplementation(AccessibleForm):
                 (field.has_attribute('list'))
                 and (self.parser.find(
                     'datalist[id="' + field.get_attribute('list') + '"]'
-                ).first_result() is not None)
+                ).exists())
             ):
                 return 'list'
             elif value == 'off':
@@ -152,12 +177,10 @@ class AccessibleFormImplementation(AccessibleForm):
         )
         local = self.parser.find('head,body').first_result()
         if local is not None:
-            if (
-                self.parser.find(
-                    '#'
-                    + AccessibleEventImplementation.ID_SCRIPT_COMMON_FUNCTIONS
-                ).first_result() is None
-            ):
+            if not self.parser.find(
+                '#'
+                + AccessibleEventImplementation.ID_SCRIPT_COMMON_FUNCTIONS
+            ).exists():
                 common_functions_file = open(
                     os.path.join(
                         os.path.dirname(os.path.dirname(os.path.dirname(
@@ -216,12 +239,10 @@ class AccessibleFormImplementation(AccessibleForm):
                     script_list_content
                 )
                 local.append_element(self.script_list_fields_with_validation)
-            if (
-                self.parser.find(
-                    '#'
-                    + AccessibleFormImplementation.ID_SCRIPT_EXECUTE_VALIDATION
-                ).first_result() is None
-            ):
+            if not self.parser.find(
+                '#'
+                + AccessibleFormImplementation.ID_SCRIPT_EXECUTE_VALIDATION
+            ).exists():
                 script_function_file = open(
                     os.path.join(
                         os.path.dirname(os.path.dirname(os.path.dirname(
@@ -271,7 +292,9 @@ class AccessibleFormImplementation(AccessibleForm):
             required_field.set_attribute('aria-required', 'true')
 
     def mark_all_required_fields(self):
-        required_fields = self.parser.find('[required]').list_results()
+        required_fields = self.parser.find(
+            REQUIRED_FIELDS_SELECTOR
+        ).list_results()
         for required_field in required_fields:
             if CommonFunctions.is_valid_element(required_field):
                 self.mark_required_field(required_field)
@@ -289,7 +312,7 @@ class AccessibleFormImplementation(AccessibleForm):
             )
 
     def mark_all_range_fields(self):
-        range_fields = self.parser.find('[min],[max]').list_results()
+        range_fields = self.parser.find(RANGE_FIELDS_SELECTOR).list_results()
         for range_field in range_fields:
             if CommonFunctions.is_valid_element(range_field):
                 self.mark_range_field(range_field)
@@ -303,11 +326,7 @@ class AccessibleFormImplementation(AccessibleForm):
             )
 
     def mark_all_autocomplete_fields(self):
-        fields = self.parser.find(
-            'input[autocomplete],textarea[autocomplete],'
-            + 'form[autocomplete] input,form[autocomplete] textarea,'
-            + '[list],[form]'
-        ).list_results()
+        fields = self.parser.find(AUTOCOMPLETE_FIELDS_SELECTOR).list_results()
         for field in fields:
             if CommonFunctions.is_valid_element(field):
                 self.mark_autocomplete_field(field)
@@ -392,15 +411,7 @@ class AccessibleFormImplementation(AccessibleForm):
                 )
 
     def mark_all_invalid_fields(self):
-        fields = self.parser.find(
-            '[required],input[pattern],input[minlength],input[maxlength],'
-            + 'textarea[minlength],textarea[maxlength],input[type=week],'
-            + 'input[type=month],input[type=datetime-local],'
-            + 'input[type=datetime],input[type=time],input[type=date],'
-            + 'input[type=number],input[type=range],input[type=email],'
-            + 'input[type=url],[aria-required=true],input[aria-valuemin],'
-            + 'input[aria-valuemax]'
-        ).list_results()
+        fields = self.parser.find(INVALID_FIELDS_SELECTOR).list_results()
         for field in fields:
             if CommonFunctions.is_valid_element(field):
                 self.mark_invalid_field(field)
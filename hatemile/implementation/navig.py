@@ -14,6 +14,7 @@
 Module of AccessibleNavigationImplementation class.
 """
 
+import functools
 import os
 import re
 from xml.dom import minidom
@@ -25,6 +26,13 @@ from hatemile.util.idgenerator import IDGenerator
 from hatemile.util.html.htmldomparser import HTMLDOMParser
 
 
+#: The selector of headings.
+HEADINGS_SELECTOR = 'h1,h2,h3,h4,h5,h6'
+
+#: The selector of elements with long description.
+LONG_DESCRIPTIONS_SELECTOR = '[longdesc]'
+
+
 class AccessibleNavigationImplementation(AccessibleNavigation):
     """
     The AccessibleNavigationImplementation class is official implementation of
@@ -130,6 +138,33 @@ class AccessibleNavigationImplementation(AccessibleNavigation):
         self.list_heading_before = None
         self.list_heading_after = None
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _read_skippers(file_name):
+        """
+        Returns the attributes of skippers of a skippers configuration file.
+        The file is read only once by process.
+
+        :param file_name: The file path of skippers configuration.
+        :type file_name: str
+        :return: The selector, the name of description parameter and the
+                 shortcut of each skipper.
+        :rtype: tuple(tuple(str, str, str))
+        """
+
+        xmldoc = minidom.parse(file_name)
+        skippers_xml = xmldoc.getElementsByTagName(
+            'skippers'
+        )[0].getElementsByTagName('skipper')
+        return tuple(
+            (
+                skipper_xml.attributes['selector'].value,
+                skipper_xml.attributes['description'].value,
+                skipper_xml.attributes['shortcut'].value
+            )
+            for skipper_xml in skippers_xml
+        )
+
     @staticmethod
     def _get_skippers(configure, file_name=None):
         """
@@ -148,17 +183,13 @@ class AccessibleNavigationImplementation(AccessibleNavigation):
             file_name = os.path.join(os.path.dirname(os.path.dirname(
                 os.path.dirname(os.path.realpath(__file__))
             )), 'skippers.xml')
-        xmldoc = minidom.parse(file_name)
-        skippers_xml = xmldoc.getElementsByTagName(
-            'skippers'
-        )[0].getElementsByTagName('skipper')
-        for skipper_xml in skippers_xml:
+        for selector, description, shortcut in (
+            AccessibleNavigationImplementation._read_skippers(file_name)
+        ):
             skippers.append({
-                'selector': skipper_xml.attributes['selector'].value,
-                'description': configure.get_parameter(
-                    skipper_xml.attributes['description'].value
-                ),
-                'shortcut': skipper_xml.attributes['shortcut'].value
+                'selector': selector,
+                'description': configure.get_parameter(description),
+                'shortcut': shortcut
             })
         return skippers
 
@@ -297,7 +328,7 @@ class AccessibleNavigationImplementation(AccessibleNavigation):
         :rtype: bool
         """
 
-        elements = self.parser.find('h1,h2,h3,h4,h5,h6').list_results()
+        elements = self.parser.find(HEADINGS_SELECTOR).list_results()
         last_level = 0
         count_main_heading = 0
         self.validate_heading = True
@@ -329,9 +360,9 @@ class AccessibleNavigationImplementation(AccessibleNavigation):
         """
 
         self.id_generator.generate_id(element)
-        if self.parser.find(
+        if not self.parser.find(
             '[' + data_attribute + '="' + element.get_attribute('id') + '"]'
-        ).first_result() is None:
+        ).exists():
             if element.get_tag_name() == 'A':
                 anchor = element
             else:
@@ -380,10 +411,7 @@ class AccessibleNavigationImplementation(AccessibleNavigation):
         if self.list_skippers is not None:
             skipper = None
             for auxiliar_skipper in self.skippers:
-                elements = self.parser.find(
-                    auxiliar_skipper['selector']
-                ).list_results()
-                if element in elements:
+                if element.matches(auxiliar_skipper['selector']):
                     skipper = auxiliar_skipper
                     break
             if skipper is not None:
@@ -487,7 +515,7 @@ class AccessibleNavigationImplementation(AccessibleNavigation):
                     list_after.append_element(item.clone_element())
 
     def provide_navigation_by_all_headings(self):
-        headings = self.parser.find('h1,h2,h3,h4,h5,h6').list_results()
+        headings = self.parser.find(HEADINGS_SELECTOR).list_results()
         for heading in headings:
             if CommonFunctions.is_valid_element(heading):
                 self.provide_navigation_by_heading(heading)
@@ -520,7 +548,7 @@ class AccessibleNavigationImplementation(AccessibleNavigation):
             if (
                 (self.attribute_long_description_prefix_before)
                 and (self.attribute_long_description_suffix_before)
-                and (self.parser.find(selector_before).first_result() is None)
+                and (not self.parser.find(selector_before).exists())
             ):
                 before_text = (
                     self.attribute_long_description_prefix_before
@@ -547,7 +575,7 @@ class AccessibleNavigationImplementation(AccessibleNavigation):
             if (
                 (self.attribute_long_description_prefix_after)
                 and (self.attribute_long_description_suffix_after)
-                and (self.parser.find(selector_after).first_result() is None)
+                and (not self.parser.find(selector_after).exists())
             ):
                 after_text = (
                     self.attribute_long_description_prefix_after
@@ -573,7 +601,7 @@ class AccessibleNavigationImplementation(AccessibleNavigation):
                 image.insert_after(after_anchor)
 
     def provide_navigation_to_all_long_descriptions(self):
-        images = self.parser.find('[longdesc]').list_results()
+        images = self.parser.find(LONG_DESCRIPTIONS_SELECTOR).list_results()
         for image in images:
             if CommonFunctions.is_valid_element(image):
                 self.provide_navigation_to_long_description(image)
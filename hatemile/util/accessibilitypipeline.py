@@ -0,0 +1,640 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of AccessibilityPipeline class.
+"""
+
+import hashlib
+import re
+from hatemile import helper
+from hatemile.implementation.assoc import LABELS_SELECTOR, TABLES_SELECTOR
+from hatemile.implementation.display import (
+    CELL_HEADERS_SELECTOR,
+    IMAGES_SELECTOR,
+    LANGUAGES_SELECTOR,
+    LINK_ATTRIBUTES_SELECTOR,
+    ROLES_SELECTOR,
+    SHORTCUTS_SELECTOR,
+    TITLES_SELECTOR,
+    WAIARIA_STATES_SELECTOR
+)
+from hatemile.implementation.event import (
+    CLICK_ELEMENTS_SELECTOR,
+    DRAGGABLE_ELEMENTS_SELECTOR,
+    DROPPABLE_ELEMENTS_SELECTOR,
+    HOVER_ELEMENTS_SELECTOR
+)
+from hatemile.implementation.form import (
+    AUTOCOMPLETE_FIELDS_SELECTOR,
+    INVALID_FIELDS_SELECTOR,
+    RANGE_FIELDS_SELECTOR,
+    REQUIRED_FIELDS_SELECTOR
+)
+from hatemile.implementation.navig import (
+    HEADINGS_SELECTOR,
+    LONG_DESCRIPTIONS_SELECTOR
+)
+from hatemile.util.cache.resultcache import ResultCache
+from hatemile.util.commonfunctions import CommonFunctions
+from hatemile.util.html.htmldomparser import HTMLDOMParser
+from hatemile.util.idgenerator import IDGenerator
+
+
+class AccessibilityPipeline:
+    """
+    The AccessibilityPipeline class execute a sequence of accessibility
+    solutions in the elements of a parser. Each step apply a solution in the
+    valid elements found by a selector, in document order, with the same
+    result of the methods that apply the solution in all elements of page.
+    The elements of consecutive local steps are found in one walk of the
+    document and the steps are applied in order.
+
+    With a fragment cache, the result of the fragments of page, as headers,
+    navigations, footers and forms shared by many pages, is memoized by a
+    hash of its HTML code and, in the next pages, the fragment is replaced by
+    its result and the local steps are not applied in its elements. A
+    fragment is memoized only if it was changed by local steps applied in its
+    own elements, so the page-global lists of headings and shortcuts, the
+    scripts of events and the IDs generated stay consistent.
+    """
+
+    #: The name of attribute that marks a element as a fragment shared by many
+    #: pages.
+    DATA_FRAGMENT = 'data-hatemilefragment'
+
+    #: The selector of fragments.
+    FRAGMENT_SELECTOR = '[' + DATA_FRAGMENT + '],header,nav,footer,form'
+
+    #: The attributes that reference other elements by ID.
+    ID_REFERENCE_ATTRIBUTES = (
+        'for',
+        'headers',
+        'aria-labelledby',
+        'aria-describedby'
+    )
+
+    #: The regular expression of random part of IDs generated by HaTeMiLe.
+    GENERATED_ID_REGEX = re.compile(
+        'id-hatemile-[-0-9A-Za-z_]*?([0-9a-f]{64})-'
+    )
+
+    def __init__(self, parser, fragment_cache=None, fragment_context=''):
+        """
+        Initializes a new object that execute accessibility solutions in the
+        elements of parser.
+
+        :param parser: The HTML parser.
+        :type parser: hatemile.util.html.htmldomparser.HTMLDOMParser
+        :param fragment_cache: The cache of results of fragments or None to
+                               not memoize the fragments.
+        :type fragment_cache: hatemile.util.cache.resultcache.ResultCache
+        :param fragment_context: The text that identifies the configuration
+                                 and the solutions applied, used in the keys
+                                 of fragments.
+        :type fragment_context: str
+        """
+
+        helper.require_not_none(parser, fragment_context)
+        helper.require_valid_type(parser, HTMLDOMParser)
+        helper.require_valid_type(fragment_cache, ResultCache)
+        helper.require_valid_type(fragment_context, str)
+
+        self.parser = parser
+        self.fragment_cache = fragment_cache
+        self.fragment_context = fragment_context
+        self.steps = []
+        self.fragments = {}
+        self.fragment_ancestors = {}
+
+    def add_step(self, handler, selector=None, local=False):
+        """
+        Add a step in the end of pipeline.
+
+        :param handler: The function that apply a solution in a element, if
+                        the selector is informed, or the function that apply a
+                        solution in the page.
+        :type handler: function
+        :param selector: The selector of elements that the solution is applied
+                         or None to call the handler once, without arguments.
+        :type selector: str
+        :param local: The handler only reads and changes the element, its
+                      descendants and the elements referenced by its IDs, so
+                      it is not applied in the memoized fragments, and it not
+                      creates or changes elements found by the selectors of
+                      the next local steps, so the elements of consecutive
+                      local steps are found in one walk.
+        :type local: bool
+        """
+
+        helper.require_not_none(handler, local)
+        helper.require_valid_type(local, bool)
+
+        self.steps.append({
+            'handler': handler,
+            'selector': selector,
+            'local': local
+        })
+
+    def add_default_steps(
+        self,
+        event,
+        form,
+        navigation,
+        association,
+        css,
+        display
+    ):
+        """
+        Add the steps that apply all accessibility solutions, in the order of
+        the usage documented in README. The solutions informed as None are not
+        applied.
+
+        :param event: The accessibility solutions of events.
+        :type event: hatemile.accessibleevent.AccessibleEvent
+        :param form: The accessibility solutions of forms.
+        :type form: hatemile.accessibleform.AccessibleForm
+        :param navigation: The accessibility solutions of navigation.
+        :type navigation: hatemile.accessiblenavigation.AccessibleNavigation
+        :param association: The accessibility solutions of association.
+        :type association: hatemile.accessibleassociation.AccessibleAssociation
+        :param css: The accessibility solutions of CSS.
+        :type css: hatemile.accessiblecss.AccessibleCSS
+        :param display: The accessibility solutions of display.
+        :type display: hatemile.accessibledisplay.AccessibleDisplay
+        """
+
+        if event is not None:
+            self.add_step(
+                event.make_accessible_drag_events,
+                DRAGGABLE_ELEMENTS_SELECTOR
+            )
+            self.add_step(
+                event.make_accessible_drop_events,
+                DROPPABLE_ELEMENTS_SELECTOR
+            )
+            self.add_step(
+                event.make_accessible_click_events,
+                CLICK_ELEMENTS_SELECTOR
+            )
+            self.add_step(
+                event.make_accessible_hover_events,
+                HOVER_ELEMENTS_SELECTOR
+            )
+        if form is not None:
+            self.add_step(
+                form.mark_required_field,
+                REQUIRED_FIELDS_SELECTOR,
+                local=True
+            )
+            self.add_step(
+                form.mark_range_field,
+                RANGE_FIELDS_SELECTOR,
+                local=True
+            )
+            self.add_step(
+                form.mark_autocomplete_field,
+                AUTOCOMPLETE_FIELDS_SELECTOR
+            )
+            self.add_step(
+                form.mark_invalid_field,
+                INVALID_FIELDS_SELECTOR
+            )
+        if navigation is not None:
+            self.add_step(
+                navigation.provide_navigation_by_heading,
+                HEADINGS_SELECTOR
+            )
+            self.add_step(navigation.provide_navigation_by_all_skippers)
+            self.add_step(
+                navigation.provide_navigation_to_long_description,
+                LONG_DESCRIPTIONS_SELECTOR,
+                local=True
+            )
+        if association is not None:
+            self.add_step(
+                association.associate_data_cells_with_header_cells,
+                TABLES_SELECTOR,
+                local=True
+            )
+            self.add_step(
+                association.associate_label_with_field,
+                LABELS_SELECTOR,
+                local=True
+            )
+        if css is not None:
+            self.add_step(css.provide_all_speak_properties)
+        if display is not None:
+            self.add_step(display.display_shortcut, SHORTCUTS_SELECTOR)
+            self.add_step(
+                display.display_role,
+                ROLES_SELECTOR,
+                local=True
+            )
+            self.add_step(
+                display.display_cell_header,
+                CELL_HEADERS_SELECTOR,
+                local=True
+            )
+            self.add_step(
+                display.display_waiaria_states,
+                WAIARIA_STATES_SELECTOR,
+                local=True
+            )
+            self.add_step(
+                display.display_link_attributes,
+                LINK_ATTRIBUTES_SELECTOR,
+                local=True
+            )
+            self.add_step(
+                display.display_title,
+                TITLES_SELECTOR,
+                local=True
+            )
+            self.add_step(
+                display.display_language,
+                LANGUAGES_SELECTOR,
+                local=True
+            )
+            self.add_step(
+                display.display_alternative_text_image,
+                IMAGES_SELECTOR,
+                local=True
+            )
+        if navigation is not None:
+            self.add_step(navigation.provide_navigation_by_all_skippers)
+        if display is not None:
+            self.add_step(display.display_shortcut, SHORTCUTS_SELECTOR)
+
+    def _get_fragment(self, element):
+        """
+        Returns the fragment that contains a element.
+
+        :param element: The element.
+        :type element: hatemile.util.html.htmldomelement.HTMLDOMElement
+        :return: The root element of fragment or None if the element is not in
+                 a fragment.
+        :rtype: hatemile.util.html.htmldomelement.HTMLDOMElement
+        """
+
+        while element is not None:
+            if element in self.fragments:
+                return element
+            element = element.get_parent_element()
+        return None
+
+    def _get_referenced_ids(self, element):
+        """
+        Returns the IDs referenced by a element.
+
+        :param element: The element.
+        :type element: hatemile.util.html.htmldomelement.HTMLDOMElement
+        :return: The IDs referenced by element.
+        :rtype: list(str)
+        """
+        # pylint: disable=no-self-use
+
+        ids = []
+        for attribute in AccessibilityPipeline.ID_REFERENCE_ATTRIBUTES:
+            if element.has_attribute(attribute):
+                ids.extend(element.get_attribute(attribute).split())
+        return ids
+
+    def _is_closed_fragment(self, root, outside_ids):
+        """
+        Check that the elements of a fragment only reference elements of
+        fragment by ID and that the elements of fragment are not referenced
+        by other elements.
+
+        :param root: The root element of fragment.
+        :type root: hatemile.util.html.htmldomelement.HTMLDOMElement
+        :param outside_ids: The IDs referenced by elements out of fragments.
+        :type outside_ids: set(str)
+        :return: True if the fragment is closed or False if it is not.
+        :rtype: bool
+        """
+
+        elements = [root] + self.parser.find(root).find_descendants(
+            '[id],['
+            + '],['.join(AccessibilityPipeline.ID_REFERENCE_ATTRIBUTES)
+            + ']'
+        ).list_results()
+        for element in elements:
+            if element.has_attribute('id'):
+                element_id = element.get_attribute('id')
+                if (
+                    (element_id in outside_ids)
+                    or (self.parser.get_element_by_id(element_id) != element)
+                ):
+                    return False
+            for element_id in self._get_referenced_ids(element):
+                referenced = self.parser.get_element_by_id(element_id)
+                if (
+                    (referenced is not None)
+                    and (self._get_fragment(referenced) != root)
+                ):
+                    return False
+        return True
+
+    def _find_fragments(self):
+        """
+        Find the fragments of page, that are not contained in other fragments,
+        not ignored and only reference its own elements by ID.
+        """
+
+        self.fragments = {}
+        for element in self.parser.find(
+            AccessibilityPipeline.FRAGMENT_SELECTOR
+        ).list_results():
+            if (
+                (self._get_fragment(element) is None)
+                and (CommonFunctions.is_valid_element(element))
+                and (self.parser.find(element).find_ancestors(
+                    'body'
+                ).exists())
+                and (not self.parser.find(element).find_ancestors(
+                    'label'
+                ).exists())
+            ):
+                self.fragments[element] = None
+        outside_ids = set()
+        for element in self.parser.find(
+            '[' + '],['.join(AccessibilityPipeline.ID_REFERENCE_ATTRIBUTES)
+            + ']'
+        ).list_results():
+            if self._get_fragment(element) is None:
+                outside_ids.update(self._get_referenced_ids(element))
+        for root in list(self.fragments):
+            if self._is_closed_fragment(root, outside_ids):
+                html = root.get_outer_html()
+                self.fragments[root] = {
+                    'key': hashlib.sha256(
+                        (self.fragment_context + '\n' + html).encode(
+                            'utf-8',
+                            'surrogatepass'
+                        )
+                    ).hexdigest(),
+                    'memoized': False,
+                    'changed': False
+                }
+            else:
+                del self.fragments[root]
+
+    def _parse_fragment(self, html):
+        """
+        Returns the element of the result of a fragment, with new random parts
+        in the IDs generated by HaTeMiLe, to keep the IDs unique.
+
+        :param html: The HTML code of result of fragment.
+        :type html: str
+        :return: The root element of fragment or None if the HTML code is not
+                 parsed as the same element.
+        :rtype: hatemile.util.html.htmldomelement.HTMLDOMElement
+        """
+
+        randoms = {}
+
+        def replace_random(match):
+            """
+            Returns the generated ID of a match, with a new random part.
+
+            :param match: The match of generated ID.
+            :type match: re.Match
+            :return: The generated ID with the new random part.
+            :rtype: str
+            """
+
+            random = match.group(1)
+            if random not in randoms:
+                randoms[random] = IDGenerator.get_random()
+            return (
+                match.group(0)[:match.start(1) - match.start(0)]
+                + randoms[random]
+                + '-'
+            )
+
+        html = AccessibilityPipeline.GENERATED_ID_REGEX.sub(
+            replace_random,
+            html
+        )
+        parser = type(self.parser)(
+            '<!DOCTYPE html><html><body>' + html + '</body></html>'
+        )
+        body = parser.find('body').first_result()
+        root = None
+        if (
+            (body is not None)
+            and (len(body.get_children()) == 1)
+            and (body.get_first_element_child() is not None)
+            and (body.get_first_element_child().get_outer_html() == html)
+        ):
+            root = body.get_first_element_child()
+        parser.clear_parser()
+        return root
+
+    def _use_memoized_fragments(self):
+        """
+        Replace the fragments memoized by its results.
+        """
+
+        for root, fragment in list(self.fragments.items()):
+            html = self.fragment_cache.get(fragment['key'])
+            if html is not None:
+                new_root = self._parse_fragment(html)
+                if new_root is not None:
+                    root.replace_node(new_root)
+                    del self.fragments[root]
+                    fragment['memoized'] = True
+                    self.fragments[new_root] = fragment
+        self.fragment_ancestors = {}
+        for root in self.fragments:
+            ancestor = root.get_parent_element()
+            while ancestor is not None:
+                if ancestor not in self.fragment_ancestors:
+                    self.fragment_ancestors[ancestor] = []
+                self.fragment_ancestors[ancestor].append(root)
+                ancestor = ancestor.get_parent_element()
+
+    def _get_snapshots(self, roots):
+        """
+        Returns the HTML code of fragments that can be changed by a step.
+
+        :param roots: The root elements of fragments.
+        :type roots: collections.abc.Iterable
+        :return: The HTML code of each fragment not changed.
+        :rtype: dict
+        """
+
+        snapshots = {}
+        for root in roots:
+            if not self.fragments[root]['changed']:
+                snapshots[root] = root.get_outer_html()
+        return snapshots
+
+    def _check_snapshots(self, snapshots):
+        """
+        Mark the fragments changed after the snapshots.
+
+        :param snapshots: The HTML code of each fragment before a step.
+        :type snapshots: dict
+        :return: True if no memoized fragment was changed or False if it was.
+        :rtype: bool
+        """
+
+        for root, html in snapshots.items():
+            if root.get_outer_html() != html:
+                self.fragments[root]['changed'] = True
+                if self.fragments[root]['memoized']:
+                    return False
+        return True
+
+    def _apply_step(self, step, element):
+        """
+        Apply a step in a element, skipping the local steps in the memoized
+        fragments and marking the fragments changed by local steps applied in
+        its ancestors. The fragments changed by other steps are checked by the
+        snapshots taken around the step.
+
+        :param step: The step.
+        :type step: dict
+        :param element: The element.
+        :type element: hatemile.util.html.htmldomelement.HTMLDOMElement
+        :return: True if no memoized fragment was changed or False if it was.
+        :rtype: bool
+        """
+
+        root = self._get_fragment(element)
+        if root is None:
+            if (
+                (not step['local'])
+                or (element not in self.fragment_ancestors)
+            ):
+                step['handler'](element)
+                return True
+            snapshots = self._get_snapshots(self.fragment_ancestors[element])
+            step['handler'](element)
+            return self._check_snapshots(snapshots)
+        fragment = self.fragments[root]
+        if not step['local']:
+            fragment['changed'] = True
+            if fragment['memoized']:
+                return False
+            step['handler'](element)
+        elif not fragment['memoized']:
+            if element == root:
+                # The local steps can insert elements around the element.
+                parent = root.get_parent_element()
+                length = len(parent.get_children())
+                step['handler'](element)
+                if len(parent.get_children()) != length:
+                    fragment['changed'] = True
+            else:
+                step['handler'](element)
+        return True
+
+    def _get_groups(self):
+        """
+        Returns the steps of pipeline, grouping the consecutive local steps.
+
+        :return: The groups of steps, in order.
+        :rtype: list(list(dict))
+        """
+
+        groups = []
+        for step in self.steps:
+            if (
+                (step['local'])
+                and (groups)
+                and (groups[-1][-1]['local'])
+                and (groups[-1][-1]['selector'] is not None)
+                and (step['selector'] is not None)
+            ):
+                groups[-1].append(step)
+            else:
+                groups.append([step])
+        return groups
+
+    def _find_elements(self, group):
+        """
+        Returns the valid elements found by the selector of each step of a
+        group, in one walk of the document.
+
+        :param group: The steps with selector.
+        :type group: list(dict)
+        :return: The valid elements of each step, in document order.
+        :rtype: list(list(hatemile.util.html.htmldomelement.HTMLDOMElement))
+        """
+
+        if len(group) == 1:
+            return [[
+                element
+                for element in self.parser.find(
+                    group[0]['selector']
+                ).iter_results()
+                if CommonFunctions.is_valid_element(element)
+            ]]
+        elements = [[] for step in group]
+        for element in self.parser.find(
+            ','.join([step['selector'] for step in group])
+        ).iter_results():
+            if CommonFunctions.is_valid_element(element):
+                for index, step in enumerate(group):
+                    if element.matches(step['selector']):
+                        elements[index].append(element)
+        return elements
+
+    def run(self):
+        """
+        Execute the steps of pipeline, in order.
+
+        :return: True if the steps were executed or False if a memoized
+                 fragment was changed by a step that is not local, so the page
+                 must be processed again without the fragment cache.
+        :rtype: bool
+        """
+
+        if self.fragment_cache is None:
+            for group in self._get_groups():
+                if group[0]['selector'] is None:
+                    group[0]['handler']()
+                else:
+                    found = self._find_elements(group)
+                    for step, elements in zip(group, found):
+                        for element in elements:
+                            step['handler'](element)
+            return True
+
+        self._find_fragments()
+        self._use_memoized_fragments()
+        for group in self._get_groups():
+            if group[0]['selector'] is None:
+                snapshots = self._get_snapshots(self.fragments)
+                group[0]['handler']()
+                if not self._check_snapshots(snapshots):
+                    return False
+            else:
+                snapshots = {}
+                if not group[0]['local']:
+                    # The steps that are not local can change the fragments
+                    # through elements out of fragments.
+                    snapshots = self._get_snapshots(self.fragments)
+                found = self._find_elements(group)
+                for step, elements in zip(group, found):
+                    for element in elements:
+                        if not self._apply_step(step, element):
+                            return False
+                if not self._check_snapshots(snapshots):
+                    return False
+        for root, fragment in self.fragments.items():
+            if (not fragment['memoized']) and (not fragment['changed']):
+                self.fragment_cache.put(fragment['key'], root.get_outer_html())
+        return True
@@ -0,0 +1,265 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of FileResultCache class.
+"""
+
+import collections
+import os
+import re
+import tempfile
+import threading
+import time
+from hatemile import helper
+from .resultcache import ResultCache
+
+
+class FileResultCache(ResultCache):
+    """
+    The FileResultCache class is official implementation of
+    :py:class:`hatemile.util.cache.resultcache.ResultCache` that keep the HTML
+    codes in files of a directory, one file by key, so the cache is kept
+    between executions and can be shared by many processes. The keys must be
+    hexadecimal digests, as SHA-256 hashes, because they are used in the
+    names of files.
+
+    The size of cache is counted when the HTML codes are kept and removed, and
+    it is computed again from the files of directory when the count exceeds
+    the maximum size or after a number of HTML codes kept, so the files kept
+    and removed by other processes that share the directory are counted too.
+    The least recently used files are removed, by its modification time.
+    """
+
+    #: The default maximum number of bytes of HTML codes in cache.
+    DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+    #: The default number of HTML codes kept between the scans of directory.
+    DEFAULT_SCAN_INTERVAL = 100
+
+    #: The extension of files of HTML codes.
+    EXTENSION = '.html'
+
+    #: The regular expression of valid keys.
+    KEY_REGEX = re.compile('[0-9a-f]+')
+
+    def __init__(
+        self,
+        directory,
+        max_size=DEFAULT_MAX_SIZE,
+        scan_interval=DEFAULT_SCAN_INTERVAL
+    ):
+        """
+        Initializes a new object that keep the HTML codes in files of a
+        directory.
+
+        :param directory: The path of directory. The directory is created if
+                          it not exists.
+        :type directory: str or os.PathLike
+        :param max_size: The maximum number of bytes of HTML codes in cache.
+        :type max_size: int
+        :param scan_interval: The number of HTML codes kept between the scans
+                              of directory.
+        :type scan_interval: int
+        """
+
+        helper.require_not_none(directory, max_size, scan_interval)
+        helper.require_valid_type(max_size, int)
+        helper.require_valid_type(scan_interval, int)
+        if scan_interval < 1:
+            raise ValueError('The scan interval must be at least 1.')
+
+        self.directory = os.fspath(directory)
+        self.max_size = max_size
+        self.scan_interval = scan_interval
+        self.puts = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.sizes = collections.OrderedDict()
+        self.lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_entries()
+
+    def _load_entries(self):
+        """
+        Load the sizes of files kept in directory, from the least recently
+        used.
+        """
+
+        self.sizes.clear()
+        self.size = 0
+        entries = []
+        with os.scandir(self.directory) as directory_entries:
+            for entry in directory_entries:
+                if entry.name.endswith(FileResultCache.EXTENSION):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((
+                        stat.st_mtime_ns,
+                        entry.name[:-len(FileResultCache.EXTENSION)],
+                        stat.st_size
+                    ))
+        entries.sort()
+        for _, key, size in entries:
+            self.sizes[key] = size
+            self.size += size
+
+    def _check_key(self, key):
+        """
+        Check that a key can be used in the name of a file.
+
+        :param key: The key.
+        :type key: str
+        :raise ValueError: If the key is not a hexadecimal digest.
+        """
+        # pylint: disable=no-self-use
+
+        helper.require_not_none(key)
+        helper.require_valid_type(key, str)
+        if FileResultCache.KEY_REGEX.fullmatch(key) is None:
+            raise ValueError(
+                'The key must be a lowercase hexadecimal digest: '
+                + repr(key)
+            )
+
+    def _get_file_name(self, key):
+        """
+        Returns the path of file of a key.
+
+        :param key: The key.
+        :type key: str
+        :return: The path of file.
+        :rtype: str
+        """
+
+        return os.path.join(self.directory, key + FileResultCache.EXTENSION)
+
+    def _touch(self, file_name):
+        """
+        Mark a file as the most recently used, with a modification time more
+        precise than the time set by the file system.
+
+        :param file_name: The path of file.
+        :type file_name: str
+        """
+        # pylint: disable=no-self-use
+
+        now = time.time_ns()
+        os.utime(file_name, ns=(now, now))
+
+    def _remove_entry(self, key):
+        """
+        Remove the file of a key.
+
+        :param key: The key.
+        :type key: str
+        """
+
+        self.size -= self.sizes.pop(key)
+        try:
+            os.remove(self._get_file_name(key))
+        except FileNotFoundError:
+            pass
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        self._check_key(key)
+
+        file_name = self._get_file_name(key)
+        try:
+            with open(file_name, 'r', encoding='utf-8', newline='') as file:
+                html = file.read()
+                file_size = os.fstat(file.fileno()).st_size
+            self._touch(file_name)
+        except FileNotFoundError:
+            with self.lock:
+                self.misses += 1
+                if key in self.sizes:
+                    self.size -= self.sizes.pop(key)
+            return None
+        with self.lock:
+            self.hits += 1
+            if key in self.sizes:
+                self.sizes.move_to_end(key)
+            else:
+                # The file was kept by other process.
+                self.sizes[key] = file_size
+                self.size += file_size
+        return html
+
+    def put(self, key, html):
+        self._check_key(key)
+        helper.require_not_none(html)
+        helper.require_valid_type(html, str)
+
+        content = html.encode('utf-8')
+        if len(content) > self.max_size:
+            return
+        temporary_file = tempfile.NamedTemporaryFile(
+            'wb',
+            dir=self.directory,
+            prefix='.' + key + '.',
+            suffix='.tmp',
+            delete=False
+        )
+        try:
+            with temporary_file:
+                temporary_file.write(content)
+            self._touch(temporary_file.name)
+            os.replace(temporary_file.name, self._get_file_name(key))
+        except BaseException:
+            if os.path.exists(temporary_file.name):
+                os.remove(temporary_file.name)
+            raise
+        with self.lock:
+            if key in self.sizes:
+                self.size -= self.sizes.pop(key)
+            self.sizes[key] = len(content)
+            self.size += len(content)
+            self.puts += 1
+            if (
+                (self.size > self.max_size)
+                or (self.puts % self.scan_interval == 0)
+            ):
+                # The files can be kept and removed by other processes.
+                self._load_entries()
+            while self.size > self.max_size:
+                self._remove_entry(next(iter(self.sizes)))
+
+    def get_size(self):
+        with self.lock:
+            return self.size
+
+    def get_hit_rate(self):
+        searches = self.hits + self.misses
+        if searches == 0:
+            return 0.0
+        return self.hits / searches
+
+    def clear(self):
+        with self.lock:
+            self._load_entries()
+            while self.sizes:
+                self._remove_entry(next(iter(self.sizes)))
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,104 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of MemoryResultCache class.
+"""
+
+import collections
+import threading
+from hatemile import helper
+from .resultcache import ResultCache
+
+
+class MemoryResultCache(ResultCache):
+    """
+    The MemoryResultCache class is official implementation of
+    :py:class:`hatemile.util.cache.resultcache.ResultCache` that keep the HTML
+    codes in memory.
+    """
+
+    #: The default maximum number of characters of HTML codes in cache.
+    DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        """
+        Initializes a new object that keep the HTML codes in memory.
+
+        :param max_size: The maximum number of characters of HTML codes in
+                         cache.
+        :type max_size: int
+        """
+
+        helper.require_not_none(max_size)
+        helper.require_valid_type(max_size, int)
+
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.results = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        helper.require_not_none(key)
+        helper.require_valid_type(key, str)
+
+        with self.lock:
+            html = self.results.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.results.move_to_end(key)
+            return html
+
+    def put(self, key, html):
+        helper.require_not_none(key, html)
+        helper.require_valid_type(key, str)
+        helper.require_valid_type(html, str)
+
+        with self.lock:
+            old_html = self.results.pop(key, None)
+            if old_html is not None:
+                self.size -= len(old_html)
+            if len(html) > self.max_size:
+                return
+            self.results[key] = html
+            self.size += len(html)
+            while self.size > self.max_size:
+                self.size -= len(self.results.popitem(last=False)[1])
+
+    def get_size(self):
+        return self.size
+
+    def get_hit_rate(self):
+        searches = self.hits + self.misses
+        if searches == 0:
+            return 0.0
+        return self.hits / searches
+
+    def clear(self):
+        with self.lock:
+            self.results.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
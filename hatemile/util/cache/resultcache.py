@@ -0,0 +1,77 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of ResultCache interface.
+"""
+
+
+class ResultCache:
+    """
+    The ResultCache interface contains the methods for keep the HTML codes
+    made accessible, by a key that identifies the HTML code and the options of
+    processing, to avoid process the same HTML code again.
+    """
+
+    def get(self, key):
+        """
+        Returns the HTML code kept by a key.
+
+        :param key: The key.
+        :type key: str
+        :return: The HTML code or None if the cache not has the key.
+        :rtype: str
+        """
+
+        pass
+
+    def put(self, key, html):
+        """
+        Keep a HTML code by a key. The least recently used HTML codes are
+        removed when the cache exceeds its maximum size.
+
+        :param key: The key.
+        :type key: str
+        :param html: The HTML code.
+        :type html: str
+        """
+
+        pass
+
+    def get_size(self):
+        """
+        Returns the size of HTML codes kept.
+
+        :return: The size of HTML codes kept.
+        :rtype: int
+        """
+
+        pass
+
+    def get_hit_rate(self):
+        """
+        Returns the rate of searches that found the key in cache.
+
+        :return: The rate of searches that found the key, between 0 and 1, or
+                 0 if the cache was not searched.
+        :rtype: float
+        """
+
+        pass
+
+    def clear(self):
+        """
+        Remove all HTML codes of cache and reset the counters of hits and
+        misses.
+        """
+
+        pass
@@ -0,0 +1,411 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of StyleSheetCache class.
+"""
+
+import email.utils
+import hashlib
+import json
+import threading
+import time
+import requests
+from hatemile import helper
+from .fileresultcache import FileResultCache
+from .memoryresultcache import MemoryResultCache
+
+
+#: The number of bytes of stylesheets read at once.
+CHUNK_SIZE = 65536
+
+
+def fetch_stylesheet(session, url, timeout, deadline=None, headers=None):
+    """
+    Returns the response of request of a stylesheet and its CSS code. The
+    download is abandoned when the deadline passes, so it not keeps the
+    connection and the thread after the time to download the stylesheets of
+    page.
+
+    :param session: The HTTP session.
+    :type session: requests.Session
+    :param url: The URL of stylesheet.
+    :type url: str
+    :param timeout: The maximum time, in seconds, to connect and to wait
+                    each part of response.
+    :type timeout: float
+    :param deadline: The time, of time.monotonic, when the download is
+                     abandoned, or None to not limit the time of download.
+    :type deadline: float
+    :param headers: The headers of request.
+    :type headers: dict(str, str)
+    :return: The response and the CSS code.
+    :rtype: tuple(requests.Response, str)
+    :raise requests.RequestException: If the stylesheet can not be
+                                      downloaded until the deadline.
+    """
+
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout('The deadline of download passed.')
+        timeout = min(timeout, remaining)
+    chunks = []
+    with session.get(
+        url,
+        headers=headers,
+        timeout=timeout,
+        stream=True
+    ) as response:
+        for chunk in response.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            if (deadline is not None) and (time.monotonic() > deadline):
+                raise requests.Timeout('The deadline of download passed.')
+    content = b''.join(chunks)
+    try:
+        css = str(content, response.encoding or 'utf-8', errors='replace')
+    except LookupError:
+        css = str(content, 'utf-8', errors='replace')
+    return (response, css)
+
+
+def _parse_date(value):
+    """
+    Returns the time of a HTTP date.
+
+    :param value: The HTTP date.
+    :type value: str
+    :return: The time, in seconds since the epoch, or None if the date is
+             invalid.
+    :rtype: float
+    """
+
+    if value is None:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _parse_cache_control(value):
+    """
+    Returns the directives of a Cache-Control header.
+
+    :param value: The value of Cache-Control header.
+    :type value: str
+    :return: The value of each directive, by lowercase name, or None if the
+             directive not has a value.
+    :rtype: dict(str, str)
+    """
+
+    directives = {}
+    if value is not None:
+        for directive in value.split(','):
+            name, _, directive_value = directive.partition('=')
+            name = name.strip().lower()
+            if name:
+                directives[name] = directive_value.strip().strip('"') or None
+    return directives
+
+
+def _parse_seconds(value):
+    """
+    Returns the number of seconds of a header or directive.
+
+    :param value: The value of header or directive.
+    :type value: str
+    :return: The number of seconds or None if the value is invalid.
+    :rtype: int
+    """
+
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class StyleSheetCache:
+    """
+    The StyleSheetCache class keep the stylesheets downloaded by HTTP, by
+    resolved URL, in memory and, optionally, in files of a directory, so the
+    stylesheets linked by many pages are downloaded once. The headers
+    Cache-Control, Expires, ETag and Last-Modified of responses are honoured:
+    the fresh stylesheets are used without requests and the stale stylesheets
+    are revalidated by conditional requests.
+    """
+
+    #: The default maximum number of characters of stylesheets in memory.
+    DEFAULT_MAX_SIZE = 16 * 1024 * 1024
+
+    #: The default maximum number of bytes of stylesheets in files.
+    DEFAULT_MAX_FILE_SIZE = 256 * 1024 * 1024
+
+    #: The rate of time since the last modification of a stylesheet used as
+    #: its freshness lifetime, when the response not has a explicit
+    #: expiration.
+    HEURISTIC_RATE = 0.1
+
+    def __init__(
+        self,
+        directory=None,
+        max_size=DEFAULT_MAX_SIZE,
+        max_file_size=DEFAULT_MAX_FILE_SIZE
+    ):
+        """
+        Initializes a new object that keep the stylesheets downloaded.
+
+        :param directory: The path of directory where the stylesheets are
+                          kept between executions or None to keep the
+                          stylesheets only in memory.
+        :type directory: str or os.PathLike
+        :param max_size: The maximum number of characters of stylesheets in
+                         memory.
+        :type max_size: int
+        :param max_file_size: The maximum number of bytes of stylesheets in
+                              directory.
+        :type max_file_size: int
+        """
+
+        helper.require_not_none(max_size, max_file_size)
+        helper.require_valid_type(max_size, int)
+        helper.require_valid_type(max_file_size, int)
+
+        self.memory_cache = MemoryResultCache(max_size)
+        self.file_cache = None
+        if directory is not None:
+            self.file_cache = FileResultCache(directory, max_file_size)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def _get_key(self, url):
+        """
+        Returns the key of a URL in caches.
+
+        :param url: The URL.
+        :type url: str
+        :return: The key, as a hexadecimal SHA-256 hash.
+        :rtype: str
+        """
+        # pylint: disable=no-self-use
+
+        return hashlib.sha256(url.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def _count(self, hit):
+        """
+        Count a search of stylesheet.
+
+        :param hit: The stylesheet was used without download it again.
+        :type hit: bool
+        """
+
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _get_expiration(self, headers, now):
+        """
+        Returns the time when a response stops to be fresh.
+
+        :param headers: The headers of response.
+        :type headers: requests.structures.CaseInsensitiveDict
+        :param now: The time of response, in seconds since the epoch.
+        :type now: float
+        :return: The time, in seconds since the epoch, or None if the response
+                 must not be kept.
+        :rtype: float
+        """
+
+        directives = _parse_cache_control(headers.get('Cache-Control'))
+        if 'no-store' in directives:
+            return None
+        date = _parse_date(headers.get('Date'))
+        if date is None:
+            date = now
+        age = _parse_seconds(headers.get('Age')) or 0
+        if 'no-cache' in directives:
+            lifetime = 0
+        elif _parse_seconds(directives.get('max-age')) is not None:
+            lifetime = _parse_seconds(directives.get('max-age'))
+        elif 'Expires' in headers:
+            expires = _parse_date(headers.get('Expires'))
+            lifetime = 0 if expires is None else max(expires - date, 0)
+        else:
+            last_modified = _parse_date(headers.get('Last-Modified'))
+            lifetime = 0
+            if last_modified is not None:
+                lifetime = max(date - last_modified, 0) * (
+                    StyleSheetCache.HEURISTIC_RATE
+                )
+        return now + lifetime - age
+
+    def get_entry(self, url):
+        """
+        Returns the stylesheet kept of a URL, searched in memory and in
+        directory.
+
+        :param url: The resolved URL of stylesheet.
+        :type url: str
+        :return: The entry of stylesheet, with the CSS code, the validators
+                 and the expiration time, or None if the stylesheet is not
+                 kept.
+        :rtype: dict
+        """
+
+        helper.require_not_none(url)
+        helper.require_valid_type(url, str)
+
+        key = self._get_key(url)
+        data = self.memory_cache.get(key)
+        if (data is None) and (self.file_cache is not None):
+            data = self.file_cache.get(key)
+            if data is not None:
+                self.memory_cache.put(key, data)
+        if data is None:
+            return None
+        entry = json.loads(data)
+        if entry['url'] != url:
+            return None
+        return entry
+
+    def put_entry(self, url, entry):
+        """
+        Keep the stylesheet of a URL in memory and in directory.
+
+        :param url: The resolved URL of stylesheet.
+        :type url: str
+        :param entry: The entry of stylesheet, with the CSS code, the
+                      validators and the expiration time.
+        :type entry: dict
+        """
+
+        helper.require_not_none(url, entry)
+        helper.require_valid_type(url, str)
+        helper.require_valid_type(entry, dict)
+
+        key = self._get_key(url)
+        data = json.dumps(dict(entry, url=url))
+        self.memory_cache.put(key, data)
+        if self.file_cache is not None:
+            self.file_cache.put(key, data)
+
+    def download(self, session, url, timeout, deadline=None):
+        """
+        Returns the CSS code of a stylesheet, kept or downloaded. A stale
+        stylesheet is revalidated by a conditional request.
+
+        :param session: The HTTP session.
+        :type session: requests.Session
+        :param url: The resolved URL of stylesheet.
+        :type url: str
+        :param timeout: The maximum time, in seconds, to connect and to wait
+                        each part of response.
+        :type timeout: float
+        :param deadline: The time, of time.monotonic, when the download is
+                         abandoned, or None to not limit the time of
+                         download.
+        :type deadline: float
+        :return: The CSS code.
+        :rtype: str
+        :raise requests.RequestException: If the stylesheet can not be
+                                          downloaded.
+        """
+
+        helper.require_not_none(session, url, timeout)
+        helper.require_valid_type(url, str)
+        helper.require_valid_type(timeout, int, float)
+
+        entry = self.get_entry(url)
+        headers = {}
+        if entry is not None:
+            if time.time() < entry['expires']:
+                self._count(True)
+                return entry['css']
+            if entry['etag'] is not None:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified'] is not None:
+                headers['If-Modified-Since'] = entry['last_modified']
+        response, css = fetch_stylesheet(
+            session,
+            url,
+            timeout,
+            deadline,
+            headers
+        )
+        now = time.time()
+        if (response.status_code == 304) and (entry is not None):
+            self._count(True)
+            expires = self._get_expiration(response.headers, now)
+            if expires is not None:
+                entry['expires'] = expires
+                entry['etag'] = response.headers.get('ETag', entry['etag'])
+                entry['last_modified'] = response.headers.get(
+                    'Last-Modified',
+                    entry['last_modified']
+                )
+                self.put_entry(url, entry)
+            return entry['css']
+        self._count(False)
+        response.raise_for_status()
+        expires = self._get_expiration(response.headers, now)
+        entry = {
+            'css': css,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'expires': expires
+        }
+        if (response.status_code == 200) and (expires is not None) and (
+            (expires > now)
+            or (entry['etag'] is not None)
+            or (entry['last_modified'] is not None)
+        ):
+            self.put_entry(url, entry)
+        return css
+
+    def get_hit_rate(self):
+        """
+        Returns the rate of stylesheets used without download it again.
+
+        :return: The rate of stylesheets used without download it again,
+                 between 0 and 1, or 0 if the cache was not searched.
+        :rtype: float
+        """
+
+        searches = self.hits + self.misses
+        if searches == 0:
+            return 0.0
+        return self.hits / searches
+
+    def clear(self):
+        """
+        Remove all stylesheets of cache and reset the counters of hits and
+        misses.
+        """
+
+        self.memory_cache.clear()
+        if self.file_cache is not None:
+            self.file_cache.clear()
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
@@ -14,24 +14,342 @@
 Module of TinyCSSParser interface.
 """
 
+import atexit
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import os
+import re
+import threading
+import time
 from urllib.parse import urljoin
 import requests
+from requests.adapters import HTTPAdapter
 import tinycss
 from tinycss.css21 import RuleSet
 from hatemile import helper
+from hatemile.util.cache.stylesheetcache import StyleSheetCache
+from hatemile.util.cache.stylesheetcache import fetch_stylesheet
 from hatemile.util.css.stylesheetparser import StyleSheetParser
 from hatemile.util.html.htmldomparser import HTMLDOMParser
 from .tinycssrule import TinyCSSRule
 
+#: The maximum number of stylesheets downloaded at same time, by process.
+MAX_DOWNLOADS = 8
+
+#: The shared HTTP session and pool of threads that download the stylesheets.
+DOWNLOADER = {}
+
+#: The lock of creation of the shared HTTP session and pool of threads.
+DOWNLOADER_LOCK = threading.Lock()
+
+#: The maximum number of parsed stylesheets kept, by process.
+MAX_PARSED_STYLESHEETS = 64
+
+#: The rules of parsed stylesheets, by hash of CSS code and properties of
+#: rules, from the least recently used.
+PARSED_STYLESHEETS = collections.OrderedDict()
+
+#: The lock of parsed stylesheets.
+PARSED_STYLESHEETS_LOCK = threading.Lock()
+
+#: The regular expression of tokens that open or close comments, strings,
+#: URLs and blocks of CSS.
+BLOCK_TOKEN_REGEX = re.compile(r'/\*|["\'\\(){}\[\]]|url\(', re.IGNORECASE)
+
+#: The regular expressions of CSS strings, by quote.
+STRING_REGEXES = {
+    '"': re.compile(r'"(?:[^"\\\n]|\\.)*"', re.DOTALL),
+    "'": re.compile(r"'(?:[^'\\\n]|\\.)*'", re.DOTALL)
+}
+
+#: The regular expression of CSS URLs not quoted.
+URL_REGEX = re.compile(
+    r'url\([ \t\r\n\f]*[^"\'()\\\x00-\x20\x7f]*[ \t\r\n\f]*\)',
+    re.IGNORECASE
+)
+
+#: The regular expression of CSS URLs quoted.
+QUOTED_URL_REGEX = re.compile(r'url\([ \t\r\n\f]*["\']', re.IGNORECASE)
+
+#: The closing characters of CSS blocks, by opening character.
+BLOCK_CLOSERS = {'(': ')', '[': ']', '{': '}', 'url(': ')'}
+
+
+def get_downloader():
+    """
+    Returns the HTTP session, with a pool of connections, and the pool of
+    threads that download the stylesheets, shared by all parsers of process.
+    A forked process creates its own session and pool of threads.
+
+    :return: The HTTP session and the pool of threads.
+    :rtype: tuple(requests.Session, concurrent.futures.ThreadPoolExecutor)
+    """
+
+    with DOWNLOADER_LOCK:
+        if DOWNLOADER.get('pid') != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=MAX_DOWNLOADS,
+                pool_maxsize=MAX_DOWNLOADS
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            DOWNLOADER['pid'] = os.getpid()
+            DOWNLOADER['session'] = session
+            DOWNLOADER['executor'] = concurrent.futures.ThreadPoolExecutor(
+                max_workers=MAX_DOWNLOADS,
+                thread_name_prefix='hatemile-stylesheet'
+            )
+        return (DOWNLOADER['session'], DOWNLOADER['executor'])
+
+
+def close_downloader():
+    """
+    Close the HTTP session and the pool of threads that download the
+    stylesheets, without wait the downloads in progress, that are abandoned
+    at its deadline. It is called at the exit of process and the next parser
+    creates a new session and pool of threads.
+    """
+
+    with DOWNLOADER_LOCK:
+        if DOWNLOADER.get('pid') == os.getpid():
+            DOWNLOADER['executor'].shutdown(wait=False)
+            DOWNLOADER['session'].close()
+        DOWNLOADER.clear()
+
+
+atexit.register(close_downloader)
+
+
+def download_stylesheet(
+    session,
+    url,
+    timeout,
+    stylesheet_cache=None,
+    deadline=None
+):
+    """
+    Returns the CSS code of a stylesheet.
+
+    :param session: The HTTP session.
+    :type session: requests.Session
+    :param url: The URL of stylesheet.
+    :type url: str
+    :param timeout: The maximum time, in seconds, to connect and to wait
+                    each part of response.
+    :type timeout: float
+    :param stylesheet_cache: The cache of stylesheets downloaded or None to
+                             always download the stylesheet.
+    :type stylesheet_cache: hatemile.util.cache.stylesheetcache.StyleSheetCache
+    :param deadline: The time, of time.monotonic, when the download is
+                     abandoned, or None to not limit the time of download.
+    :type deadline: float
+    :return: The CSS code or a empty string if the stylesheet can not be
+             downloaded until the deadline.
+    :rtype: str
+    """
+
+    try:
+        if stylesheet_cache is not None:
+            return stylesheet_cache.download(session, url, timeout, deadline)
+        response, css = fetch_stylesheet(session, url, timeout, deadline)
+        response.raise_for_status()
+        return css
+    except requests.RequestException:
+        return ''
+
+
+def split_statements(css_code):
+    """
+    Returns the top-level statements of a stylesheet, found by a lexical scan
+    of comments, strings, URLs and blocks, without parse the stylesheet.
+
+    :param css_code: The CSS code of stylesheet.
+    :type css_code: str
+    :return: The CSS code of each statement, in order of stylesheet, with
+             True if the statement has escapes out of strings, or None if the
+             stylesheet has unterminated or unbalanced tokens, that only a
+             full parse recovers.
+    :rtype: list(tuple(str, bool))
+    """
+
+    statements = []
+    start = 0
+    position = 0
+    closers = []
+    escaped = False
+    match = BLOCK_TOKEN_REGEX.search(css_code)
+    while match is not None:
+        token = match.group().lower()
+        position = match.end()
+        if token == '/*':
+            end = css_code.find('*/', position)
+            if end < 0:
+                return None
+            position = end + 2
+        elif token in STRING_REGEXES:
+            string_match = STRING_REGEXES[token].match(
+                css_code,
+                match.start()
+            )
+            if string_match is None:
+                return None
+            position = string_match.end()
+        elif token == '\\':
+            position += 1
+            escaped = True
+        elif token == 'url(':
+            url_match = URL_REGEX.match(css_code, match.start())
+            if url_match is not None:
+                position = url_match.end()
+            elif QUOTED_URL_REGEX.match(css_code, match.start()) is not None:
+                closers.append(')')
+            else:
+                return None
+        elif token in BLOCK_CLOSERS:
+            closers.append(BLOCK_CLOSERS[token])
+        else:
+            if (not closers) or (closers.pop() != token):
+                return None
+            if (token == '}') and (not closers):
+                statements.append((css_code[start:position], escaped))
+                start = position
+                escaped = False
+        match = BLOCK_TOKEN_REGEX.search(css_code, position)
+    if closers:
+        return None
+    statements.append((css_code[start:], escaped))
+    return statements
+
+
+@functools.lru_cache(maxsize=None)
+def _get_properties_regex(properties):
+    """
+    Returns the regular expression that finds the names of properties in CSS
+    code.
+
+    :param properties: The names of properties.
+    :type properties: tuple(str)
+    :return: The regular expression.
+    :rtype: re.Pattern
+    """
+
+    return re.compile(
+        '|'.join(re.escape(property_name) for property_name in properties),
+        re.IGNORECASE
+    )
+
+
+def filter_stylesheet(css_code, properties):
+    """
+    Returns the statements of a stylesheet that can contain any of
+    properties, found without parse the stylesheet. The statements without
+    the names of properties and without escapes out of strings, that can hide
+    the names, are removed.
+
+    :param css_code: The CSS code of stylesheet.
+    :type css_code: str
+    :param properties: The names of properties.
+    :type properties: tuple(str)
+    :return: The CSS code of statements that can contain any of properties.
+    :rtype: str
+    """
+
+    if not properties:
+        return ''
+    properties_regex = _get_properties_regex(properties)
+    if ('\\' not in css_code) and (
+        properties_regex.search(css_code) is None
+    ):
+        return ''
+    statements = split_statements(css_code)
+    if statements is None:
+        return css_code
+    return ''.join([
+        statement
+        for statement, escaped in statements
+        if escaped or (properties_regex.search(statement) is not None)
+    ])
+
+
+def parse_stylesheet(css_code, properties=None):
+    """
+    Returns the rules of a stylesheet. The rules of the last stylesheets
+    parsed are kept by hash of CSS code and by properties, so a stylesheet
+    shared by many pages is parsed once by process.
+
+    :param css_code: The CSS code of stylesheet.
+    :type css_code: str
+    :param properties: The names of properties of rules returned, or None to
+                       return all rules. Only the statements that can contain
+                       the properties are parsed.
+    :type properties: tuple(str)
+    :return: The rules of stylesheet, in order of stylesheet.
+    :rtype: tuple(hatemile.util.css.tinycss.tinycssrule.TinyCSSRule)
+    """
+
+    helper.require_not_none(css_code)
+    helper.require_valid_type(css_code, str)
+    helper.require_valid_type(properties, tuple)
+
+    key = (
+        hashlib.sha256(css_code.encode('utf-8', 'surrogatepass')).digest(),
+        properties
+    )
+    with PARSED_STYLESHEETS_LOCK:
+        rules = PARSED_STYLESHEETS.get(key)
+        if rules is not None:
+            PARSED_STYLESHEETS.move_to_end(key)
+            return rules
+    if properties is not None:
+        css_code = filter_stylesheet(css_code, properties)
+    rules = tuple(
+        TinyCSSRule(rule)
+        for rule in tinycss.make_parser().parse_stylesheet(css_code).rules
+        if isinstance(rule, RuleSet)
+    )
+    if properties is not None:
+        rules = tuple(
+            rule
+            for rule in rules
+            if any(
+                rule.has_property(property_name)
+                for property_name in properties
+            )
+        )
+    with PARSED_STYLESHEETS_LOCK:
+        PARSED_STYLESHEETS[key] = rules
+        while len(PARSED_STYLESHEETS) > MAX_PARSED_STYLESHEETS:
+            PARSED_STYLESHEETS.popitem(last=False)
+    return rules
+
 
 class TinyCSSParser(StyleSheetParser):
     """
     The TinyCSSParser class is official implementation of
     :py:class:`hatemile.util.css.stylesheetparser.StyleSheetParser` for
-    tinycss.
+    tinycss. The linked stylesheets are downloaded at same time, by a shared
+    HTTP session.
     """
 
-    def __init__(self, css_or_hp, current_url=None):
+    #: The default maximum time, in seconds, to connect and to wait each part
+    #: of response of a linked stylesheet.
+    DEFAULT_TIMEOUT = 10.0
+
+    #: The default maximum time, in seconds, to download all linked
+    #: stylesheets.
+    DEFAULT_TOTAL_TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        css_or_hp,
+        current_url=None,
+        timeout=DEFAULT_TIMEOUT,
+        total_timeout=DEFAULT_TOTAL_TIMEOUT,
+        cache=None
+    ):
         """
         Initializes a new object that encapsulate the tinycss.
 
@@ -39,20 +357,41 @@ class TinyCSSParser(StyleSheetParser):
         :type css_or_hp: str or hatemile.util.html.htmldomparser.HTMLDOMParser
         :param current_url: The current URL of page.
         :type current_url: str
+        :param timeout: The maximum time, in seconds, to connect and to wait
+                        each part of response of a linked stylesheet.
+        :type timeout: float
+        :param total_timeout: The maximum time, in seconds, to download all
+                              linked stylesheets. The stylesheets not
+                              downloaded in time are ignored.
+        :type total_timeout: float
+        :param cache: The cache of linked stylesheets, shared by the parsers
+                      of pages of a site, or None to download the stylesheets
+                      of each page.
+        :type cache: hatemile.util.cache.stylesheetcache.StyleSheetCache
         """
 
-        helper.require_not_none(css_or_hp)
+        helper.require_not_none(css_or_hp, timeout, total_timeout)
         helper.require_valid_type(css_or_hp, str, HTMLDOMParser)
         helper.require_valid_type(current_url, str)
+        helper.require_valid_type(timeout, int, float)
+        helper.require_valid_type(total_timeout, int, float)
+        helper.require_valid_type(cache, StyleSheetCache)
 
+        self.timeout = timeout
+        self.total_timeout = total_timeout
+        self.cache = cache
+        self.rules = []
+        self.index = {}
+        self.indexed_properties = frozenset()
         if isinstance(css_or_hp, str):
-            self.stylesheet = tinycss.make_parser().parse_stylesheet(css_or_hp)
+            self.sources = [css_or_hp]
         else:
             self._create_parser(css_or_hp, current_url)
 
     def _create_parser(self, html_parser, current_url):
         """
-        Create the tinycss stylesheet.
+        Load the stylesheets of page, in order of page. Each stylesheet is
+        parsed apart, when its rules are searched.
 
         :param html_parser: The HTML parser.
         :type html_parser: hatemile.util.html.htmldomparser.HTMLDOMParser
@@ -60,28 +399,71 @@ class TinyCSSParser(StyleSheetParser):
         :type current_url: str
         """
 
-        css_code = ''
-
+        sources = []
+        downloads = {}
         elements = html_parser.find(
             'style,link[rel="stylesheet"]'
         ).list_results()
         for element in elements:
             if element.get_tag_name() == 'STYLE':
-                css_code = css_code + element.get_text_content()
+                sources.append((False, element.get_text_content()))
+            else:
+                url = urljoin(current_url, element.get_attribute('href'))
+                sources.append((True, url))
+                downloads[url] = None
+        if downloads:
+            session, executor = get_downloader()
+            deadline = time.monotonic() + self.total_timeout
+            for url in downloads:
+                downloads[url] = executor.submit(
+                    download_stylesheet,
+                    session,
+                    url,
+                    self.timeout,
+                    self.cache,
+                    deadline
+                )
+            concurrent.futures.wait(
+                list(downloads.values()),
+                timeout=self.total_timeout
+            )
+
+        self.sources = []
+        for linked, source in sources:
+            if not linked:
+                self.sources.append(source)
+            elif downloads[source].done():
+                self.sources.append(downloads[source].result())
             else:
-                css_code = css_code + requests.get(
-                    urljoin(current_url, element.get_attribute('href'))
-                ).text
+                downloads[source].cancel()
+
+    def _index_rules(self, properties):
+        """
+        Parse the rules of stylesheets of page that have any of properties
+        and index the rules by property.
+
+        :param properties: The names of properties.
+        :type properties: frozenset(str)
+        """
 
-        self.stylesheet = tinycss.make_parser().parse_stylesheet(css_code)
+        self.rules = []
+        self.index = {}
+        self.indexed_properties = properties
+        properties = tuple(sorted(properties))
+        for css_code in self.sources:
+            for rule in parse_stylesheet(css_code, properties):
+                for property_name in rule.declarations:
+                    if property_name in self.indexed_properties:
+                        if property_name not in self.index:
+                            self.index[property_name] = []
+                        self.index[property_name].append(len(self.rules))
+                self.rules.append(rule)
 
     def get_rules(self, properties):
-        rules = list()
-        for rule in self.stylesheet.rules:
-            if isinstance(rule, RuleSet):
-                auxiliar_rule = TinyCSSRule(rule)
-                for property_name in properties:
-                    if auxiliar_rule.has_property(property_name):
-                        rules.append(auxiliar_rule)
-                        break
-        return rules
+        properties = set(properties)
+        if not self.indexed_properties.issuperset(properties):
+            self._index_rules(self.indexed_properties.union(properties))
+        positions = set()
+        for property_name in properties:
+            positions.update(self.index.get(property_name, []))
+        return [self.rules[position] for position in sorted(positions)]
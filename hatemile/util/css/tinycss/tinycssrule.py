@@ -24,6 +24,7 @@ class TinyCSSRule(StyleSheetRule):
     """
     The TinyCSSRule class is official implementation of
     :py:class:`hatemile.util.css.stylesheetrule.StyleSheetRule` for tinycss.
+    The declarations are indexed by property once, when the rule is created.
     """
 
     def __init__(self, rule):
@@ -38,22 +39,22 @@ class TinyCSSRule(StyleSheetRule):
         helper.require_valid_type(rule, RuleSet)
 
         self.rule = rule
+        self.declarations = {}
+        for declaration in rule.declarations:
+            if declaration.name not in self.declarations:
+                self.declarations[declaration.name] = []
+            self.declarations[declaration.name].append(
+                TinyCSSDeclaration(declaration)
+            )
 
     def has_property(self, property_name):
-        for declaration in self.rule.declarations:
-            if declaration.name == property_name:
-                return True
-        return False
+        return property_name in self.declarations
 
     def has_declarations(self):
         return bool(self.rule.declarations)
 
     def get_declarations(self, property_name):
-        declarations = list()
-        for declaration in self.rule.declarations:
-            if declaration.name == property_name:
-                declarations.append(TinyCSSDeclaration(declaration))
-        return declarations
+        return list(self.declarations.get(property_name, []))
 
     def get_selector(self):
         return self.rule.selector.as_css()
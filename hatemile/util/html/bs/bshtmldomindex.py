@@ -0,0 +1,321 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of BeautifulSoupHTMLDOMIndex class.
+"""
+
+import functools
+import re
+from bs4.element import Tag
+
+#: The regular expression of a simple part of compound selector.
+SELECTOR_PART_REGEX = re.compile(
+    r'(?P<tag>[a-zA-Z][\w-]*|\*)'
+    + r'|#(?P<id>[\w-]+)'
+    + r'|\.(?P<class>[\w-]+)'
+    + r'|\[\s*(?P<attribute>[\w-]+)\s*'
+    + r'(?:(?P<operator>[~|^$*]?=)\s*'
+    + r'(?:"(?P<double_quoted>[^"\\]*)"|\'(?P<quoted>[^\'\\]*)\''
+    + r'|(?P<value>[\w-]+))\s*)?\]'
+)
+
+
+@functools.lru_cache(maxsize=512)
+def get_index_keys(selector):
+    """
+    Returns the keys of index that contains all elements matched by a
+    compound selector, as tag name, ID, class, attribute name or attribute
+    value.
+
+    :param selector: The CSS selector, without commas.
+    :type selector: str
+    :return: The keys of index or None if the selector is not a compound
+             selector without combinators or pseudo-classes.
+    :rtype: tuple(tuple(str, str))
+    """
+
+    selector = selector.strip()
+    keys = []
+    position = 0
+    while position < len(selector):
+        match = SELECTOR_PART_REGEX.match(selector, position)
+        if (match is None) or ((position > 0) and (match.group('tag'))):
+            return None
+        if match.group('tag') is not None:
+            if match.group('tag') != '*':
+                keys.append(('tag', match.group('tag').lower()))
+        elif match.group('id') is not None:
+            keys.append(('id', match.group('id')))
+        elif match.group('class') is not None:
+            keys.append(('class', match.group('class')))
+        else:
+            name = match.group('attribute').lower()
+            keys.append(('attribute', name))
+            if match.group('operator') == '=':
+                value = match.group('value')
+                if value is None:
+                    value = match.group('double_quoted')
+                if value is None:
+                    value = match.group('quoted')
+                if value is not None:
+                    keys.append(('value', name + '=' + value.lower()))
+        position = match.end()
+    if not keys:
+        return None
+    return tuple(keys)
+
+
+def get_last_compound(selector):
+    """
+    Returns the last compound selector of a complex selector, that is, the
+    part of selector after the last combinator.
+
+    :param selector: The CSS selector, without commas.
+    :type selector: str
+    :return: The last compound selector.
+    :rtype: str
+    """
+
+    selector = selector.strip()
+    if '\\' in selector:
+        return selector
+    start = 0
+    depth = 0
+    quote = None
+    for position, character in enumerate(selector):
+        if quote is not None:
+            if character == quote:
+                quote = None
+        elif character in '"\'':
+            quote = character
+        elif character in '[(':
+            depth += 1
+        elif character in '])':
+            depth -= 1
+        elif (depth == 0) and ((character in '>+~') or character.isspace()):
+            start = position + 1
+    return selector[start:]
+
+
+class BeautifulSoupHTMLDOMIndex:
+    """
+    The BeautifulSoupHTMLDOMIndex class is a inverted index of elements of a
+    BeautifulSoup document, by tag name, attribute name, ID and class.
+    """
+
+    def __init__(self, document):
+        """
+        Initializes a new object that index the elements of document.
+
+        :param document: The BeautifulSoup document.
+        :type document: bs4.BeautifulSoup
+        """
+
+        self.entries = {}
+        for descendant in document.descendants:
+            if isinstance(descendant, Tag):
+                self._add_element(descendant)
+
+    def _get_attribute_keys(self, name, value):
+        """
+        Returns the keys of index of a attribute of element.
+
+        :param name: The name of attribute.
+        :type name: str
+        :param value: The value of attribute.
+        :type value: str or list(str)
+        :return: The keys of index of attribute.
+        :rtype: list(tuple(str, str))
+        """
+        # pylint: disable=no-self-use
+
+        name = name.lower()
+        if isinstance(value, list):
+            value = ' '.join(value)
+        keys = [('attribute', name), ('value', name + '=' + value.lower())]
+        if name == 'id':
+            keys.append(('id', value))
+        elif name == 'for':
+            keys.append(('for', value))
+        elif name == 'class':
+            for class_name in value.split():
+                keys.append(('class', class_name))
+        return keys
+
+    def _get_element_keys(self, element):
+        """
+        Returns the keys of index of element.
+
+        :param element: The element.
+        :type element: bs4.element.Tag
+        :return: The keys of index of element.
+        :rtype: list(tuple(str, str))
+        """
+
+        keys = [('tag', element.name.lower())]
+        for name, value in element.attrs.items():
+            keys.extend(self._get_attribute_keys(name, value))
+        return keys
+
+    def _add_key(self, key, element):
+        """
+        Add a element in the entry of key.
+
+        :param key: The key of index.
+        :type key: tuple(str, str)
+        :param element: The element.
+        :type element: bs4.element.Tag
+        """
+
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {}
+            self.entries[key] = entry
+        entry[id(element)] = element
+
+    def _remove_key(self, key, element):
+        """
+        Remove a element of the entry of key.
+
+        :param key: The key of index.
+        :type key: tuple(str, str)
+        :param element: The element.
+        :type element: bs4.element.Tag
+        """
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry.pop(id(element), None)
+            if not entry:
+                del self.entries[key]
+
+    def _add_element(self, element):
+        """
+        Add a element in index.
+
+        :param element: The element.
+        :type element: bs4.element.Tag
+        """
+
+        for key in self._get_element_keys(element):
+            self._add_key(key, element)
+
+    def _remove_element(self, element):
+        """
+        Remove a element of index.
+
+        :param element: The element.
+        :type element: bs4.element.Tag
+        """
+
+        for key in self._get_element_keys(element):
+            self._remove_key(key, element)
+
+    def add_tree(self, root):
+        """
+        Add a element and its descendants in index.
+
+        :param root: The element.
+        :type root: bs4.element.Tag
+        """
+
+        self._add_element(root)
+        for descendant in root.descendants:
+            if isinstance(descendant, Tag):
+                self._add_element(descendant)
+
+    def remove_tree(self, root):
+        """
+        Remove a element and its descendants of index.
+
+        :param root: The element.
+        :type root: bs4.element.Tag
+        """
+
+        self._remove_element(root)
+        for descendant in root.descendants:
+            if isinstance(descendant, Tag):
+                self._remove_element(descendant)
+
+    def update_attribute(self, element, name, old_value):
+        """
+        Update the index after a attribute of element was changed.
+
+        :param element: The element.
+        :type element: bs4.element.Tag
+        :param name: The name of attribute.
+        :type name: str
+        :param old_value: The value of attribute before the change or None if
+                          the element not had the attribute.
+        :type old_value: str or list(str)
+        """
+
+        if old_value is not None:
+            for key in self._get_attribute_keys(name, old_value):
+                self._remove_key(key, element)
+        if element.has_attr(name):
+            for key in self._get_attribute_keys(name, element[name]):
+                self._add_key(key, element)
+
+    def get_elements_by_id(self, element_id):
+        """
+        Returns the elements of document with the ID.
+
+        :param element_id: The ID.
+        :type element_id: str
+        :return: The elements with the ID, in any order.
+        :rtype: list(bs4.element.Tag)
+        """
+
+        return list(self.entries.get(('id', element_id), {}).values())
+
+    def get_labels_for(self, field_id):
+        """
+        Returns the labels of document that reference a field by the attribute
+        for.
+
+        :param field_id: The ID of field.
+        :type field_id: str
+        :return: The labels of field, in any order.
+        :rtype: list(bs4.element.Tag)
+        """
+
+        return [
+            element
+            for element in self.entries.get(('for', field_id), {}).values()
+            if element.name.lower() == 'label'
+        ]
+
+    def get_candidates(self, selector):
+        """
+        Returns the elements of document that can be matched by a selector,
+        using the last compound selector of selector.
+
+        :param selector: The CSS selector, without commas.
+        :type selector: str
+        :return: The elements that can be matched by selector, in any order,
+                 or None if the selector can not be resolved by index.
+        :rtype: list(bs4.element.Tag)
+        """
+
+        keys = get_index_keys(get_last_compound(selector))
+        if keys is None:
+            return None
+        candidates = None
+        for key in keys:
+            entry = self.entries.get(key)
+            if entry is None:
+                return []
+            if (candidates is None) or (len(entry) < len(candidates)):
+                candidates = entry
+        return list(candidates.values())
@@ -16,7 +16,7 @@ BeautifulSoupHTMLDOMTextNode classes.
 """
 
 import copy
-import re
+import weakref
 from bs4.element import NavigableString
 from bs4.element import PageElement
 from bs4.element import Tag
@@ -24,6 +24,51 @@ from hatemile import helper
 from hatemile.util.html.htmldomelement import HTMLDOMElement
 from hatemile.util.html.htmldomnode import HTMLDOMNode
 from hatemile.util.html.htmldomtextnode import HTMLDOMTextNode
+from .bsselectorcache import BeautifulSoupSelectorCache
+
+#: The parsers that observe the changes of documents, by id of document.
+DOCUMENT_OBSERVERS = weakref.WeakValueDictionary()
+
+#: The objects that encapsulate the BeautifulSoup nodes, by id of node.
+NODE_WRAPPERS = weakref.WeakValueDictionary()
+
+
+def get_observer(node):
+    """
+    Returns the parser that observe the changes of document of node.
+
+    :param node: The BeautifulSoup node.
+    :type node: bs4.element.PageElement
+    :return: The parser that observe the changes of document of node or None
+             if the node is not in a observed document.
+    :rtype: hatemile.util.html.bs.bshtmldomparser.BeautifulSoupHTMLDOMParser
+    """
+
+    root = node
+    while root.parent is not None:
+        root = root.parent
+    return DOCUMENT_OBSERVERS.get(id(root))
+
+
+def get_wrapper(node):
+    """
+    Returns the object that encapsulate the BeautifulSoup node, reusing the
+    object created before for the node while it is alive.
+
+    :param node: The BeautifulSoup node.
+    :type node: bs4.element.PageElement
+    :return: The object that encapsulate the node.
+    :rtype: hatemile.util.html.bs.bshtmldomnode.BeautifulSoupHTMLDOMNode
+    """
+
+    wrapper = NODE_WRAPPERS.get(id(node))
+    if (wrapper is None) or (wrapper.node is not node):
+        if isinstance(node, Tag):
+            wrapper = BeautifulSoupHTMLDOMElement(node)
+        else:
+            wrapper = BeautifulSoupHTMLDOMTextNode(node)
+        NODE_WRAPPERS[id(node)] = wrapper
+    return wrapper
 
 
 class BeautifulSoupHTMLDOMNode(HTMLDOMNode):
@@ -33,6 +78,8 @@ class BeautifulSoupHTMLDOMNode(HTMLDOMNode):
     BeautifulSoup library.
     """
 
+    __slots__ = ('node', '__weakref__')
+
     def __init__(self, node):
         """
         Initializes a new object that encapsulate the BeautifulSoup node.
@@ -46,20 +93,59 @@ class BeautifulSoupHTMLDOMNode(HTMLDOMNode):
 
         self.node = node
 
+    def _before_insertion(self, new_node):
+        """
+        Notify the observer of document of new node that it will be removed of
+        own place, before it is inserted in other place.
+
+        :param new_node: The BeautifulSoup node that will be inserted.
+        :type new_node: bs4.element.PageElement
+        """
+        # pylint: disable=no-self-use
+
+        observer = get_observer(new_node)
+        if observer is not None:
+            observer.node_removed(new_node)
+
+    def _after_insertion(self, new_node):
+        """
+        Notify the observer of document that a node was inserted.
+
+        :param new_node: The BeautifulSoup node inserted.
+        :type new_node: bs4.element.PageElement
+        """
+        # pylint: disable=no-self-use
+
+        observer = get_observer(new_node)
+        if observer is not None:
+            observer.node_inserted(new_node)
+
     def insert_before(self, new_node):
+        self._before_insertion(new_node.get_data())
         self.node.insert_before(new_node.get_data())
+        self._after_insertion(new_node.get_data())
         return self
 
     def insert_after(self, new_node):
+        self._before_insertion(new_node.get_data())
         self.node.insert_after(new_node.get_data())
+        self._after_insertion(new_node.get_data())
         return self
 
     def remove_node(self):
+        observer = get_observer(self.node)
+        if observer is not None:
+            observer.node_removed(self.node)
         self.node.extract()
         return self
 
     def replace_node(self, new_node):
+        observer = get_observer(self.node)
+        if observer is not None:
+            observer.node_removed(self.node)
+        self._before_insertion(new_node.get_data())
         self.node.replace_with(new_node.get_data())
+        self._after_insertion(new_node.get_data())
         return self
 
     def get_data(self):
@@ -69,7 +155,19 @@ class BeautifulSoupHTMLDOMNode(HTMLDOMNode):
         helper.require_not_none(data)
         helper.require_valid_type(data, PageElement)
 
+        if NODE_WRAPPERS.get(id(self.node)) is self:
+            del NODE_WRAPPERS[id(self.node)]
         self.node = data
+        if isinstance(data, Tag) == isinstance(self, HTMLDOMElement):
+            NODE_WRAPPERS[id(data)] = self
+
+    def __eq__(self, obj):
+        if isinstance(obj, BeautifulSoupHTMLDOMNode):
+            return self.node is obj.node
+        return False
+
+    def __hash__(self):
+        return id(self.node)
 
 
 class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
@@ -79,6 +177,27 @@ class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
     BeautifulSoup library.
     """
 
+    __slots__ = ()
+
+    #: The compiled CSS selectors, shared by all elements and parsers.
+    SELECTOR_CACHE = BeautifulSoupSelectorCache()
+
+    def _attribute_changed(self, name, old_value):
+        """
+        Notify the observer of document that a attribute of element was
+        changed.
+
+        :param name: The name of attribute.
+        :type name: str
+        :param old_value: The value of attribute before the change or None if
+                          the element not had the attribute.
+        :type old_value: str or list(str)
+        """
+
+        observer = get_observer(self.node)
+        if observer is not None:
+            observer.attribute_changed(self.node, name, old_value)
+
     def get_tag_name(self):
         return self.node.name.upper()
 
@@ -94,15 +213,15 @@ class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
         return self.node[name]
 
     def set_attribute(self, name, value):
+        old_value = self.node.get(name)
         self.node[name] = value
-        if bool(re.findall('^data-', name)):
-            self.node[re.sub('^data-', 'dataaaaaa', name)] = value
+        self._attribute_changed(name, old_value)
 
     def remove_attribute(self, name):
         if self.has_attribute(name):
+            old_value = self.node[name]
             del self.node[name]
-            if bool(re.findall('^data-', name)):
-                del self.node[re.sub('^data-', 'dataaaaaa', name)]
+            self._attribute_changed(name, old_value)
 
     def has_attribute(self, name):
         return self.node.has_attr(name)
@@ -110,11 +229,22 @@ class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
     def has_attributes(self):
         return bool(self.node.attrs)
 
+    def matches(self, selector):
+        selector_cache = BeautifulSoupHTMLDOMElement.SELECTOR_CACHE
+        for compiled_selector in selector_cache.get_compiled_selectors(
+            selector
+        ):
+            if compiled_selector.match(self.node):
+                return True
+        return False
+
     def get_text_content(self):
         return self.node.get_text()
 
     def append_element(self, element):
+        self._before_insertion(element.get_data())
         self.node.append(element.get_data())
+        self._after_insertion(element.get_data())
         return self
 
     def prepend_element(self, element):
@@ -128,16 +258,14 @@ class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
         children = []
         for child in self.node.children:
             if isinstance(child, Tag):
-                children.append(BeautifulSoupHTMLDOMElement(child))
+                children.append(get_wrapper(child))
         return children
 
     def get_children(self):
         children = []
         for child in self.node.children:
-            if isinstance(child, Tag):
-                children.append(BeautifulSoupHTMLDOMElement(child))
-            elif isinstance(child, NavigableString):
-                children.append(BeautifulSoupHTMLDOMTextNode(child))
+            if isinstance(child, (NavigableString, Tag)):
+                children.append(get_wrapper(child))
         return children
 
     def normalize(self):
@@ -156,14 +284,16 @@ class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
         return self
 
     def append_text(self, text):
-        self.node.append(text)
+        text_node = NavigableString(text)
+        self.node.append(text_node)
+        self._after_insertion(text_node)
         return self
 
     def prepend_text(self, text):
         if self.has_children():
-            self.get_first_node_child().get_data().insert_before(
-                NavigableString(text)
-            )
+            text_node = NavigableString(text)
+            self.get_first_node_child().get_data().insert_before(text_node)
+            self._after_insertion(text_node)
         else:
             self.append_text(text)
         return self
@@ -183,7 +313,7 @@ class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
     def get_parent_element(self):
         if self.node.parent is None:
             return None
-        return BeautifulSoupHTMLDOMElement(self.node.parent)
+        return get_wrapper(self.node.parent)
 
     def get_inner_html(self):
         string = ''
@@ -195,14 +325,14 @@ class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
         return str(self.node)
 
     def clone_element(self):
-        return BeautifulSoupHTMLDOMElement(copy.copy(self.node))
+        return get_wrapper(copy.copy(self.node))
 
     def get_first_element_child(self):
         if not self.has_children_elements():
             return None
         for child in self.node.children:
             if isinstance(child, Tag):
-                return BeautifulSoupHTMLDOMElement(child)
+                return get_wrapper(child)
         return None
 
     def get_last_element_child(self):
@@ -213,17 +343,15 @@ class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
             if isinstance(child, Tag):
                 last_value = child
         if last_value is not None:
-            return BeautifulSoupHTMLDOMElement(last_value)
+            return get_wrapper(last_value)
         return None
 
     def get_first_node_child(self):
         if not self.has_children():
             return None
         for child in self.node.children:
-            if isinstance(child, Tag):
-                return BeautifulSoupHTMLDOMElement(child)
-            elif isinstance(child, NavigableString):
-                return BeautifulSoupHTMLDOMTextNode(child)
+            if isinstance(child, (NavigableString, Tag)):
+                return get_wrapper(child)
         return None
 
     def get_last_node_child(self):
@@ -234,17 +362,9 @@ class BeautifulSoupHTMLDOMElement(BeautifulSoupHTMLDOMNode, HTMLDOMElement):
             if isinstance(child, (NavigableString, Tag)):
                 last_value = child
         if last_value is not None:
-            if isinstance(last_value, Tag):
-                return BeautifulSoupHTMLDOMElement(last_value)
-            elif isinstance(last_value, NavigableString):
-                return BeautifulSoupHTMLDOMTextNode(last_value)
+            return get_wrapper(last_value)
         return None
 
-    def __eq__(self, obj):
-        if isinstance(obj, BeautifulSoupHTMLDOMElement):
-            return self.get_data() == obj.get_data()
-        return False
-
 
 class BeautifulSoupHTMLDOMTextNode(BeautifulSoupHTMLDOMNode, HTMLDOMTextNode):
     """
@@ -253,6 +373,8 @@ class BeautifulSoupHTMLDOMTextNode(BeautifulSoupHTMLDOMNode, HTMLDOMTextNode):
     BeautifulSoup library.
     """
 
+    __slots__ = ()
+
     def get_text_content(self):
         return str(self.node)
 
@@ -269,4 +391,4 @@ class BeautifulSoupHTMLDOMTextNode(BeautifulSoupHTMLDOMNode, HTMLDOMTextNode):
         return self
 
     def get_parent_element(self):
-        return BeautifulSoupHTMLDOMElement(self.node.parent)
+        return get_wrapper(self.node.parent)
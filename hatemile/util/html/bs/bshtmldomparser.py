@@ -14,11 +14,79 @@
 Module of BeautifulSoupHTMLDOMParser class.
 """
 
-import re
+import io
+import itertools
+import mmap
 from bs4 import BeautifulSoup
+from bs4.dammit import EncodingDetector
+from bs4.dammit import UnicodeDammit
+from bs4.element import NavigableString
+from bs4.element import PreformattedString
+from bs4.element import Tag
 from hatemile import helper
 from hatemile.util.html.htmldomparser import HTMLDOMParser
+from .bshtmldomindex import BeautifulSoupHTMLDOMIndex
 from .bshtmldomnode import BeautifulSoupHTMLDOMElement
+from .bshtmldomnode import DOCUMENT_OBSERVERS
+from .bshtmldomnode import get_wrapper
+
+# pylint: disable=ungrouped-imports
+try:
+    from . import bssourcebuilder
+except ImportError:
+    bssourcebuilder = None  # pylint: disable=invalid-name
+
+#: The number of bytes at start of HTML code where the byte order mark and
+#: the meta element that declare its encoding are searched.
+ENCODING_SNIFF_SIZE = 4096
+
+
+def sniff_encoding(html_code):
+    """
+    Returns the encoding declared by the byte order mark or by the meta
+    element of a HTML code.
+
+    :param html_code: The HTML code, not decoded.
+    :type html_code: bytes or bytearray or mmap.mmap
+    :return: The encoding and the length of byte order mark or None and zero
+             if the HTML code not declares its encoding.
+    :rtype: tuple(str, int)
+    """
+
+    start = bytes(html_code[:ENCODING_SNIFF_SIZE])
+    content, encoding = EncodingDetector.strip_byte_order_mark(start)
+    if encoding is None:
+        encoding = EncodingDetector.find_declared_encoding(
+            start,
+            is_html=True
+        )
+    return (encoding, len(start) - len(content))
+
+
+def decode_html(html_code):
+    """
+    Returns the text of a HTML code, decoded by the encoding declared by its
+    byte order mark or by its meta element or, if not declared, by UTF-8. The
+    file objects are read and the buffers are decoded without be copied.
+
+    :param html_code: The HTML code or the file object with the HTML code.
+    :type html_code: str or bytes or bytearray or mmap.mmap or io.IOBase
+    :return: The text of HTML code.
+    :rtype: str
+    """
+
+    if isinstance(html_code, io.IOBase):
+        html_code = html_code.read()
+    if isinstance(html_code, str):
+        return html_code
+    encoding, mark_length = sniff_encoding(html_code)
+    if encoding is None:
+        encoding = 'utf-8'
+    try:
+        with memoryview(html_code) as buffer:
+            return str(buffer[mark_length:], encoding)
+    except (LookupError, UnicodeDecodeError):
+        return UnicodeDammit(bytes(html_code), is_html=True).unicode_markup
 
 
 class BeautifulSoupHTMLDOMParser(HTMLDOMParser):
@@ -28,23 +96,103 @@ class BeautifulSoupHTMLDOMParser(HTMLDOMParser):
     BeautifulSoup library.
     """
 
-    def __init__(self, code_or_parser):
+    #: The distance between the positions of consecutive elements, when the
+    #: positions of elements are indexed.
+    POSITION_STEP = 2 ** 32
+
+    #: The compiled CSS selectors, shared by all parsers and elements.
+    SELECTOR_CACHE = BeautifulSoupHTMLDOMElement.SELECTOR_CACHE
+
+    #: The maximum number of descendants of a element that is serialized at
+    #: once, when the HTML code is written in a file.
+    SERIALIZATION_LIMIT = 1024
+
+    def __init__(
+        self,
+        code_or_parser,
+        use_index=True,
+        keep_source=True,
+        record_edits=False
+    ):
         """
         Initializes a new object that encapsulate the parser of BeautifulSoup.
 
-        :param code_or_parser: The root element of the parser or the HTML code.
-        :type code_or_parser: str or bs4.BeautifulSoup
+        :param code_or_parser: The root element of the parser, the HTML code,
+                               not decoded or decoded, or the file object with
+                               the HTML code.
+        :type code_or_parser: str or bytes or bytearray or mmap.mmap or
+                              io.IOBase or bs4.BeautifulSoup
+        :param use_index: Resolve the simple selectors searched in document by
+                          a index of elements by tag name, attribute name, ID
+                          and class.
+        :type use_index: bool
+        :param keep_source: Keep the HTML code parsed, to serialize the
+                            elements not changed by copying its HTML code,
+                            if the installed version of BeautifulSoup is
+                            supported.
+        :type keep_source: bool
+        :param record_edits: Record the changes of document in a edit script.
+        :type record_edits: bool
         """
 
-        helper.require_not_none(code_or_parser)
-        helper.require_valid_type(code_or_parser, str, BeautifulSoup)
+        helper.require_not_none(
+            code_or_parser,
+            use_index,
+            keep_source,
+            record_edits
+        )
+        helper.require_valid_type(
+            code_or_parser,
+            str,
+            bytes,
+            bytearray,
+            mmap.mmap,
+            io.IOBase,
+            BeautifulSoup
+        )
+        helper.require_valid_type(use_index, bool)
+        helper.require_valid_type(keep_source, bool)
+        helper.require_valid_type(record_edits, bool)
 
+        self.source = None
+        self.source_ranges = None
+        self.changed_elements = {}
+        self.changed_attributes = {}
+        self.changed_children = {}
         if isinstance(code_or_parser, BeautifulSoup):
             self.document = code_or_parser
+        elif (
+            (keep_source)
+            and (bssourcebuilder is not None)
+            and (bssourcebuilder.is_supported())
+        ):
+            self.source = decode_html(code_or_parser)
+            builder = bssourcebuilder.BeautifulSoupSourceTreeBuilder()
+            self.document = BeautifulSoup(self.source, builder=builder)
+            self.source_ranges = builder.source_ranges
+            self.source_ranges[id(self.document)] = (
+                self.document,
+                0,
+                0,
+                len(self.source),
+                len(self.source)
+            )
+            for element in builder.substituted_elements:
+                self._element_changed(element, self.changed_attributes)
         else:
-            self.document = BeautifulSoup(code_or_parser, 'html.parser')
-            self._fix_data_select()
+            self.document = BeautifulSoup(
+                decode_html(code_or_parser),
+                'html.parser'
+            )
+        self.edit_script = None
+        if record_edits:
+            self.edit_script = []
         self.results = []
+        self.pending_selectors = None
+        self.positions = None
+        self.use_index = use_index
+        self.index = None
+        DOCUMENT_OBSERVERS[id(self.document)] = self
 
     def _in_list(self, original_list, item):
         """
@@ -64,6 +212,92 @@ class BeautifulSoupHTMLDOMParser(HTMLDOMParser):
                 return True
         return False
 
+    def _add_result(self, result, result_ids):
+        """
+        Add a result in the list of results, if it was not added before.
+
+        :param result: The result.
+        :type result: bs4.element.Tag
+        :param result_ids: The identities of results already added.
+        :type result_ids: set(int)
+        """
+
+        result_id = id(result)
+        if result_id not in result_ids:
+            result_ids.add(result_id)
+            self.results.append(result)
+
+    def _get_tree_elements(self, root):
+        """
+        Returns the root and the elements descendants of root, in document
+        order.
+
+        :param root: The root element.
+        :type root: bs4.element.Tag
+        :return: The root and the elements descendants of root.
+        :rtype: list(bs4.element.Tag)
+        """
+        # pylint: disable=no-self-use
+
+        elements = [root]
+        for descendant in root.descendants:
+            if isinstance(descendant, Tag):
+                elements.append(descendant)
+        return elements
+
+    def _get_positions(self):
+        """
+        Returns the index of positions of elements of document, creating it if
+        it not exists.
+
+        :return: The positions of elements, by id of elements.
+        :rtype: dict(int, int)
+        """
+
+        if self.positions is None:
+            self.positions = {}
+            position = 0
+            for element in self._get_tree_elements(self.document):
+                position += BeautifulSoupHTMLDOMParser.POSITION_STEP
+                self.positions[id(element)] = position
+        return self.positions
+
+    def _get_index(self):
+        """
+        Returns the index of elements of document by tag name, attribute name,
+        ID and class, creating it if it not exists.
+
+        :return: The index of elements or None if the parser not use index.
+        :rtype: hatemile.util.html.bs.bshtmldomindex.BeautifulSoupHTMLDOMIndex
+        """
+
+        if (self.index is None) and (self.use_index):
+            self.index = BeautifulSoupHTMLDOMIndex(self.document)
+        return self.index
+
+    def _get_adjacent_position(self, node, forward):
+        """
+        Returns the position of nearest indexed element before or after a
+        node, in document order.
+
+        :param node: The node.
+        :type node: bs4.element.PageElement
+        :param forward: To search after the node.
+        :type forward: bool
+        :return: The position of nearest element or None if not exists a
+                 element.
+        :rtype: int
+        """
+
+        while node is not None:
+            if isinstance(node, Tag) and (id(node) in self.positions):
+                return self.positions[id(node)]
+            if forward:
+                node = node.next_element
+            else:
+                node = node.previous_element
+        return None
+
     def _sort_results(self, results):
         """
         Order the results.
@@ -74,180 +308,690 @@ class BeautifulSoupHTMLDOMParser(HTMLDOMParser):
         :rtype: array.bs4.element.Tag
         """
 
-        parents = []
-        groups = []
+        if len(results) < 2:
+            return list(results)
+        positions = self._get_positions()
+        detached_positions = {}
+        keys = {}
         for result in results:
-            if not self._in_list(parents, result.parent):
-                parents.append(result.parent)
-                groups.append([])
-                groups[len(groups) - 1].append(result)
+            if id(result) in positions:
+                keys[id(result)] = (0, positions[id(result)])
+                continue
+            root = result
+            while root.parent is not None:
+                root = root.parent
+            if root is self.document:
+                self.positions = None
+                return self._sort_results(results)
+            if id(root) not in detached_positions:
+                tree_positions = {}
+                for element in self._get_tree_elements(root):
+                    tree_positions[id(element)] = len(tree_positions)
+                detached_positions[id(root)] = (
+                    len(detached_positions) + 1,
+                    tree_positions
+                )
+            tree_order, tree_positions = detached_positions[id(root)]
+            keys[id(result)] = (tree_order, tree_positions[id(result)])
+        return sorted(results, key=lambda result: keys[id(result)])
+
+    def _element_changed(self, element, changes):
+        """
+        Record that the attributes or the children of a element were changed,
+        to serialize the element again instead of copy its HTML code.
+
+        :param element: The element changed.
+        :type element: bs4.element.Tag
+        :param changes: The elements with the same kind of change.
+        :type changes: dict(int, bs4.element.Tag)
+        """
+
+        if self.source is None:
+            return
+        changes[id(element)] = element
+        while (
+            (element is not None)
+            and (self.changed_elements.get(id(element)) is not element)
+        ):
+            self.changed_elements[id(element)] = element
+            element = element.parent
+
+    def _get_path(self, node):
+        """
+        Returns the path of a node in document.
+
+        :param node: The node.
+        :type node: bs4.element.PageElement
+        :return: The positions of node and its ancestors in the contents of
+                 its parents, starting by the children of document.
+        :rtype: list(int)
+        """
+        # pylint: disable=no-self-use
+
+        path = []
+        while node.parent is not None:
+            for index, child in enumerate(node.parent.contents):
+                if child is node:
+                    path.append(index)
+                    break
+            node = node.parent
+        path.reverse()
+        return path
+
+    def _get_node(self, path):
+        """
+        Returns the node of document in a path.
+
+        :param path: The positions of node and its ancestors in the contents
+                     of its parents, starting by the children of document.
+        :type path: list(int)
+        :return: The node.
+        :rtype: bs4.element.PageElement
+        """
+
+        node = self.document
+        for index in path:
+            node = node.contents[index]
+        return node
+
+    def _is_parsed_as_is(self, element):
+        """
+        Check that the HTML code of a element is parsed as the same nodes,
+        without text nodes merged, empty text nodes lost or children of void
+        elements moved.
+
+        :param element: The element.
+        :type element: bs4.element.Tag
+        :return: True if the HTML code of element is parsed as the same nodes
+                 or False if it is not.
+        :rtype: bool
+        """
+
+        if element.contents and element.can_be_empty_element:
+            return False
+        previous_text = False
+        for child in element.contents:
+            if isinstance(child, Tag):
+                if not self._is_parsed_as_is(child):
+                    return False
+                previous_text = False
+            elif isinstance(child, PreformattedString):
+                previous_text = False
+            elif previous_text or (not child):
+                return False
             else:
-                groups[parents.index(result.parent)].append(result)
-        array = []
-        for group in groups:
-            array += sorted(
-                group,
-                key=lambda element: element.parent.contents.index(element)
-            )
-        return array
+                previous_text = True
+        return True
 
-    def _fix_data_select(self):
-        """
-        Replace all hyphens of data attributes for 'aaaaa', to avoid error in
-        search.
-        """
-
-        elements = self.document.select('*')
-        for element in elements:
-            attributes = element.attrs.keys()
-            data_attributes = list()
-            for attribute in attributes:
-                if bool(re.findall('^data-', attribute)):
-                    data_attributes.append({
-                        'original': attribute,
-                        'modified': re.sub('data-', 'dataaaaaa', attribute),
-                        'value': element[attribute]
-                    })
-            if data_attributes:
-                auxiliar_element = BeautifulSoupHTMLDOMElement(element)
-                for data_attribute in data_attributes:
-                    auxiliar_element.remove_attribute(
-                        data_attribute['original']
-                    )
-                    auxiliar_element.set_attribute(
-                        data_attribute['modified'],
-                        data_attribute['value']
+    def _record_insertion(self, node, path):
+        """
+        Record the insertion of a node in the edit script.
+
+        :param node: The node inserted.
+        :type node: bs4.element.PageElement
+        :param path: The path of node.
+        :type path: list(int)
+        """
+
+        if isinstance(node, Tag):
+            if self._is_parsed_as_is(node):
+                self.edit_script.append(['insert', path, node.decode()])
+            else:
+                start_tag, end_tag = self._get_tags(node, 'utf-8')
+                self.edit_script.append(['insert', path, start_tag + end_tag])
+                for index, child in enumerate(node.contents):
+                    self._record_insertion(child, path + [index])
+        elif isinstance(node, PreformattedString):
+            self.edit_script.append(['insert', path, node.output_ready()])
+        else:
+            self.edit_script.append(['text', path, str(node)])
+
+    def node_inserted(self, node):
+        """
+        Update the indexes and the changes of document after a node was
+        inserted in document.
+
+        :param node: The BeautifulSoup node inserted.
+        :type node: bs4.element.PageElement
+        """
+
+        if self.edit_script is not None:
+            self._record_insertion(node, self._get_path(node))
+        self._element_changed(node.parent, self.changed_children)
+        if not isinstance(node, Tag):
+            return
+        if self.index is not None:
+            self.index.add_tree(node)
+        if self.positions is not None:
+            elements = self._get_tree_elements(node)
+            for element in elements:
+                self.positions.pop(id(element), None)
+            previous_position = self._get_adjacent_position(
+                node.previous_element,
+                False
+            )
+            next_position = self._get_adjacent_position(
+                node.next_element,
+                True
+            )
+            if previous_position is None:
+                previous_position = 0
+            if next_position is None:
+                next_position = previous_position + (
+                    BeautifulSoupHTMLDOMParser.POSITION_STEP
+                    * (len(elements) + 1)
+                )
+            gap = next_position - previous_position
+            if gap <= len(elements):
+                self.positions = None
+            else:
+                for index, element in enumerate(elements):
+                    self.positions[id(element)] = previous_position + (
+                        gap * (index + 1) // (len(elements) + 1)
                     )
 
-    def _remove_data_select(self):
+    def node_removed(self, node):
         """
-        Remove all data attributes with 'aaaaa', to display the correct HTML
-        code of page.
+        Update the indexes and the changes of document before a node is
+        removed of document.
+
+        :param node: The BeautifulSoup node that will be removed.
+        :type node: bs4.element.PageElement
+        """
+
+        if node.parent is not None:
+            if self.edit_script is not None:
+                self.edit_script.append(['remove', self._get_path(node)])
+            self._element_changed(node.parent, self.changed_children)
+        if not isinstance(node, Tag):
+            return
+        if self.index is not None:
+            self.index.remove_tree(node)
+        if self.positions is not None:
+            for element in self._get_tree_elements(node):
+                self.positions.pop(id(element), None)
+
+    def attribute_changed(self, node, name, old_value):
+        """
+        Update the indexes and the changes of document after a attribute of
+        element of document was changed.
+
+        :param node: The BeautifulSoup element.
+        :type node: bs4.element.Tag
+        :param name: The name of attribute.
+        :type name: str
+        :param old_value: The value of attribute before the change or None if
+                          the element not had the attribute.
+        :type old_value: str or list(str)
+        """
+
+        if self.edit_script is not None:
+            self.edit_script.append([
+                'attribute',
+                self._get_path(node),
+                name,
+                get_wrapper(node).get_attribute(name)
+            ])
+        self._element_changed(node, self.changed_attributes)
+        if self.index is not None:
+            self.index.update_attribute(node, name, old_value)
+
+    def _get_compiled_selectors(self, selector):
+        """
+        Returns the compiled selectors of each comma-separated part of a CSS
+        selector, using the cache of compiled selectors.
+
+        :param selector: The CSS selector.
+        :type selector: str
+        :return: The compiled selectors.
+        :rtype: tuple(soupsieve.SoupSieve)
+        """
+        # pylint: disable=no-self-use
+
+        selector_cache = BeautifulSoupHTMLDOMParser.SELECTOR_CACHE
+        return selector_cache.get_compiled_selectors(selector)
+
+    def _select_in_document(self, compiled_selector):
+        """
+        Returns the elements of document matched by a compiled selector, in
+        document order.
+
+        :param compiled_selector: The compiled selector.
+        :type compiled_selector: soupsieve.SoupSieve
+        :return: The elements matched by selector.
+        :rtype: list(bs4.element.Tag)
+        """
+
+        index = self._get_index()
+        if index is not None:
+            candidates = index.get_candidates(compiled_selector.pattern)
+            if candidates is not None:
+                return self._sort_results([
+                    candidate
+                    for candidate in candidates
+                    if compiled_selector.match(candidate)
+                ])
+        return compiled_selector.select(self.document)
+
+    def _iter_in_document(self, compiled_selector):
+        """
+        Returns a iterator of the elements of document matched by a compiled
+        selector, in document order, that matches the elements only when they
+        are requested.
+
+        :param compiled_selector: The compiled selector.
+        :type compiled_selector: soupsieve.SoupSieve
+        :return: The iterator of elements matched by selector.
+        :rtype: iterator(bs4.element.Tag)
         """
 
-        elements = self.document.select('*')
-        for element in elements:
-            attributes = element.attrs.keys()
-            data_attributes = list()
-            for attribute in attributes:
-                if bool(re.findall('^dataaaaaa', attribute)):
-                    data_attributes.append(attribute)
-            if data_attributes:
-                auxiliar_element = BeautifulSoupHTMLDOMElement(element)
-                for data_attribute in data_attributes:
-                    auxiliar_element.remove_attribute(data_attribute)
+        index = self._get_index()
+        if index is not None:
+            candidates = index.get_candidates(compiled_selector.pattern)
+            if candidates is not None:
+                for candidate in self._sort_results(candidates):
+                    if compiled_selector.match(candidate):
+                        yield candidate
+                return
+        yield from compiled_selector.iselect(self.document)
+
+    def _get_results(self):
+        """
+        Returns the elements found, searching the elements of the last selector
+        passed to find, if they was not searched yet.
+
+        :return: The elements found.
+        :rtype: list(bs4.element.Tag)
+        """
+
+        if self.pending_selectors is not None:
+            result_ids = set()
+            for sel in self.pending_selectors:
+                for result in self._select_in_document(sel):
+                    self._add_result(result, result_ids)
+            self.pending_selectors = None
+        return self.results
 
     def find(self, selector):
+        self.results = []
+        self.pending_selectors = None
         if isinstance(selector, BeautifulSoupHTMLDOMElement):
-            self.results = [selector.get_data()]
+            self.results.append(selector.get_data())
         else:
-            selector = re.sub('data-', 'dataaaaaa', selector)
-            selectors = re.split(',', selector)
-            self.results = []
-            for sel in selectors:
-                results = self.document.select(sel)
-                for result in results:
-                    if not self._in_list(self.results, result):
-                        self.results.append(result)
+            self.pending_selectors = self._get_compiled_selectors(selector)
         return self
 
     def find_children(self, selector):
-        last_results = self.results
+        last_results = self._get_results()
         self.results = []
+        result_ids = set()
         if isinstance(selector, BeautifulSoupHTMLDOMElement):
+            native_selector = selector.get_data()
             for result in last_results:
-                if self._in_list(result.children, selector):
-                    self.results.append(selector.get_data())
+                if native_selector.parent is result:
+                    self._add_result(native_selector, result_ids)
                     break
         else:
-            selector = re.sub('data-', 'dataaaaaa', selector)
-            selectors = re.split(',', selector)
+            selectors = self._get_compiled_selectors(selector)
             for sel in selectors:
                 for last_result in last_results:
-                    results = last_result.select(sel)
-                    for result in results:
-                        if (
-                            (self._in_list(last_result.children, result))
-                            and (not self._in_list(self.results, result))
-                        ):
-                            self.results.append(result)
+                    for child in last_result.children:
+                        if isinstance(child, Tag) and sel.match(child):
+                            self._add_result(child, result_ids)
         return self
 
     def find_descendants(self, selector):
-        last_results = self.results
+        last_results = self._get_results()
         if isinstance(selector, BeautifulSoupHTMLDOMElement):
+            native_selector = selector.get_data()
+            parent_ids = set(id(parent) for parent in native_selector.parents)
             for result in last_results:
-                if self._in_list(selector.parents, result):
-                    self.results = [selector.get_data()]
+                if id(result) in parent_ids:
+                    self.results = [native_selector]
                     break
         else:
-            selector = re.sub('data-', 'dataaaaaa', selector)
-            selectors = re.split(',', selector)
+            selectors = self._get_compiled_selectors(selector)
             self.results = []
+            result_ids = set()
             for sel in selectors:
                 for last_result in last_results:
-                    results = last_result.select(sel)
-                    for result in results:
-                        if not self._in_list(self.results, result):
-                            self.results.append(result)
+                    for result in sel.select(last_result):
+                        self._add_result(result, result_ids)
         return self
 
     def find_ancestors(self, selector):
-        last_results = self.results
+        last_results = self._get_results()
         if isinstance(selector, BeautifulSoupHTMLDOMElement):
+            native_selector = selector.get_data()
             for result in last_results:
-                if self._in_list(result.parents, selector):
-                    self.results = [selector.get_data()]
+                if self._in_list(result.parents, native_selector):
+                    self.results = [native_selector]
                     break
         else:
-            parents = []
             self.results = []
-            selector = re.sub('data-', 'dataaaaaa', selector)
-            selectors = re.split(',', selector)
-            for sel in selectors:
-                results = self.document.select(sel)
-                for result in results:
-                    if not self._in_list(parents, result):
-                        parents.append(result)
+            result_ids = set()
+            selectors = self._get_compiled_selectors(selector)
             for result in last_results:
-                for parent in parents:
-                    if (
-                        (self._in_list(result.parents, parent))
-                        and (not self._in_list(self.results, parent))
-                    ):
-                        self.results.append(parent)
+                ancestors = [
+                    ancestor
+                    for ancestor in result.parents
+                    if not isinstance(ancestor, BeautifulSoup)
+                ]
+                ancestors.reverse()
+                for sel in selectors:
+                    for ancestor in ancestors:
+                        if sel.match(ancestor):
+                            self._add_result(ancestor, result_ids)
         return self
 
     def first_result(self):
+        if self.pending_selectors is not None:
+            for sel in self.pending_selectors:
+                for result in self._iter_in_document(sel):
+                    return get_wrapper(result)
+            return None
         if not bool(self.results):
             return None
-        return BeautifulSoupHTMLDOMElement(self.results[0])
+        return get_wrapper(self.results[0])
 
     def last_result(self):
-        if not bool(self.results):
+        results = self._get_results()
+        if not bool(results):
             return None
-        return BeautifulSoupHTMLDOMElement(self.results[len(self.results) - 1])
+        return get_wrapper(results[len(results) - 1])
 
     def list_results(self):
         array = []
-        ordened_results = self._sort_results(self.results)
+        ordened_results = self._sort_results(self._get_results())
         for result in ordened_results:
-            array.append(BeautifulSoupHTMLDOMElement(result))
+            array.append(get_wrapper(result))
+        return array
+
+    def iter_results(self):
+        if (
+            (self.pending_selectors is not None)
+            and (len(self.pending_selectors) == 1)
+        ):
+            return map(
+                get_wrapper,
+                self._iter_in_document(self.pending_selectors[0])
+            )
+        return iter(self.list_results())
+
+    def exists(self):
+        if self.pending_selectors is not None:
+            for sel in self.pending_selectors:
+                for _ in self._iter_in_document(sel):
+                    return True
+            return False
+        return bool(self.results)
+
+    def get_element_by_id(self, element_id):
+        index = self._get_index()
+        if index is not None:
+            elements = self._sort_results(index.get_elements_by_id(element_id))
+            if not elements:
+                return None
+            return get_wrapper(elements[0])
+        element = self.document.find(attrs={'id': element_id})
+        if element is None:
+            return None
+        return get_wrapper(element)
+
+    def get_labels_for(self, field_id):
+        index = self._get_index()
+        if index is not None:
+            labels = self._sort_results(index.get_labels_for(field_id))
+        else:
+            labels = self.document.find_all('label', attrs={'for': field_id})
+        array = []
+        for label in labels:
+            array.append(get_wrapper(label))
         return array
 
     def create_element(self, tag):
-        return BeautifulSoupHTMLDOMElement(self.document.new_tag(tag))
+        return get_wrapper(self.document.new_tag(tag))
 
     def get_html(self):
-        self._remove_data_select()
-        content = str(self.document)
-        self._fix_data_select()
-        return content
+        if self.source is None:
+            return str(self.document)
+        return ''.join(self._iter_document_html('utf-8'))
+
+    def _get_end_tag(self, element):
+        """
+        Returns the end tag of a element.
+
+        :param element: The element.
+        :type element: bs4.element.Tag
+        :return: The end tag of element.
+        :rtype: str
+        """
+        # pylint: disable=no-self-use
+
+        if element.prefix:
+            return '</' + element.prefix + ':' + element.name + '>'
+        return '</' + element.name + '>'
+
+    def _get_tags(self, element, encoding):
+        """
+        Returns the start tag and the end tag of a element.
+
+        :param element: The element with children.
+        :type element: bs4.element.Tag
+        :param encoding: The encoding of HTML code.
+        :type encoding: str
+        :return: The start tag and the end tag of element.
+        :rtype: tuple(str, str)
+        """
+
+        empty_element = Tag(
+            name=element.name,
+            attrs=element.attrs,
+            prefix=element.prefix,
+            namespace=element.namespace
+        )
+        end_tag = self._get_end_tag(element)
+        html = empty_element.decode(eventual_encoding=encoding)
+        return (html[:len(html) - len(end_tag)], end_tag)
+
+    def _iter_html(self, node, encoding):
+        """
+        Returns the HTML code of children of a node in parts. The children
+        with many descendants are serialized in parts too.
+
+        :param node: The node.
+        :type node: bs4.element.Tag
+        :param encoding: The encoding of HTML code.
+        :type encoding: str
+        :return: The parts of HTML code of children of node.
+        :rtype: iterator(str)
+        """
+
+        limit = BeautifulSoupHTMLDOMParser.SERIALIZATION_LIMIT
+        for child in node.contents:
+            if isinstance(child, Tag) and (self.source is not None):
+                yield from self._iter_element_html(child, encoding, False)
+            elif isinstance(child, Tag):
+                descendants = itertools.islice(child.descendants, limit + 1)
+                if sum(1 for _ in descendants) > limit:
+                    start_tag, end_tag = self._get_tags(child, encoding)
+                    yield start_tag
+                    yield from self._iter_html(child, encoding)
+                    yield end_tag
+                else:
+                    yield child.decode(eventual_encoding=encoding)
+            else:
+                yield child.output_ready()
+
+    def _iter_element_html(self, element, encoding, in_place):
+        """
+        Returns the HTML code of a element in parts, copying the HTML code
+        parsed of the parts of element not changed.
+
+        :param element: The element.
+        :type element: bs4.element.Tag
+        :param encoding: The encoding of HTML code.
+        :type encoding: str
+        :param in_place: The element is in its place of HTML code parsed,
+                         followed by the same HTML code, that closes the
+                         element if it was not closed by a end tag.
+        :type in_place: bool
+        :return: The parts of HTML code of element.
+        :rtype: iterator(str)
+        """
+
+        source_range = self.source_ranges.get(id(element))
+        if (source_range is None) or (source_range[0] is not element):
+            if element.is_empty_element:
+                yield element.decode(eventual_encoding=encoding)
+            else:
+                start_tag, end_tag = self._get_tags(element, encoding)
+                yield start_tag
+                yield from self._iter_html(element, encoding)
+                yield end_tag
+            return
+        start, content_start, content_end, end = source_range[1:]
+        self_closed = self.source.startswith('/>', content_start - 2)
+        end_tag = self.source[content_end:end]
+        children_changed = (
+            self.changed_children.get(id(element)) is element
+        )
+        if (
+            (not in_place)
+            and (not end_tag)
+            and (not self_closed)
+            and (not element.is_empty_element)
+        ):
+            # The element was closed by the HTML code after it, so its end tag
+            # and the end tags of its descendants closed with it are added.
+            end_tag = self._get_end_tag(element)
+            children_changed = True
+        elif self.changed_elements.get(id(element)) is not element:
+            yield self.source[start:end]
+            return
+        if element.is_empty_element:
+            yield element.decode(eventual_encoding=encoding)
+            return
+        if (
+            (self.changed_attributes.get(id(element)) is element)
+            or self_closed
+        ):
+            start_tag, end_tag = self._get_tags(element, encoding)
+            yield start_tag
+        else:
+            yield self.source[start:content_start]
+        if children_changed:
+            yield from self._iter_html(element, encoding)
+        else:
+            position = content_start
+            for child in element.contents:
+                if (
+                    isinstance(child, Tag)
+                    and (self.changed_elements.get(id(child)) is child)
+                ):
+                    child_range = self.source_ranges[id(child)]
+                    yield self.source[position:child_range[1]]
+                    yield from self._iter_element_html(child, encoding, True)
+                    position = child_range[4]
+            yield self.source[position:content_end]
+        yield end_tag
+
+    def _iter_document_html(self, encoding):
+        """
+        Returns the HTML code of document in parts.
+
+        :param encoding: The encoding of HTML code.
+        :type encoding: str
+        :return: The parts of HTML code of document.
+        :rtype: iterator(str)
+        """
+
+        if self.source is None:
+            return self._iter_html(self.document, encoding)
+        return self._iter_element_html(self.document, encoding, True)
+
+    def write_html(self, html_file, encoding=None):
+        if encoding is None:
+            for html in self._iter_document_html('utf-8'):
+                html_file.write(html)
+        else:
+            for html in self._iter_document_html(encoding):
+                html_file.write(html.encode(encoding, 'xmlcharrefreplace'))
+
+    def get_edit_script(self):
+        """
+        Returns the changes of document, since the parser was created, in the
+        order that they were made. Each change is a list with the operation
+        and the path of node changed, that is the positions of node and its
+        ancestors in the contents of its parents. The operations are
+        ``['insert', path, html]``, that inserts the node of HTML code in the
+        path, ``['text', path, text]``, that inserts a text node in the path,
+        ``['remove', path]``, that removes the node of path, and
+        ``['attribute', path, name, value]``, that changes the value of
+        attribute of element of path or removes it if the value is None.
+
+        :return: The changes of document or None if the parser not record the
+                 changes.
+        :rtype: list(list)
+        """
+
+        if self.edit_script is None:
+            return None
+        return list(self.edit_script)
+
+    def apply_edit_script(self, edit_script):
+        """
+        Make the changes of a edit script in document.
+
+        :param edit_script: The changes of document, returned by
+                            :py:meth:`get_edit_script` of a parser of same
+                            HTML code.
+        :type edit_script: list(list)
+        """
+
+        helper.require_not_none(edit_script)
+
+        for edit in edit_script:
+            operation = edit[0]
+            if operation == 'insert':
+                parent = self._get_node(edit[1][:-1])
+                position = edit[1][-1]
+                fragment = BeautifulSoup(edit[2], 'html.parser')
+                for node in list(fragment.contents):
+                    parent.insert(position, node.extract())
+                    self.node_inserted(node)
+                    position += 1
+            elif operation == 'text':
+                text_node = NavigableString(edit[2])
+                self._get_node(edit[1][:-1]).insert(edit[1][-1], text_node)
+                self.node_inserted(text_node)
+            elif operation == 'remove':
+                node = self._get_node(edit[1])
+                self.node_removed(node)
+                node.extract()
+            elif operation == 'attribute':
+                element = get_wrapper(self._get_node(edit[1]))
+                if edit[3] is None:
+                    element.remove_attribute(edit[2])
+                else:
+                    element.set_attribute(edit[2], edit[3])
+            else:
+                raise ValueError('Invalid edit: ' + str(edit))
 
     def get_parser(self):
         return self.document
 
     def clear_parser(self):
+        DOCUMENT_OBSERVERS.pop(id(self.document), None)
         del self.results[:]
         self.results = None
+        self.pending_selectors = None
+        self.positions = None
+        self.index = None
+        self.source = None
+        self.source_ranges = None
+        self.changed_elements = None
+        self.changed_attributes = None
+        self.changed_children = None
+        self.edit_script = None
         self.document = None
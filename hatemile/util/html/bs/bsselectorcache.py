@@ -0,0 +1,100 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of BeautifulSoupSelectorCache class.
+"""
+
+import collections
+import re
+import threading
+import soupsieve
+from hatemile import helper
+
+
+class BeautifulSoupSelectorCache:
+    """
+    The BeautifulSoupSelectorCache class keep the last CSS selectors compiled
+    by soupsieve, to avoid compile the same selector again.
+    """
+
+    #: The default maximum number of selectors in cache.
+    DEFAULT_MAX_SIZE = 512
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        """
+        Initializes a new object that keep the compiled CSS selectors.
+
+        :param max_size: The maximum number of selectors in cache.
+        :type max_size: int
+        """
+
+        helper.require_not_none(max_size)
+        helper.require_valid_type(max_size, int)
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.selectors = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_compiled_selectors(self, selector):
+        """
+        Returns the compiled selectors of each comma-separated part of a CSS
+        selector.
+
+        :param selector: The CSS selector.
+        :type selector: str
+        :return: The compiled selectors.
+        :rtype: tuple(soupsieve.SoupSieve)
+        """
+
+        with self.lock:
+            compiled_selectors = self.selectors.get(selector)
+            if compiled_selectors is not None:
+                self.hits += 1
+                self.selectors.move_to_end(selector)
+                return compiled_selectors
+            self.misses += 1
+
+        compiled_selectors = tuple(
+            soupsieve.compile(sel) for sel in re.split(',', selector)
+        )
+
+        with self.lock:
+            self.selectors[selector] = compiled_selectors
+            self.selectors.move_to_end(selector)
+            while len(self.selectors) > self.max_size:
+                self.selectors.popitem(last=False)
+        return compiled_selectors
+
+    def get_size(self):
+        """
+        Returns the number of selectors in cache.
+
+        :return: The number of selectors in cache.
+        :rtype: int
+        """
+
+        with self.lock:
+            return len(self.selectors)
+
+    def clear(self):
+        """
+        Remove all selectors of cache and reset the counters of hits and
+        misses.
+        """
+
+        with self.lock:
+            self.selectors.clear()
+            self.hits = 0
+            self.misses = 0
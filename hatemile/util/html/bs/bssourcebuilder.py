@@ -0,0 +1,207 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of BeautifulSoupSourceHTMLParser and BeautifulSoupSourceTreeBuilder
+classes. The classes use internals of BeautifulSoup, so
+:py:func:`is_supported` checks that they work with the installed version.
+"""
+
+import functools
+from bs4 import BeautifulSoup
+from bs4.builder import ParserRejectedMarkup
+from bs4.builder._htmlparser import BeautifulSoupHTMLParser
+from bs4.builder._htmlparser import HTMLParserTreeBuilder
+
+
+class BeautifulSoupSourceHTMLParser(BeautifulSoupHTMLParser):
+    """
+    The BeautifulSoupSourceHTMLParser class is the html.parser parser of
+    BeautifulSoup that records the place of each element in the HTML code.
+    The place of a element is a tuple with the element and the offsets of
+    start of element, start of content, end of content and end of element.
+    """
+
+    def __init__(self, soup, source, source_ranges, *args, **kwargs):
+        """
+        Initializes a new object that parses a HTML code and records the
+        place of each element.
+
+        :param soup: The BeautifulSoup document built by parser.
+        :type soup: bs4.BeautifulSoup
+        :param source: The HTML code.
+        :type source: str
+        :param source_ranges: The places of elements in HTML code, by id of
+                              element, where the places are recorded.
+        :type source_ranges: dict(int, tuple)
+        """
+
+        super().__init__(soup, *args, **kwargs)
+        self.source = source
+        self.source_ranges = source_ranges
+        self.line_offsets = [0]
+        line_end = source.find('\n')
+        while line_end >= 0:
+            self.line_offsets.append(line_end + 1)
+            line_end = source.find('\n', line_end + 1)
+        self.open_ranges = {}
+        self.start_tag_range = None
+
+    def _get_offset(self):
+        """
+        Returns the offset in HTML code of the token that is parsed.
+
+        :return: The offset of token.
+        :rtype: int
+        """
+
+        line, column = self.getpos()
+        return self.line_offsets[line - 1] + column
+
+    def _close_element(self, element, content_end, end):
+        """
+        Record the place of a element closed.
+
+        :param element: The element.
+        :type element: bs4.element.Tag
+        :param content_end: The offset of end of content of element.
+        :type content_end: int
+        :param end: The offset of end of element.
+        :type end: int
+        """
+
+        start, content_start = self.open_ranges.pop(id(element))
+        self.source_ranges[id(element)] = (
+            element,
+            start,
+            content_start,
+            content_end,
+            end
+        )
+
+    def close_open_elements(self):
+        """
+        Record the places of elements not closed at the end of HTML code.
+        """
+
+        end = len(self.source)
+        for element in self.soup.tagStack:
+            if id(element) in self.open_ranges:
+                self._close_element(element, end, end)
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        start = self._get_offset()
+        self.start_tag_range = (start, start + len(self.get_starttag_text()))
+        stack = self.soup.tagStack
+        depth = len(stack)
+        super().handle_starttag(tag, attrs, handle_empty_element)
+        if len(stack) > depth:
+            self.open_ranges[id(stack[-1])] = self.start_tag_range
+
+    def handle_endtag(self, tag, check_already_closed=True):
+        stack = self.soup.tagStack
+        open_elements = list(stack)
+        if check_already_closed:
+            content_end = self._get_offset()
+            end = self.source.find('>', content_end) + 1
+            if end == 0:
+                end = len(self.source)
+        else:
+            # The element is closed by its own start tag.
+            content_end = end = self.start_tag_range[1]
+        super().handle_endtag(tag, check_already_closed)
+        closed_elements = open_elements[len(stack):]
+        for element in closed_elements:
+            # The void elements are closed before its start is recorded.
+            if id(element) not in self.open_ranges:
+                self.open_ranges[id(element)] = self.start_tag_range
+        if closed_elements:
+            self._close_element(closed_elements[0], content_end, end)
+            for element in closed_elements[1:]:
+                self._close_element(element, content_end, content_end)
+
+
+class BeautifulSoupSourceTreeBuilder(HTMLParserTreeBuilder):
+    """
+    The BeautifulSoupSourceTreeBuilder class is the html.parser tree builder
+    of BeautifulSoup that records the place of each element in the HTML code,
+    to serialize the elements not changed by copying its HTML code.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes a new tree builder that records the place of each element
+        in the HTML code.
+        """
+
+        super().__init__(*args, **kwargs)
+        self.source_ranges = {}
+        self.substituted_elements = []
+
+    def set_up_substitutions(self, tag):
+        substituted = super().set_up_substitutions(tag)
+        if substituted:
+            self.substituted_elements.append(tag)
+        return substituted
+
+    def feed(self, markup):  # pylint: disable=arguments-differ
+        args, kwargs = self.parser_args
+        parser = BeautifulSoupSourceHTMLParser(
+            self.soup,
+            markup,
+            self.source_ranges,
+            *args,
+            **kwargs
+        )
+        try:
+            parser.feed(markup)
+            parser.close()
+        except AssertionError as error:
+            raise ParserRejectedMarkup(error) from error
+        parser.close_open_elements()
+        parser.already_closed_empty_element = []
+
+
+@functools.lru_cache(maxsize=None)
+def is_supported():
+    """
+    Check that the internals of BeautifulSoup used to record the places of
+    elements, as the tag stack of document, the arguments of parser and the
+    void elements closed by parser, work with the installed version of
+    BeautifulSoup.
+
+    :return: True if the places of elements are recorded or False if the
+             internals of BeautifulSoup changed.
+    :rtype: bool
+    """
+
+    builder = BeautifulSoupSourceTreeBuilder()
+    try:
+        document = BeautifulSoup('<p>a<br></p>', builder=builder)
+    except (
+        AttributeError,
+        IndexError,
+        KeyError,
+        ParserRejectedMarkup,
+        TypeError,
+        ValueError
+    ):
+        return False
+    paragraph = document.find('p')
+    line_break = document.find('br')
+    return (
+        (builder.source_ranges.get(id(paragraph)) == (paragraph, 0, 3, 8, 12))
+        and (
+            builder.source_ranges.get(id(line_break))
+            == (line_break, 4, 8, 8, 8)
+        )
+    )
@@ -23,6 +23,8 @@ class HTMLDOMElement(HTMLDOMNode):
     element.
     """
 
+    __slots__ = ()
+
     def get_tag_name(self):
         """
         Returns the tag name of element.
@@ -92,6 +94,19 @@ class HTMLDOMElement(HTMLDOMNode):
 
         pass
 
+    def matches(self, selector):
+        """
+        Check that the element is matched by a CSS selector.
+
+        :param selector: The CSS selector.
+        :type selector: str
+        :return: True if the element is matched by the selector or False if
+                 the element is not matched by the selector.
+        :rtype: bool
+        """
+
+        pass
+
     def append_element(self, element):
         """
         Append a element child.
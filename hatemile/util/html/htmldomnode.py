@@ -20,6 +20,8 @@ class HTMLDOMNode:
     The HTMLDOMNode interface contains the methods for access the Node.
     """
 
+    __slots__ = ()
+
     def get_text_content(self):
         """
         Returns the text content of node.
@@ -122,7 +124,10 @@ class HTMLDOMNode:
 
     def set_data(self, data):
         """
-        Modify the native object of this node.
+        Modify the native object of this node. The nodes that encapsulate the
+        same native object are equal, so the hash of this node changes and
+        this node must not be in a set or be a key of a dictionary when its
+        native object is modified.
 
         :param data: The native object of this node.
         :type data: object
@@ -74,7 +74,7 @@ class HTMLDOMParser:
 
     def first_result(self):
         """
-        Returns the first element found.
+        Returns the first element found, stopping the search at this element.
 
         :return: The first element found or None if not have elements found.
         :rtype: hatemile.util.html.htmldomelement.HTMLDOMElement
@@ -102,6 +102,57 @@ class HTMLDOMParser:
 
         pass
 
+    def iter_results(self):
+        """
+        Returns a iterator of all elements found, in document order. The
+        elements of a selector without commas are searched only when they are
+        requested, so the document must not be changed while the iterator is
+        used.
+
+        :return: The iterator of all elements found.
+        :rtype: iterator(hatemile.util.html.htmldomelement.HTMLDOMElement)
+        """
+
+        pass
+
+    def exists(self):
+        """
+        Check that elements was found, stopping the search at the first
+        element found.
+
+        :return: True if elements was found or False if not have elements
+                 found.
+        :rtype: bool
+        """
+
+        pass
+
+    def get_element_by_id(self, element_id):
+        """
+        Returns the first element of parser with the ID.
+
+        :param element_id: The ID.
+        :type element_id: str
+        :return: The first element with the ID or None if not exists a element
+                 with the ID.
+        :rtype: hatemile.util.html.htmldomelement.HTMLDOMElement
+        """
+
+        pass
+
+    def get_labels_for(self, field_id):
+        """
+        Returns the labels of parser that reference a field by the attribute
+        for.
+
+        :param field_id: The ID of field.
+        :type field_id: str
+        :return: The labels of field, in document order.
+        :rtype: list(hatemile.util.html.htmldomelement.HTMLDOMElement)
+        """
+
+        pass
+
     def create_element(self, tag):
         """
         Create a element.
@@ -124,6 +175,21 @@ class HTMLDOMParser:
 
         pass
 
+    def write_html(self, html_file, encoding=None):
+        """
+        Write the HTML code of parser in a file, serializing the document in
+        parts, without build the HTML code entirely in memory.
+
+        :param html_file: The file opened in text mode, if the encoding is
+                          None, or in binary mode.
+        :type html_file: io.IOBase
+        :param encoding: The encoding of HTML code written or None to write
+                         the HTML code as text.
+        :type encoding: str
+        """
+
+        pass
+
     def get_parser(self):
         """
         Returns the parser.
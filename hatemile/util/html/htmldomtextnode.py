@@ -23,6 +23,8 @@ class HTMLDOMTextNode(HTMLDOMNode):
     TextNode.
     """
 
+    __slots__ = ()
+
     def set_text_content(self, text):
         """
         Change the text content of text node.
@@ -0,0 +1,208 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of LXMLHTMLDOMIndex class.
+"""
+
+from hatemile.util.html.bs.bshtmldomindex import get_index_keys
+from .lxmlhtmldomnode import is_element
+
+
+class LXMLHTMLDOMIndex:
+    """
+    The LXMLHTMLDOMIndex class is a inverted index of elements of a lxml
+    document, by tag name, attribute name, attribute value, ID and class.
+    """
+
+    def __init__(self, document):
+        """
+        Initializes a new object that index the elements of document.
+
+        :param document: The root element of lxml document.
+        :type document: lxml.etree._Element
+        """
+
+        self.entries = {}
+        self.add_tree(document)
+
+    def _get_attribute_keys(self, name, value):
+        """
+        Returns the keys of index of a attribute of element.
+
+        :param name: The name of attribute.
+        :type name: str
+        :param value: The value of attribute.
+        :type value: str
+        :return: The keys of index of attribute.
+        :rtype: list(tuple(str, str))
+        """
+        # pylint: disable=no-self-use
+
+        name = name.lower()
+        keys = [('attribute', name), ('value', name + '=' + value.lower())]
+        if name == 'id':
+            keys.append(('id', value))
+        elif name == 'for':
+            keys.append(('for', value))
+        elif name == 'class':
+            for class_name in value.split():
+                keys.append(('class', class_name))
+        return keys
+
+    def _get_element_keys(self, element):
+        """
+        Returns the keys of index of element.
+
+        :param element: The element.
+        :type element: lxml.etree._Element
+        :return: The keys of index of element.
+        :rtype: list(tuple(str, str))
+        """
+
+        keys = [('tag', element.tag.lower())]
+        for name, value in element.attrib.items():
+            keys.extend(self._get_attribute_keys(name, value))
+        return keys
+
+    def _add_key(self, key, element):
+        """
+        Add a element in the entry of key.
+
+        :param key: The key of index.
+        :type key: tuple(str, str)
+        :param element: The element.
+        :type element: lxml.etree._Element
+        """
+
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {}
+            self.entries[key] = entry
+        entry[id(element)] = element
+
+    def _remove_key(self, key, element):
+        """
+        Remove a element of the entry of key.
+
+        :param key: The key of index.
+        :type key: tuple(str, str)
+        :param element: The element.
+        :type element: lxml.etree._Element
+        """
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry.pop(id(element), None)
+            if not entry:
+                del self.entries[key]
+
+    def add_tree(self, root):
+        """
+        Add a element and its descendants in index.
+
+        :param root: The element.
+        :type root: lxml.etree._Element
+        """
+
+        for element in root.iter():
+            if is_element(element):
+                for key in self._get_element_keys(element):
+                    self._add_key(key, element)
+
+    def remove_tree(self, root):
+        """
+        Remove a element and its descendants of index.
+
+        :param root: The element.
+        :type root: lxml.etree._Element
+        """
+
+        for element in root.iter():
+            if is_element(element):
+                for key in self._get_element_keys(element):
+                    self._remove_key(key, element)
+
+    def update_attribute(self, element, name, old_value):
+        """
+        Update the index after a attribute of element was changed.
+
+        :param element: The element.
+        :type element: lxml.etree._Element
+        :param name: The name of attribute.
+        :type name: str
+        :param old_value: The value of attribute before the change or None if
+                          the element not had the attribute.
+        :type old_value: str
+        """
+
+        if old_value is not None:
+            for key in self._get_attribute_keys(name, old_value):
+                self._remove_key(key, element)
+        value = element.get(name)
+        if value is not None:
+            for key in self._get_attribute_keys(name, value):
+                self._add_key(key, element)
+
+    def get_elements_by_id(self, element_id):
+        """
+        Returns the elements of document with the ID.
+
+        :param element_id: The ID.
+        :type element_id: str
+        :return: The elements with the ID, in any order.
+        :rtype: list(lxml.etree._Element)
+        """
+
+        return list(self.entries.get(('id', element_id), {}).values())
+
+    def get_labels_for(self, field_id):
+        """
+        Returns the labels of document that reference a field by the attribute
+        for.
+
+        :param field_id: The ID of field.
+        :type field_id: str
+        :return: The labels of field, in any order.
+        :rtype: list(lxml.etree._Element)
+        """
+
+        return [
+            element
+            for element in self.entries.get(('for', field_id), {}).values()
+            if element.tag.lower() == 'label'
+        ]
+
+    def get_candidates(self, selector):
+        """
+        Returns the elements of document that can be matched by a compound
+        selector.
+
+        :param selector: The compound CSS selector, without commas and
+                         combinators.
+        :type selector: str
+        :return: The elements that can be matched by selector, in any order,
+                 or None if the selector can not be resolved by index.
+        :rtype: list(lxml.etree._Element)
+        """
+
+        keys = get_index_keys(selector)
+        if keys is None:
+            return None
+        candidates = None
+        for key in keys:
+            entry = self.entries.get(key)
+            if entry is None:
+                return []
+            if (candidates is None) or (len(entry) < len(candidates)):
+                candidates = entry
+        return list(candidates.values())
@@ -0,0 +1,534 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of LXMLHTMLDOMNode, LXMLHTMLDOMElement and LXMLHTMLDOMTextNode
+classes.
+"""
+
+import copy
+import html
+import weakref
+from lxml import etree
+from hatemile import helper
+from hatemile.util.html.htmldomelement import HTMLDOMElement
+from hatemile.util.html.htmldomnode import HTMLDOMNode
+from hatemile.util.html.htmldomtextnode import HTMLDOMTextNode
+from .lxmlselector import get_selector_expression
+
+#: The class of lxml elements.
+ELEMENT_CLASS = etree._Element  # pylint: disable=protected-access,invalid-name
+
+#: The tags of elements which the text content is not escaped.
+RAW_TEXT_TAGS = ('script', 'style')
+
+#: The parsers that observe the changes of documents, by id of root element
+#: of document.
+DOCUMENT_OBSERVERS = weakref.WeakValueDictionary()
+
+#: The objects that encapsulate the lxml elements, by id of element.
+NODE_WRAPPERS = weakref.WeakValueDictionary()
+
+
+def get_observer(node):
+    """
+    Returns the parser that observe the changes of document of node.
+
+    :param node: The lxml element.
+    :type node: lxml.etree._Element
+    :return: The parser that observe the changes of document of node or None
+             if the node is not in a observed document.
+    :rtype: hatemile.util.html.lxml.lxmlhtmldomparser.LXMLHTMLDOMParser
+    """
+
+    root = node
+    parent = root.getparent()
+    while parent is not None:
+        root = parent
+        parent = root.getparent()
+    return DOCUMENT_OBSERVERS.get(id(root))
+
+
+def is_element(node):
+    """
+    Check that a lxml node is a element, and not a comment or a processing
+    instruction.
+
+    :param node: The lxml node.
+    :type node: lxml.etree._Element
+    :return: True if the node is a element or False if not.
+    :rtype: bool
+    """
+
+    return isinstance(node.tag, str)
+
+
+def add_text_before(element, text):
+    """
+    Add a text immediately before a element, in the tail of previous sibling
+    or in the text of parent.
+
+    :param element: The lxml element.
+    :type element: lxml.etree._Element
+    :param text: The text.
+    :type text: str
+    """
+
+    if not text:
+        return
+    previous = element.getprevious()
+    if previous is not None:
+        previous.tail = (previous.tail or '') + text
+    else:
+        parent = element.getparent()
+        if parent is not None:
+            parent.text = (parent.text or '') + text
+
+
+def detach_element(element):
+    """
+    Remove a element of its parent, keeping the text after the element, that
+    lxml stores in the tail of element, in the parent.
+
+    :param element: The lxml element.
+    :type element: lxml.etree._Element
+    """
+
+    parent = element.getparent()
+    if parent is None:
+        return
+    add_text_before(element, element.tail)
+    element.tail = None
+    parent.remove(element)
+
+
+def get_wrapper(element):
+    """
+    Returns the object that encapsulate the lxml element, reusing the object
+    created before for the element while it is alive.
+
+    :param element: The lxml element.
+    :type element: lxml.etree._Element
+    :return: The object that encapsulate the element.
+    :rtype: hatemile.util.html.lxml.lxmlhtmldomnode.LXMLHTMLDOMElement
+    """
+
+    wrapper = NODE_WRAPPERS.get(id(element))
+    if (wrapper is None) or (wrapper.node is not element):
+        wrapper = LXMLHTMLDOMElement(element)
+        NODE_WRAPPERS[id(element)] = wrapper
+    return wrapper
+
+
+class LXMLHTMLDOMNode(HTMLDOMNode):
+    """
+    The LXMLHTMLDOMNode class is implementation of
+    :py:class:`hatemile.util.html.htmldomnode.HTMLDOMNode` for the lxml
+    library.
+    """
+
+    __slots__ = ('node', '__weakref__')
+
+    def __init__(self, node):
+        """
+        Initializes a new object that encapsulate the lxml node.
+
+        :param node: The lxml element or, for text nodes, the lxml element
+                     that owns the text and if the text is the tail of element.
+        :type node: lxml.etree._Element or tuple(lxml.etree._Element,
+                    bool)
+        """
+
+        helper.require_not_none(node)
+        helper.require_valid_type(node, ELEMENT_CLASS, tuple)
+
+        self.node = node
+
+    def _before_insertion(self, new_node):
+        """
+        Remove a element of its place, notifying the observer of its document,
+        before it is inserted in other place.
+
+        :param new_node: The lxml element that will be inserted.
+        :type new_node: lxml.etree._Element
+        """
+        # pylint: disable=no-self-use
+
+        observer = get_observer(new_node)
+        if observer is not None:
+            observer.node_removed(new_node)
+        detach_element(new_node)
+
+    def _after_insertion(self, new_node):
+        """
+        Notify the observer of document that a element was inserted.
+
+        :param new_node: The lxml element inserted.
+        :type new_node: lxml.etree._Element
+        """
+        # pylint: disable=no-self-use
+
+        observer = get_observer(new_node)
+        if observer is not None:
+            observer.node_inserted(new_node)
+
+    def _take_text(self, text_node):
+        """
+        Remove a text node of its place and returns its text content.
+
+        :param text_node: The text node.
+        :type text_node: hatemile.util.html.lxml.lxmlhtmldomnode.
+                         LXMLHTMLDOMTextNode
+        :return: The text content of text node.
+        :rtype: str
+        """
+        # pylint: disable=no-self-use
+
+        text = text_node.get_text_content()
+        text_node.remove_node()
+        return text
+
+    def get_data(self):
+        return self.node
+
+    def set_data(self, data):
+        helper.require_not_none(data)
+        helper.require_valid_type(data, ELEMENT_CLASS, tuple)
+
+        if NODE_WRAPPERS.get(id(self.node)) is self:
+            del NODE_WRAPPERS[id(self.node)]
+        self.node = data
+        if (
+            (isinstance(self, HTMLDOMElement))
+            and (isinstance(data, ELEMENT_CLASS))
+        ):
+            NODE_WRAPPERS[id(data)] = self
+
+
+class LXMLHTMLDOMElement(LXMLHTMLDOMNode, HTMLDOMElement):
+    """
+    The LXMLHTMLDOMElement class is implementation of
+    :py:class:`hatemile.util.html.htmldomelement.HTMLDOMElement` for the lxml
+    library.
+    """
+
+    __slots__ = ()
+
+    def insert_before(self, new_node):
+        if isinstance(new_node, LXMLHTMLDOMTextNode):
+            add_text_before(self.node, self._take_text(new_node))
+        else:
+            self._before_insertion(new_node.get_data())
+            self.node.addprevious(new_node.get_data())
+            self._after_insertion(new_node.get_data())
+        return self
+
+    def insert_after(self, new_node):
+        if isinstance(new_node, LXMLHTMLDOMTextNode):
+            self.node.tail = self._take_text(new_node) + (self.node.tail or '')
+        else:
+            self._before_insertion(new_node.get_data())
+            tail = self.node.tail
+            self.node.tail = None
+            self.node.addnext(new_node.get_data())
+            new_node.get_data().tail = tail
+            self._after_insertion(new_node.get_data())
+        return self
+
+    def remove_node(self):
+        self._before_insertion(self.node)
+        return self
+
+    def replace_node(self, new_node):
+        parent = self.node.getparent()
+        if parent is None:
+            return self
+        if isinstance(new_node, LXMLHTMLDOMTextNode):
+            add_text_before(self.node, self._take_text(new_node))
+            self._before_insertion(self.node)
+        else:
+            observer = get_observer(self.node)
+            if observer is not None:
+                observer.node_removed(self.node)
+            self._before_insertion(new_node.get_data())
+            new_node.get_data().tail = self.node.tail
+            self.node.tail = None
+            parent.replace(self.node, new_node.get_data())
+            self._after_insertion(new_node.get_data())
+        return self
+
+    def _attribute_changed(self, name, old_value):
+        """
+        Notify the observer of document that a attribute of element was
+        changed.
+
+        :param name: The name of attribute.
+        :type name: str
+        :param old_value: The value of attribute before the change or None if
+                          the element not had the attribute.
+        :type old_value: str
+        """
+
+        observer = get_observer(self.node)
+        if observer is not None:
+            observer.attribute_changed(self.node, name, old_value)
+
+    def get_tag_name(self):
+        return self.node.tag.upper()
+
+    def get_attribute(self, name):
+        return self.node.get(name)
+
+    def set_attribute(self, name, value):
+        old_value = self.node.get(name)
+        self.node.set(name, value)
+        self._attribute_changed(name, old_value)
+
+    def remove_attribute(self, name):
+        if self.has_attribute(name):
+            old_value = self.node.get(name)
+            del self.node.attrib[name]
+            self._attribute_changed(name, old_value)
+
+    def has_attribute(self, name):
+        return name in self.node.attrib
+
+    def has_attributes(self):
+        return bool(self.node.attrib)
+
+    def matches(self, selector):
+        for part in selector.split(','):
+            expression, variables = get_selector_expression(part, 'self::')
+            if expression(self.node, **variables):
+                return True
+        return False
+
+    def get_text_content(self):
+        return ''.join(self.node.itertext())
+
+    def append_element(self, element):
+        self._before_insertion(element.get_data())
+        self.node.append(element.get_data())
+        self._after_insertion(element.get_data())
+        return self
+
+    def prepend_element(self, element):
+        if self.has_children():
+            self.get_first_node_child().insert_before(element)
+        else:
+            self.append_element(element)
+        return self
+
+    def get_children_elements(self):
+        children = []
+        for child in self.node:
+            if is_element(child):
+                children.append(get_wrapper(child))
+        return children
+
+    def get_children(self):
+        children = []
+        if self.node.text:
+            children.append(LXMLHTMLDOMTextNode((self.node, False)))
+        for child in self.node:
+            if is_element(child):
+                children.append(get_wrapper(child))
+            if child.tail:
+                children.append(LXMLHTMLDOMTextNode((child, True)))
+        return children
+
+    def normalize(self):
+        for child in self.get_children_elements():
+            child.normalize()
+        return self
+
+    def append_text(self, text):
+        if len(self.node) > 0:
+            last = self.node[-1]
+            last.tail = (last.tail or '') + text
+        else:
+            self.node.text = (self.node.text or '') + text
+        return self
+
+    def prepend_text(self, text):
+        self.node.text = text + (self.node.text or '')
+        return self
+
+    def has_children_elements(self):
+        for child in self.node:
+            if is_element(child):
+                return True
+        return False
+
+    def has_children(self):
+        if self.node.text:
+            return True
+        for child in self.node:
+            if is_element(child) or child.tail:
+                return True
+        return False
+
+    def get_parent_element(self):
+        parent = self.node.getparent()
+        if parent is None:
+            return None
+        return get_wrapper(parent)
+
+    def get_inner_html(self):
+        string = ''
+        if self.node.text:
+            if self.node.tag in RAW_TEXT_TAGS:
+                string += self.node.text
+            else:
+                string += html.escape(self.node.text, False)
+        for child in self.node:
+            string += etree.tostring(
+                child,
+                method='html',
+                encoding='unicode',
+                with_tail=True
+            )
+        return string
+
+    def get_outer_html(self):
+        return etree.tostring(
+            self.node,
+            method='html',
+            encoding='unicode',
+            with_tail=False
+        )
+
+    def clone_element(self):
+        clone = copy.deepcopy(self.node)
+        clone.tail = None
+        return get_wrapper(clone)
+
+    def get_first_element_child(self):
+        for child in self.node:
+            if is_element(child):
+                return get_wrapper(child)
+        return None
+
+    def get_last_element_child(self):
+        for child in reversed(self.node):
+            if is_element(child):
+                return get_wrapper(child)
+        return None
+
+    def get_first_node_child(self):
+        children = self.get_children()
+        if not children:
+            return None
+        return children[0]
+
+    def get_last_node_child(self):
+        children = self.get_children()
+        if not children:
+            return None
+        return children[-1]
+
+    def __eq__(self, obj):
+        if isinstance(obj, LXMLHTMLDOMElement):
+            return self.node is obj.node
+        return False
+
+    def __hash__(self):
+        return id(self.node)
+
+
+class LXMLHTMLDOMTextNode(LXMLHTMLDOMNode, HTMLDOMTextNode):
+    """
+    The LXMLHTMLDOMTextNode class is implementation of
+    :py:class:`hatemile.util.html.htmldomtextnode.HTMLDOMTextNode` for the
+    lxml library. lxml not have text nodes, so the text node is the text of a
+    element, before its first child, or the tail of a element, between the
+    element and its next sibling. Thus, adjacent texts are always merged, as
+    if the parent element was normalized.
+    """
+
+    __slots__ = ()
+
+    def insert_before(self, new_node):
+        owner, is_tail = self.node
+        if isinstance(new_node, LXMLHTMLDOMTextNode):
+            self.set_text_content(
+                self._take_text(new_node) + self.get_text_content()
+            )
+            return self
+        self._before_insertion(new_node.get_data())
+        text = self.get_text_content()
+        self.set_text_content('')
+        if is_tail:
+            owner.addnext(new_node.get_data())
+        else:
+            owner.insert(0, new_node.get_data())
+        new_node.get_data().tail = text or None
+        self.node = (new_node.get_data(), True)
+        self._after_insertion(new_node.get_data())
+        return self
+
+    def insert_after(self, new_node):
+        owner, is_tail = self.node
+        if isinstance(new_node, LXMLHTMLDOMTextNode):
+            self.set_text_content(
+                self.get_text_content() + self._take_text(new_node)
+            )
+            return self
+        self._before_insertion(new_node.get_data())
+        if is_tail:
+            tail = owner.tail
+            owner.tail = None
+            owner.addnext(new_node.get_data())
+            owner.tail = tail
+        else:
+            owner.insert(0, new_node.get_data())
+        self._after_insertion(new_node.get_data())
+        return self
+
+    def remove_node(self):
+        self.set_text_content('')
+        return self
+
+    def replace_node(self, new_node):
+        if isinstance(new_node, LXMLHTMLDOMTextNode):
+            self.set_text_content(self._take_text(new_node))
+        else:
+            self.insert_before(new_node)
+            self.remove_node()
+        return self
+
+    def get_text_content(self):
+        owner, is_tail = self.node
+        if is_tail:
+            return owner.tail or ''
+        return owner.text or ''
+
+    def set_text_content(self, text):
+        owner, is_tail = self.node
+        if is_tail:
+            owner.tail = text or None
+        else:
+            owner.text = text or None
+
+    def append_text(self, text):
+        self.set_text_content(self.get_text_content() + text)
+        return self
+
+    def prepend_text(self, text):
+        self.set_text_content(text + self.get_text_content())
+        return self
+
+    def get_parent_element(self):
+        owner, is_tail = self.node
+        if is_tail:
+            return get_wrapper(owner.getparent())
+        return get_wrapper(owner)
@@ -0,0 +1,533 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of LXMLHTMLDOMParser class.
+"""
+
+import codecs
+import io
+import mmap
+import re
+import types
+from lxml import etree
+from hatemile import helper
+from hatemile.util.html.bs.bshtmldomindex import get_index_keys
+from hatemile.util.html.bs.bshtmldomparser import sniff_encoding
+from hatemile.util.html.htmldomparser import HTMLDOMParser
+from .lxmlhtmldomindex import LXMLHTMLDOMIndex
+from .lxmlhtmldomnode import DOCUMENT_OBSERVERS
+from .lxmlhtmldomnode import ELEMENT_CLASS
+from .lxmlhtmldomnode import LXMLHTMLDOMElement
+from .lxmlhtmldomnode import get_wrapper
+from .lxmlhtmldomnode import is_element
+from .lxmlselector import get_selector_expression
+
+#: The regular expression of a HTML code that starts with a document type
+#: declaration.
+DOCTYPE_REGEX = re.compile(r'^\s*<!doctype\s', re.IGNORECASE)
+
+#: The regular expression of a not decoded HTML code that starts with a
+#: document type declaration, after the byte order mark of UTF-8.
+BYTES_DOCTYPE_REGEX = re.compile(
+    rb'^(?:\xef\xbb\xbf)?\s*<!doctype\s',
+    re.IGNORECASE
+)
+
+#: The regular expression of a not decoded HTML code without content.
+BYTES_BLANK_REGEX = re.compile(rb'\s*\Z')
+
+
+class LXMLHTMLDOMParser(HTMLDOMParser):
+    """
+    The class LXMLHTMLDOMParser is implementation of
+    :py:class:`hatemile.util.html.htmldomparser.HTMLDOMParser` for the lxml
+    library, that parses the HTML code with libxml2 and selects the elements
+    by XPath expressions translated from CSS selectors. Unlike the
+    BeautifulSoup parser, the lxml parser adds the html and body elements
+    when the HTML code not has them.
+    """
+
+    def __init__(self, code_or_parser, use_index=True):
+        """
+        Initializes a new object that encapsulate the parser of lxml.
+
+        :param code_or_parser: The root element of the parser, the HTML code,
+                               not decoded or decoded, or the file object with
+                               the HTML code.
+        :type code_or_parser: str or bytes or bytearray or mmap.mmap or
+                              io.IOBase or lxml.etree._Element
+        :param use_index: Resolve the compound selectors searched in document
+                          by a index of elements by tag name, attribute name,
+                          attribute value, ID and class.
+        :type use_index: bool
+        """
+
+        helper.require_not_none(code_or_parser, use_index)
+        helper.require_valid_type(
+            code_or_parser,
+            str,
+            bytes,
+            bytearray,
+            mmap.mmap,
+            io.IOBase,
+            ELEMENT_CLASS
+        )
+        helper.require_valid_type(use_index, bool)
+
+        if isinstance(code_or_parser, ELEMENT_CLASS):
+            self.document = code_or_parser
+            self.doctype = self.document.getroottree().docinfo.doctype
+        else:
+            if isinstance(code_or_parser, io.IOBase):
+                code_or_parser = code_or_parser.read()
+            if isinstance(code_or_parser, str):
+                self._parse_text(code_or_parser)
+            else:
+                self._parse_bytes(code_or_parser)
+        self.results = []
+        self.ordered = True
+        self.pending_parts = None
+        self.use_index = use_index
+        self.index = None
+        DOCUMENT_OBSERVERS[id(self.document)] = self
+
+    def _parse_text(self, code):
+        """
+        Parse a decoded HTML code.
+
+        :param code: The HTML code.
+        :type code: str
+        """
+
+        if not code.strip():
+            code = '<html></html>'
+        self.document = etree.fromstring(
+            code.encode('utf-8'),
+            etree.HTMLParser(encoding='utf-8')
+        )
+        self.doctype = ''
+        if DOCTYPE_REGEX.match(code):
+            self.doctype = self.document.getroottree().docinfo.doctype
+
+    def _parse_bytes(self, code):
+        """
+        Parse a not decoded HTML code, without copy it. The encoding declared
+        by byte order mark or by meta element is detected by libxml2 and, if
+        the HTML code not declares its encoding, it is decoded as UTF-8.
+
+        :param code: The HTML code.
+        :type code: bytes or bytearray or mmap.mmap
+        """
+
+        if BYTES_BLANK_REGEX.match(code):
+            self._parse_text('')
+            return
+        encoding = sniff_encoding(code)[0]
+        if encoding is None:
+            parser = etree.HTMLParser(encoding='utf-8')
+        else:
+            parser = etree.HTMLParser()
+        self.document = etree.fromstring(code, parser)
+        self.doctype = ''
+        if BYTES_DOCTYPE_REGEX.match(code):
+            self.doctype = self.document.getroottree().docinfo.doctype
+
+    def _add_result(self, result, added_results):
+        """
+        Add a result in the list of results, if it was not added before.
+
+        :param result: The result.
+        :type result: lxml.etree._Element
+        :param added_results: The results already added.
+        :type added_results: set(lxml.etree._Element)
+        """
+
+        if result not in added_results:
+            added_results.add(result)
+            self.results.append(result)
+
+    def _sort_results(self, results):
+        """
+        Order the results, in document order.
+
+        :param results: The disordened results.
+        :type results: list(lxml.etree._Element)
+        :return: The ordened results.
+        :rtype: list(lxml.etree._Element)
+        """
+
+        trees = {self.document: 0}
+        positions = {}
+        for result in results:
+            path = []
+            root = result
+            parent = root.getparent()
+            while parent is not None:
+                path.append(parent.index(root))
+                root = parent
+                parent = root.getparent()
+            path.reverse()
+            if root not in trees:
+                trees[root] = len(trees)
+            positions[result] = (trees[root], path)
+        return sorted(results, key=lambda result: positions[result])
+
+    def _get_index(self):
+        """
+        Returns the index of elements of document, creating it if it not
+        exists.
+
+        :return: The index of elements or None if the parser not use index.
+        :rtype: hatemile.util.html.lxml.lxmlhtmldomindex.LXMLHTMLDOMIndex
+        """
+
+        if (self.index is None) and (self.use_index):
+            self.index = LXMLHTMLDOMIndex(self.document)
+        return self.index
+
+    def node_inserted(self, node):
+        """
+        Update the index of document after a element was inserted in
+        document.
+
+        :param node: The lxml element inserted.
+        :type node: lxml.etree._Element
+        """
+
+        if (self.index is not None) and (is_element(node)):
+            self.index.add_tree(node)
+
+    def node_removed(self, node):
+        """
+        Update the index of document before a element is removed of document.
+
+        :param node: The lxml element that will be removed.
+        :type node: lxml.etree._Element
+        """
+
+        if (self.index is not None) and (is_element(node)):
+            self.index.remove_tree(node)
+
+    def attribute_changed(self, node, name, old_value):
+        """
+        Update the index of document after a attribute of element of document
+        was changed.
+
+        :param node: The lxml element.
+        :type node: lxml.etree._Element
+        :param name: The name of attribute.
+        :type name: str
+        :param old_value: The value of attribute before the change or None if
+                          the element not had the attribute.
+        :type old_value: str
+        """
+
+        if self.index is not None:
+            self.index.update_attribute(node, name, old_value)
+
+    def _select_in_document(self, selector):
+        """
+        Returns the elements of document matched by a CSS selector, in
+        document order.
+
+        :param selector: The CSS selector, without commas.
+        :type selector: str
+        :return: The elements matched by selector.
+        :rtype: list(lxml.etree._Element)
+        """
+
+        index = self._get_index()
+        if index is not None:
+            candidates = index.get_candidates(selector)
+            if candidates is not None:
+                expression, variables = get_selector_expression(
+                    selector,
+                    'self::'
+                )
+                return self._sort_results([
+                    candidate
+                    for candidate in candidates
+                    if expression(candidate, **variables)
+                ])
+        expression, variables = get_selector_expression(
+            selector,
+            'descendant-or-self::'
+        )
+        return expression(self.document, **variables)
+
+    def _iter_in_document(self, selector):
+        """
+        Returns a iterator of the elements of document matched by a CSS
+        selector, in document order, that matches the candidates of index only
+        when they are requested.
+
+        :param selector: The CSS selector, without commas.
+        :type selector: str
+        :return: The iterator of elements matched by selector.
+        :rtype: iterator(lxml.etree._Element)
+        """
+
+        index = self._get_index()
+        if index is not None:
+            candidates = index.get_candidates(selector)
+            if candidates is not None:
+                expression, variables = get_selector_expression(
+                    selector,
+                    'self::'
+                )
+                for candidate in self._sort_results(candidates):
+                    if expression(candidate, **variables):
+                        yield candidate
+                return
+        yield from self._select_in_document(selector)
+
+    def _get_first_in_document(self, selector):
+        """
+        Returns the first element of document matched by a CSS selector.
+
+        :param selector: The CSS selector, without commas.
+        :type selector: str
+        :return: The first element matched by selector or None if not exists
+                 a element matched by selector.
+        :rtype: lxml.etree._Element
+        """
+
+        if (
+            (self._get_index() is not None)
+            and (get_index_keys(selector) is not None)
+        ):
+            for result in self._iter_in_document(selector):
+                return result
+            return None
+        expression, variables = get_selector_expression(
+            selector,
+            'descendant-or-self::',
+            True
+        )
+        results = expression(self.document, **variables)
+        if not results:
+            return None
+        return results[0]
+
+    def _get_results(self):
+        """
+        Returns the elements found, searching the elements of the last selector
+        passed to find, if they was not searched yet.
+
+        :return: The elements found.
+        :rtype: list(lxml.etree._Element)
+        """
+
+        if self.pending_parts is not None:
+            added_results = set()
+            for part in self.pending_parts:
+                for result in self._select_in_document(part):
+                    self._add_result(result, added_results)
+            self.ordered = len(self.pending_parts) == 1
+            self.pending_parts = None
+        return self.results
+
+    def find(self, selector):
+        self.results = []
+        self.ordered = True
+        self.pending_parts = None
+        if isinstance(selector, LXMLHTMLDOMElement):
+            self.results.append(selector.get_data())
+        else:
+            self.pending_parts = selector.split(',')
+        return self
+
+    def find_children(self, selector):
+        last_results = self._get_results()
+        self.results = []
+        if isinstance(selector, LXMLHTMLDOMElement):
+            native_selector = selector.get_data()
+            for result in last_results:
+                if native_selector.getparent() is result:
+                    self.results.append(native_selector)
+                    break
+            self.ordered = True
+        else:
+            added_results = set()
+            parts = selector.split(',')
+            for part in parts:
+                expression, variables = get_selector_expression(part, 'self::')
+                for last_result in last_results:
+                    for child in last_result:
+                        if is_element(child) and expression(
+                            child,
+                            **variables
+                        ):
+                            self._add_result(child, added_results)
+            self.ordered = (len(parts) == 1) and (len(last_results) < 2)
+        return self
+
+    def find_descendants(self, selector):
+        last_results = self._get_results()
+        if isinstance(selector, LXMLHTMLDOMElement):
+            native_selector = selector.get_data()
+            ancestors = set(native_selector.iterancestors())
+            for result in last_results:
+                if result in ancestors:
+                    self.results = [native_selector]
+                    self.ordered = True
+                    break
+        else:
+            self.results = []
+            added_results = set()
+            parts = selector.split(',')
+            for part in parts:
+                expression, variables = get_selector_expression(
+                    part,
+                    'descendant::'
+                )
+                for last_result in last_results:
+                    for result in expression(last_result, **variables):
+                        self._add_result(result, added_results)
+            self.ordered = (len(parts) == 1) and (len(last_results) < 2)
+        return self
+
+    def find_ancestors(self, selector):
+        last_results = self._get_results()
+        if isinstance(selector, LXMLHTMLDOMElement):
+            native_selector = selector.get_data()
+            for result in last_results:
+                if native_selector in set(result.iterancestors()):
+                    self.results = [native_selector]
+                    self.ordered = True
+                    break
+        else:
+            self.results = []
+            added_results = set()
+            parts = selector.split(',')
+            expressions = [
+                get_selector_expression(part, 'self::') for part in parts
+            ]
+            for result in last_results:
+                ancestors = list(result.iterancestors())
+                ancestors.reverse()
+                for expression, variables in expressions:
+                    for ancestor in ancestors:
+                        if expression(ancestor, **variables):
+                            self._add_result(ancestor, added_results)
+            self.ordered = (len(parts) == 1) and (len(last_results) < 2)
+        return self
+
+    def first_result(self):
+        if self.pending_parts is not None:
+            for part in self.pending_parts:
+                result = self._get_first_in_document(part)
+                if result is not None:
+                    return get_wrapper(result)
+            return None
+        if not self.results:
+            return None
+        return get_wrapper(self.results[0])
+
+    def last_result(self):
+        results = self._get_results()
+        if not results:
+            return None
+        return get_wrapper(results[-1])
+
+    def list_results(self):
+        results = self._get_results()
+        if (not self.ordered) and (len(results) > 1):
+            results = self._sort_results(results)
+        array = []
+        for result in results:
+            array.append(get_wrapper(result))
+        return array
+
+    def iter_results(self):
+        if (self.pending_parts is not None) and (len(self.pending_parts) == 1):
+            return map(
+                get_wrapper,
+                self._iter_in_document(self.pending_parts[0])
+            )
+        return iter(self.list_results())
+
+    def exists(self):
+        if self.pending_parts is not None:
+            for part in self.pending_parts:
+                if self._get_first_in_document(part) is not None:
+                    return True
+            return False
+        return bool(self.results)
+
+    def get_element_by_id(self, element_id):
+        index = self._get_index()
+        if index is not None:
+            elements = self._sort_results(index.get_elements_by_id(element_id))
+            if not elements:
+                return None
+            return get_wrapper(elements[0])
+        elements = self.document.xpath(
+            'descendant-or-self::*[@id = $element_id]',
+            element_id=element_id
+        )
+        if not elements:
+            return None
+        return get_wrapper(elements[0])
+
+    def get_labels_for(self, field_id):
+        index = self._get_index()
+        if index is not None:
+            labels = self._sort_results(index.get_labels_for(field_id))
+        else:
+            labels = self.document.xpath(
+                'descendant-or-self::label[@for = $field_id]',
+                field_id=field_id
+            )
+        array = []
+        for label in labels:
+            array.append(get_wrapper(label))
+        return array
+
+    def create_element(self, tag):
+        return get_wrapper(self.document.makeelement(tag))
+
+    def get_html(self):
+        html = etree.tostring(
+            self.document,
+            method='html',
+            encoding='unicode'
+        )
+        if self.doctype:
+            return self.doctype + '\n' + html
+        return html
+
+    def write_html(self, html_file, encoding=None):
+        output_file = html_file
+        output_encoding = encoding
+        if encoding is None:
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            output_file = types.SimpleNamespace(
+                write=lambda data: html_file.write(decoder.decode(data))
+            )
+            output_encoding = 'utf-8'
+        with etree.htmlfile(output_file, encoding=output_encoding) as writer:
+            if self.doctype:
+                writer.write_doctype(self.doctype)
+            writer.write(self.document)
+
+    def get_parser(self):
+        return self.document
+
+    def clear_parser(self):
+        DOCUMENT_OBSERVERS.pop(id(self.document), None)
+        del self.results[:]
+        self.results = None
+        self.pending_parts = None
+        self.index = None
+        self.document = None
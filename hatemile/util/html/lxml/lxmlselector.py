@@ -0,0 +1,172 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Functions that translate CSS selectors to compiled XPath expressions of lxml.
+"""
+
+import functools
+import re
+from cssselect import HTMLTranslator
+from cssselect import parse
+from cssselect.parser import CombinedSelector
+from lxml import etree
+
+#: The translator of CSS selectors to XPath expressions.
+TRANSLATOR = HTMLTranslator()
+
+#: The regular expression of a attribute selector with the exact value of
+#: attribute.
+ATTRIBUTE_VALUE_REGEX = re.compile(
+    r'(\[\s*[\w-]+\s*=\s*)'
+    + r'(?:"([^"\\]*)"|\'([^\'\\]*)\'|([\w-]+))(\s*\])'
+)
+
+#: The prefix of values of attributes replaced by variables of XPath.
+VARIABLE_PREFIX = 'hatemilevalue'
+
+#: The axes of XPath that reach the element at left of each combinator of CSS,
+#: from the element at right of combinator.
+COMBINATOR_AXES = {
+    ' ': 'ancestor::',
+    '>': 'parent::',
+    '+': 'preceding-sibling::*[1]/self::',
+    '~': 'preceding-sibling::'
+}
+
+
+def translate_tree(tree, axis):
+    """
+    Returns the XPath step that reach, by axis, the elements matched by a
+    parsed CSS selector, testing the combinators from right to left.
+
+    :param tree: The parsed CSS selector.
+    :type tree: cssselect.parser.Tree
+    :param axis: The axis of XPath of step.
+    :type axis: str
+    :return: The XPath step.
+    :rtype: str
+    """
+
+    if isinstance(tree, CombinedSelector):
+        return (
+            translate_tree(tree.subselector, axis)
+            + '['
+            + translate_tree(tree.selector, COMBINATOR_AXES[tree.combinator])
+            + ']'
+        )
+    return axis + str(TRANSLATOR.xpath(tree))
+
+
+def translate_selector(selector, prefix):
+    """
+    Returns the XPath expression of a CSS selector. With the prefix 'self::'
+    the expression checks only the context element, otherwise the prefix is
+    prepended to the expression of each selector.
+
+    :param selector: The CSS selector.
+    :type selector: str
+    :param prefix: The axis of XPath used to search the elements, as
+                   'descendant-or-self::', 'descendant::' or 'self::'.
+    :type prefix: str
+    :return: The XPath expression.
+    :rtype: str
+    """
+
+    if prefix != 'self::':
+        return TRANSLATOR.css_to_xpath(selector, prefix=prefix)
+    expressions = []
+    for parsed_selector in parse(selector):
+        if parsed_selector.pseudo_element:
+            TRANSLATOR.xpath_pseudo_element(
+                TRANSLATOR.xpath(parsed_selector.parsed_tree),
+                parsed_selector.pseudo_element
+            )
+        expressions.append(
+            translate_tree(parsed_selector.parsed_tree, prefix)
+        )
+    return ' | '.join(expressions)
+
+
+@functools.lru_cache(maxsize=512)
+def compile_selector(selector, prefix, first=False):
+    """
+    Returns the compiled XPath expression of a CSS selector, which the
+    values of attributes are replaced by variables.
+
+    :param selector: The CSS selector, without commas and with the values of
+                     attributes replaced by VARIABLE_PREFIX and the number of
+                     value.
+    :type selector: str
+    :param prefix: The axis of XPath used to search the elements, as
+                   'descendant-or-self::', 'descendant::' or 'self::'.
+    :type prefix: str
+    :param first: Select only the first element, in document order.
+    :type first: bool
+    :return: The compiled XPath expression.
+    :rtype: lxml.etree.XPath
+    """
+
+    expression = translate_selector(selector, prefix)
+    if first:
+        expression = '(' + expression + ')[1]'
+    expression = re.sub(
+        '\'(' + VARIABLE_PREFIX + '[0-9]+)\'',
+        r'$\1',
+        expression
+    )
+    return etree.XPath(expression)
+
+
+def get_selector_expression(selector, prefix, first=False):
+    """
+    Returns the compiled XPath expression of a CSS selector and the values of
+    its variables, so that selectors that differ only by the values of
+    attributes share the same expression.
+
+    :param selector: The CSS selector, without commas.
+    :type selector: str
+    :param prefix: The axis of XPath used to search the elements, as
+                   'descendant-or-self::', 'descendant::' or 'self::'.
+    :type prefix: str
+    :param first: Select only the first element, in document order.
+    :type first: bool
+    :return: The compiled XPath expression and the values of variables.
+    :rtype: tuple(lxml.etree.XPath, dict(str, str))
+    """
+
+    variables = {}
+
+    def replace_value(match):
+        """
+        Replace the value of a attribute selector by a variable.
+
+        :param match: The attribute selector.
+        :type match: re.Match
+        :return: The attribute selector with the variable.
+        :rtype: str
+        """
+
+        name = VARIABLE_PREFIX + str(len(variables))
+        value = match.group(2)
+        if value is None:
+            value = match.group(3)
+        if value is None:
+            value = match.group(4)
+        variables[name] = value
+        return match.group(1) + '"' + name + '"' + match.group(5)
+
+    normalized_selector = ATTRIBUTE_VALUE_REGEX.sub(replace_value, selector)
+    return (
+        compile_selector(normalized_selector, prefix, first),
+        variables
+    )
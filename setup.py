@@ -139,7 +139,13 @@ setup(
     packages=get_packages(),
     package_data=get_package_data(),
     install_requires=get_requirements(),
+    entry_points={
+        'console_scripts': [
+            'hatemile=hatemile.cli:main'
+        ]
+    },
     extras_require={
-        'dev': get_requirements_dev()
+        'dev': get_requirements_dev(),
+        'lxml': ['lxml>=4.0', 'cssselect>=1.0']
     }
 )
@@ -0,0 +1,122 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module of the local HTTP server used by tests that download stylesheets.
+"""
+
+import http.server
+import threading
+import unittest
+
+
+class RecordingHandler(http.server.BaseHTTPRequestHandler):
+    """
+    The RecordingHandler class records the requests received by the local
+    HTTP server and counts the requests answered at same time. The
+    subclasses respond the requests.
+    """
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Record and respond a request.
+        """
+
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers))
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            self.respond()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def respond(self):
+        """
+        Respond the request.
+        """
+
+        raise NotImplementedError()
+
+    def send_stylesheet(self, css_code, headers=None):
+        """
+        Respond a stylesheet.
+
+        :param css_code: The CSS code of stylesheet.
+        :type css_code: str
+        :param headers: The other headers of response.
+        :type headers: dict(str, str)
+        """
+
+        body = css_code.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/css; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if headers is not None:
+            for name, value in headers.items():
+                self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            # The client gave up waiting the stylesheet.
+            pass
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class HTTPServerTestCase(unittest.TestCase):
+    """
+    The HTTPServerTestCase class runs a local HTTP server while its tests
+    are executed.
+    """
+
+    #: The class of handler of requests, a subclass of RecordingHandler.
+    handler_class = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0),
+            cls.handler_class
+        )
+        cls.server.daemon_threads = True
+        cls.server.lock = threading.Lock()
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.url = 'http://127.0.0.1:' + str(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        with self.server.lock:
+            self.server.requests = []
+            self.server.active = 0
+            self.server.peak = 0
+
+    def get_paths(self):
+        """
+        Returns the paths requested since the start of test.
+
+        :return: The paths, in order of requests.
+        :rtype: list(str)
+        """
+
+        with self.server.lock:
+            return [path for path, _ in self.server.requests]
@@ -0,0 +1,268 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests of behavior of AccessibilityPipeline.
+"""
+
+import re
+import unittest
+from hatemile.implementation.assoc import AccessibleAssociationImplementation
+from hatemile.implementation.css import AccessibleCSSImplementation
+from hatemile.implementation.display import AccessibleDisplayImplementation
+from hatemile.implementation.event import AccessibleEventImplementation
+from hatemile.implementation.form import AccessibleFormImplementation
+from hatemile.implementation.navig import AccessibleNavigationImplementation
+from hatemile.util.accessibilitypipeline import AccessibilityPipeline
+from hatemile.util.cache.memoryresultcache import MemoryResultCache
+from hatemile.util.configure import Configure
+from hatemile.util.css.tinycss.tinycssparser import TinyCSSParser
+from hatemile.util.html.bs.bshtmldomparser import BeautifulSoupHTMLDOMParser
+
+#: The navigation shared by pages.
+NAVIGATION = (
+    '<nav><ul><li><a href="/file.pdf" download>File</a></li>'
+    + '<li role="menuitem" title="Menu">Menu</li></ul></nav>'
+)
+
+#: The regular expression of IDs generated by HaTeMiLe.
+GENERATED_ID_REGEX = re.compile('id-hatemile-[-a-z]*[0-9a-f]{64}-[0-9]+')
+
+#: The regular expression of random part of IDs generated by HaTeMiLe.
+RANDOM_ID_REGEX = re.compile('(id-hatemile-[-a-z]*)[0-9a-f]{64}-')
+
+
+def get_page(body, style=''):
+    """
+    Returns the HTML code of a page.
+
+    :param body: The HTML code of body.
+    :type body: str
+    :param style: The CSS code of page.
+    :type style: str
+    :return: The HTML code of page.
+    :rtype: str
+    """
+
+    return (
+        '<!DOCTYPE html><html lang="en"><head><title>Page</title><style>'
+        + style
+        + '</style></head><body>'
+        + body
+        + '</body></html>'
+    )
+
+
+def get_canonical_html(html):
+    """
+    Returns the HTML code with the IDs generated by HaTeMiLe replaced by
+    its order.
+
+    :param html: The HTML code.
+    :type html: str
+    :return: The canonical HTML code.
+    :rtype: str
+    """
+
+    ids = {}
+
+    def replace_id(match):
+        """
+        Returns the order of a generated ID.
+
+        :param match: The match of generated ID.
+        :type match: re.Match
+        :return: The order of generated ID.
+        :rtype: str
+        """
+
+        if match.group(0) not in ids:
+            ids[match.group(0)] = 'id' + str(len(ids))
+        return ids[match.group(0)]
+
+    return GENERATED_ID_REGEX.sub(replace_id, html)
+
+
+class TestAccessibilityPipeline(unittest.TestCase):
+    """
+    Check the behavior of AccessibilityPipeline.
+    """
+
+    def setUp(self):
+        self.configure = Configure(locale_configuration=('en_US', 'UTF-8'))
+
+    def process(self, html_code, fragment_cache=None):
+        """
+        Apply all accessibility solutions in a HTML code.
+
+        :param html_code: The HTML code.
+        :type html_code: str
+        :param fragment_cache: The cache of results of fragments.
+        :type fragment_cache: hatemile.util.cache.resultcache.ResultCache
+        :return: The HTML code more accessible or None if a memoized fragment
+                 was changed.
+        :rtype: str
+        """
+
+        parser = BeautifulSoupHTMLDOMParser(html_code)
+        pipeline = AccessibilityPipeline(parser, fragment_cache, 'test')
+        pipeline.add_default_steps(
+            AccessibleEventImplementation(parser),
+            AccessibleFormImplementation(parser),
+            AccessibleNavigationImplementation(parser, self.configure),
+            AccessibleAssociationImplementation(parser),
+            AccessibleCSSImplementation(
+                parser,
+                TinyCSSParser(parser),
+                self.configure
+            ),
+            AccessibleDisplayImplementation(parser, self.configure)
+        )
+        if not pipeline.run():
+            return None
+        return parser.get_html()
+
+    def test_same_result_of_methods(self):
+        """
+        Check that the pipeline, that finds the elements of consecutive local
+        steps in one walk, has the same result of the methods that apply the
+        solutions in all elements of page, with the IDs generated in the same
+        order.
+        """
+
+        html_code = get_page(
+            '<h1>Title</h1>' + NAVIGATION
+            + '<div role="alert" aria-busy="true" title="Alert" lang="pt-BR">'
+            + '<a href="/page" target="_blank" hreflang="fr">Page</a></div>'
+            + '<img src="image.png" alt="Image" longdesc="image.html">'
+            + '<table><tr><th id="header">Header</th></tr>'
+            + '<tr><td headers="header" title="Cell">Cell</td></tr></table>'
+            + '<label>Field <input required min="1" max="9" type="number">'
+            + '</label><button accesskey="b" onclick="run()">Run</button>',
+            'p{speak:spell-out}'
+        )
+        parser = BeautifulSoupHTMLDOMParser(html_code)
+        event = AccessibleEventImplementation(parser)
+        form = AccessibleFormImplementation(parser)
+        navigation = AccessibleNavigationImplementation(
+            parser,
+            self.configure
+        )
+        association = AccessibleAssociationImplementation(parser)
+        css = AccessibleCSSImplementation(
+            parser,
+            TinyCSSParser(parser),
+            self.configure
+        )
+        display = AccessibleDisplayImplementation(parser, self.configure)
+        event.make_accessible_all_drag_and_drop_events()
+        event.make_accessible_all_click_events()
+        event.make_accessible_all_hover_events()
+        form.mark_all_required_fields()
+        form.mark_all_range_fields()
+        form.mark_all_autocomplete_fields()
+        form.mark_all_invalid_fields()
+        navigation.provide_navigation_by_all_headings()
+        navigation.provide_navigation_by_all_skippers()
+        navigation.provide_navigation_to_all_long_descriptions()
+        association.associate_all_data_cells_with_header_cells()
+        association.associate_all_labels_with_fields()
+        css.provide_all_speak_properties()
+        display.display_all_shortcuts()
+        display.display_all_roles()
+        display.display_all_cell_headers()
+        display.display_all_waiaria_states()
+        display.display_all_links_attributes()
+        display.display_all_titles()
+        display.display_all_languages()
+        display.display_all_alternative_text_images()
+        navigation.provide_navigation_by_all_skippers()
+        display.display_all_shortcuts()
+        self.assertEqual(
+            RANDOM_ID_REGEX.sub(r'\1', self.process(html_code)),
+            RANDOM_ID_REGEX.sub(r'\1', parser.get_html())
+        )
+
+    def test_memoized_fragment(self):
+        """
+        Check that the result of a fragment is memoized and used in other
+        pages, with the same result of processing the page.
+        """
+
+        cache = MemoryResultCache()
+        first_page = get_page(NAVIGATION + '<p title="First">First</p>')
+        second_page = get_page(
+            '<h1>Second</h1>' + NAVIGATION + NAVIGATION
+            + '<a href="#" accesskey="s">Second</a>'
+        )
+        self.assertEqual(
+            get_canonical_html(self.process(first_page, cache)),
+            get_canonical_html(self.process(first_page))
+        )
+        self.assertEqual(len(cache.results), 1)
+        html = self.process(second_page, cache)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(
+            get_canonical_html(html),
+            get_canonical_html(self.process(second_page))
+        )
+        ids = re.findall(' id="([^"]*)"', html)
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_fragment_with_global_state(self):
+        """
+        Check that the fragments that change the lists of headings and
+        shortcuts of page are not memoized.
+        """
+
+        cache = MemoryResultCache()
+        self.process(get_page(
+            '<header><h1>Title</h1></header>'
+            + '<footer><a href="#" accesskey="t">Top</a></footer>'
+            + '<form><input required></form>'
+        ), cache)
+        self.assertEqual(cache.get_size(), 0)
+
+    def test_fragment_changed_from_outside(self):
+        """
+        Check that the fragments changed by steps that are not local, applied
+        in elements out of fragments, are not memoized.
+        """
+
+        navigation = (
+            '<nav><div id="container-heading-before"></div>'
+            + '<a href="/">Home</a></nav>'
+        )
+        cache = MemoryResultCache()
+        first_page = get_page(navigation + '<h1>Alpha heading</h1>')
+        self.assertIn('Alpha heading', self.process(first_page, cache))
+        self.assertEqual(cache.get_size(), 0)
+        second_page = get_page(navigation + '<h1>Beta heading</h1>')
+        html = self.process(second_page, cache)
+        self.assertNotIn('Alpha heading', html)
+        self.assertEqual(
+            get_canonical_html(html),
+            get_canonical_html(self.process(second_page))
+        )
+
+    def test_changed_memoized_fragment(self):
+        """
+        Check that the page must be processed again when a memoized fragment
+        is changed by a step that is not local.
+        """
+
+        cache = MemoryResultCache()
+        self.process(get_page(NAVIGATION), cache)
+        self.assertIsNone(
+            self.process(get_page(NAVIGATION, 'nav a{speak:spell-out}'), cache)
+        )
+        self.assertIsNotNone(self.process(get_page(NAVIGATION), cache))
@@ -0,0 +1,220 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests of behavior of the batch processing of documents.
+"""
+
+import io
+import os
+import pathlib
+import shutil
+import tempfile
+from hatemile import batch
+from hatemile.batch import make_all_accessible
+from hatemile.batch import read_html_file
+from . import httpserver
+
+#: The HTML code of page that links the stylesheet of local HTTP server.
+LINKED_HTML_CODE = (
+    '<!DOCTYPE html><html lang="en"><head><title>Test</title>'
+    + '<link rel="stylesheet" href="/speak.css"></head>'
+    + '<body><p>ab</p></body></html>'
+)
+
+
+def create_html_code(index):
+    """
+    Returns the HTML code of a page identified by a index.
+
+    :param index: The index of page.
+    :type index: int
+    :return: The HTML code.
+    :rtype: str
+    """
+
+    return (
+        '<!DOCTYPE html><html lang="en"><head><title>Page '
+        + str(index)
+        + '</title></head><body><h1>Page '
+        + str(index)
+        + '</h1></body></html>'
+    )
+
+
+class StyleSheetHandler(httpserver.RecordingHandler):
+    """
+    The StyleSheetHandler class responds a stylesheet that spells out the
+    paragraphs.
+    """
+
+    def respond(self):
+        self.send_stylesheet('p{speak:spell-out}')
+
+
+class TestBatch(httpserver.HTTPServerTestCase):
+    """
+    Check the behavior of make_all_accessible and read_html_file.
+    """
+
+    handler_class = StyleSheetHandler
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_order(self):
+        """
+        Check that the results are returned in order of documents, for HTML
+        codes and paths of HTML files.
+        """
+
+        documents = []
+        for index in range(6):
+            if index % 2 == 0:
+                documents.append(create_html_code(index))
+            else:
+                file_name = os.path.join(
+                    self.directory,
+                    str(index) + '.html'
+                )
+                with open(file_name, 'w', encoding='utf-8') as html_file:
+                    html_file.write(create_html_code(index))
+                documents.append(pathlib.Path(file_name))
+        results = list(make_all_accessible(documents, max_workers=2))
+        self.assertEqual(len(results), 6)
+        for index, html in enumerate(results):
+            self.assertIn('<title>Page ' + str(index) + '</title>', html)
+
+    def test_str_and_path(self):
+        """
+        Check that a str is processed as HTML code, even if it is the path of
+        a file, and that a os.PathLike object is processed as the path of a
+        HTML file.
+        """
+
+        file_name = os.path.join(self.directory, 'page.html')
+        with open(file_name, 'w', encoding='utf-8') as html_file:
+            html_file.write(create_html_code(1))
+        results = list(make_all_accessible(
+            [file_name, pathlib.Path(file_name)],
+            max_workers=2
+        ))
+        self.assertIn(file_name, results[0])
+        self.assertNotIn('<title>Page 1</title>', results[0])
+        self.assertIn('<title>Page 1</title>', results[1])
+
+    def test_invalid_arguments(self):
+        """
+        Check that the invalid numbers of processes and of documents in
+        processing are rejected with a message.
+        """
+
+        with self.assertRaisesRegex(ValueError, 'max_workers'):
+            list(make_all_accessible([], max_workers=0))
+        with self.assertRaisesRegex(ValueError, 'max_in_flight'):
+            list(make_all_accessible([], max_workers=1, max_in_flight=0))
+
+    def test_max_in_flight(self):
+        """
+        Check that the documents are read only when there are less documents
+        in processing than max_in_flight.
+        """
+
+        read = []
+
+        def iter_documents():
+            """
+            Returns the documents, recording the documents read.
+
+            :return: The documents.
+            :rtype: collections.abc.Iterator
+            """
+
+            for index in range(8):
+                read.append(index)
+                yield create_html_code(index)
+
+        returned = 0
+        for _ in make_all_accessible(
+            iter_documents(),
+            max_workers=2,
+            max_in_flight=2
+        ):
+            self.assertLessEqual(len(read), returned + 3)
+            returned += 1
+        self.assertEqual(returned, 8)
+
+    def test_url_and_times(self):
+        """
+        Check that the URL of a document loads its linked stylesheets and
+        that the times are returned.
+        """
+
+        results = list(make_all_accessible(
+            [LINKED_HTML_CODE, (LINKED_HTML_CODE, self.url + '/page.html')],
+            max_workers=2,
+            with_times=True
+        ))
+        for html, elapsed in results:
+            self.assertIsInstance(html, str)
+            self.assertIsInstance(elapsed, float)
+            self.assertGreaterEqual(elapsed, 0.0)
+        self.assertNotIn('data-cssspeakas', results[0][0])
+        self.assertIn('data-cssspeakas="spell-out"', results[1][0])
+        self.assertEqual(self.get_paths(), ['/speak.css'])
+
+    def test_exception(self):
+        """
+        Check that the exception of a document is raised or, with
+        return_exceptions, returned in place of its result.
+        """
+
+        documents = [
+            create_html_code(0),
+            pathlib.Path(os.path.join(self.directory, 'missing.html')),
+            create_html_code(2)
+        ]
+        with self.assertRaises(FileNotFoundError):
+            list(make_all_accessible(documents, max_workers=2))
+        results = list(make_all_accessible(
+            documents,
+            max_workers=2,
+            with_times=True,
+            return_exceptions=True
+        ))
+        self.assertIsInstance(results[0][0], str)
+        self.assertIsInstance(results[1][0], FileNotFoundError)
+        self.assertIsNone(results[1][1])
+        self.assertIsInstance(results[2][0], str)
+
+    def test_read_html_file(self):
+        """
+        Check that the HTML files are read in chunks, by path or by file
+        object in text or binary mode.
+        """
+
+        html_code = create_html_code(0) * (batch.CHUNK_SIZE // 50)
+        file_name = os.path.join(self.directory, 'page.html')
+        with open(file_name, 'w', encoding='utf-8') as html_file:
+            html_file.write(html_code)
+        self.assertEqual(read_html_file(file_name), html_code)
+        self.assertEqual(read_html_file(pathlib.Path(file_name)), html_code)
+        self.assertEqual(read_html_file(io.StringIO(html_code)), html_code)
+        self.assertEqual(
+            read_html_file(io.BytesIO(html_code.encode('utf-8'))),
+            html_code.encode('utf-8')
+        )
+        self.assertEqual(read_html_file(io.BytesIO()), '')
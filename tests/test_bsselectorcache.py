@@ -0,0 +1,64 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests of behavior of BeautifulSoupSelectorCache.
+"""
+
+import unittest
+from hatemile.util.html.bs.bsselectorcache import BeautifulSoupSelectorCache
+
+
+class TestBeautifulSoupSelectorCache(unittest.TestCase):
+    """
+    Check the behavior of BeautifulSoupSelectorCache.
+    """
+
+    def test_counters(self):
+        """
+        Check that the hits and misses are counted and that a selector is
+        compiled once, for each comma-separated part.
+        """
+
+        cache = BeautifulSoupSelectorCache()
+        compiled_selectors = cache.get_compiled_selectors('a[href],p')
+        self.assertEqual(len(compiled_selectors), 2)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertIs(
+            cache.get_compiled_selectors('a[href],p'),
+            compiled_selectors
+        )
+        cache.get_compiled_selectors('div')
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(cache.get_size(), 2)
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+        self.assertEqual(cache.get_size(), 0)
+
+    def test_eviction(self):
+        """
+        Check that the least recently used selectors are removed when the
+        cache exceeds its maximum size.
+        """
+
+        cache = BeautifulSoupSelectorCache(2)
+        compiled_selectors = cache.get_compiled_selectors('a')
+        cache.get_compiled_selectors('p')
+        cache.get_compiled_selectors('a')
+        cache.get_compiled_selectors('div')
+        self.assertEqual(cache.get_size(), 2)
+        self.assertEqual(list(cache.selectors), ['a', 'div'])
+        self.assertIs(cache.get_compiled_selectors('a'), compiled_selectors)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        cache.get_compiled_selectors('p')
+        self.assertEqual(list(cache.selectors), ['a', 'p'])
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
@@ -0,0 +1,211 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests of behavior of the command-line tool of HaTeMiLe.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from hatemile.cli import STANDARD_INPUT
+from hatemile.cli import find_jobs
+from hatemile.cli import main
+from hatemile.cli import write_file_atomically
+
+#: The HTML code used by tests.
+HTML_CODE = (
+    '<!DOCTYPE html><html lang="en"><head><title>Test</title></head>'
+    + '<body><h1>Test</h1></body></html>'
+)
+
+
+class TestCLI(unittest.TestCase):
+    """
+    Check the behavior of the command-line tool.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_file(self, relative_name, content=HTML_CODE):
+        """
+        Create a file in the temporary directory.
+
+        :param relative_name: The path of file, relative to temporary
+                              directory.
+        :type relative_name: str
+        :param content: The content of file.
+        :type content: str
+        :return: The path of file.
+        :rtype: str
+        """
+
+        file_name = os.path.join(self.directory, relative_name)
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        with open(file_name, 'w', encoding='utf-8') as opened_file:
+            opened_file.write(content)
+        return file_name
+
+    def run_main(self, arguments):
+        """
+        Execute the command-line tool.
+
+        :param arguments: The arguments of command-line.
+        :type arguments: list(str)
+        :return: The exit status and the standard error.
+        :rtype: tuple(int, str)
+        """
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            try:
+                status = main(arguments)
+            except SystemExit as error:
+                status = error.code
+        return (status, stderr.getvalue())
+
+    def test_argument_errors(self):
+        """
+        Check that the invalid combinations of arguments are rejected before
+        any file is processed.
+        """
+
+        first_file = self.create_file(os.path.join('a', 'index.html'))
+        second_file = self.create_file(os.path.join('b', 'index.html'))
+        output = os.path.join(self.directory, 'output')
+        for arguments, message in (
+            (['-i', '-o', output, first_file], '--in-place'),
+            (['-i', '-'], '--in-place'),
+            ([first_file, second_file], '--output or --in-place'),
+            ([os.path.join(self.directory, 'missing.html')], 'No such file'),
+            (['-', first_file, '-o', output], 'standard input'),
+            ([first_file, second_file, '-o', output], 'same output file')
+        ):
+            status, stderr = self.run_main(arguments)
+            self.assertEqual(status, 2)
+            self.assertIn(message, stderr)
+        self.assertFalse(os.path.exists(output))
+
+    def test_find_jobs(self):
+        """
+        Check the output file of each input.
+        """
+
+        self.create_file(os.path.join('site', 'index.html'))
+        self.create_file(os.path.join('site', 'doc', 'page.HTM'))
+        self.create_file(os.path.join('site', 'style.css'), '')
+        page = self.create_file('page.html')
+        site = os.path.join(self.directory, 'site')
+        output = os.path.join(self.directory, 'output')
+        self.assertEqual(
+            list(find_jobs([site], output, False, ['.html', '.htm'])),
+            [
+                (
+                    os.path.join(site, 'index.html'),
+                    os.path.join(output, 'index.html')
+                ),
+                (
+                    os.path.join(site, 'doc', 'page.HTM'),
+                    os.path.join(output, 'doc', 'page.HTM')
+                )
+            ]
+        )
+        self.assertEqual(
+            list(find_jobs([site], None, True, ['.html'])),
+            [(
+                os.path.join(site, 'index.html'),
+                os.path.join(site, 'index.html')
+            )]
+        )
+        self.assertEqual(
+            list(find_jobs([page], output, False, ['.html'])),
+            [(page, output)]
+        )
+        self.assertEqual(
+            list(find_jobs([page], None, False, ['.html'])),
+            [(page, None)]
+        )
+        self.assertEqual(
+            list(find_jobs([STANDARD_INPUT], None, False, ['.html'])),
+            [(STANDARD_INPUT, None)]
+        )
+        self.assertEqual(
+            list(find_jobs([page, site], output, False, ['.html'])),
+            [
+                (page, os.path.join(output, 'page.html')),
+                (
+                    os.path.join(site, 'index.html'),
+                    os.path.join(output, 'index.html')
+                )
+            ]
+        )
+        with self.assertRaises(ValueError):
+            list(find_jobs([page, page], output, False, ['.html']))
+
+    def test_write_file_atomically(self):
+        """
+        Check that the file is written with the content, the directories are
+        created, the mode of a replaced file is kept and no temporary file is
+        left.
+        """
+
+        file_name = os.path.join(self.directory, 'a', 'b', 'page.html')
+        write_file_atomically(file_name, 'first á')
+        with open(file_name, 'r', encoding='utf-8') as opened_file:
+            self.assertEqual(opened_file.read(), 'first á')
+        os.chmod(file_name, 0o600)
+        write_file_atomically(file_name, 'second')
+        with open(file_name, 'r', encoding='utf-8') as opened_file:
+            self.assertEqual(opened_file.read(), 'second')
+        self.assertEqual(stat.S_IMODE(os.stat(file_name).st_mode), 0o600)
+        self.assertEqual(os.listdir(os.path.dirname(file_name)), ['page.html'])
+
+    def test_main(self):
+        """
+        Check that the files of a directory are processed and written and
+        that a failed file is reported without stop the others.
+        """
+
+        self.create_file(os.path.join('site', 'index.html'))
+        self.create_file(os.path.join('site', 'doc', 'page.html'))
+        site = os.path.join(self.directory, 'site')
+        output = os.path.join(self.directory, 'output')
+        status, stderr = self.run_main([site, '-o', output, '-j', '1'])
+        self.assertEqual(status, 0)
+        self.assertIn('2 file(s)', stderr)
+        for relative_name in ('index.html', os.path.join('doc', 'page.html')):
+            with open(
+                os.path.join(output, relative_name),
+                'r',
+                encoding='utf-8'
+            ) as opened_file:
+                self.assertIn('<h1', opened_file.read())
+
+        os.symlink(
+            os.path.join(self.directory, 'missing.html'),
+            os.path.join(site, 'broken.html')
+        )
+        shutil.rmtree(output)
+        status, stderr = self.run_main([site, '-o', output, '-j', '1'])
+        self.assertEqual(status, 1)
+        self.assertIn('broken.html: FileNotFoundError', stderr)
+        self.assertIn('1 file(s) failed', stderr)
+        self.assertTrue(os.path.exists(os.path.join(output, 'index.html')))
+        self.assertFalse(os.path.exists(os.path.join(output, 'broken.html')))
@@ -0,0 +1,728 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests of behavior of implementations of HTMLDOMParser, HTMLDOMElement and
+HTMLDOMTextNode.
+"""
+
+import html
+import io
+import json
+import mmap
+import tempfile
+import unittest
+from unittest import mock
+from bs4 import BeautifulSoup
+from bs4.builder._htmlparser import BeautifulSoupHTMLParser
+from bs4.builder._htmlparser import HTMLParserTreeBuilder
+from hatemile.util.html.bs import bssourcebuilder
+from hatemile.util.html.bs.bshtmldomparser import BeautifulSoupHTMLDOMParser
+from hatemile.util.html.htmldomtextnode import HTMLDOMTextNode
+
+# pylint: disable=ungrouped-imports
+try:
+    from lxml import etree
+    from hatemile.util.html.lxml.lxmlhtmldomparser import LXMLHTMLDOMParser
+except ImportError:
+    etree = None
+    LXMLHTMLDOMParser = None
+
+#: The HTML code used by tests.
+HTML_CODE = (
+    '<!DOCTYPE html><html lang="en"><head><title>Test</title></head><body>'
+    + '<h2 id="second">Second</h2><h1 id="first">First</h1>'
+    + '<form id="form"><label for="field">Name</label>'
+    + '<input id="field" type="text" required></form>'
+    + '<div id="container" class="box main"><p id="paragraph">a<b>b</b>c'
+    + '</p><ul><li>1</li><li>2</li></ul></div>'
+    + '</body></html>'
+)
+
+
+class HTMLDOMParserTest:
+    """
+    The behavior that all implementations of HTMLDOMParser must have.
+    """
+    # pylint: disable=no-member
+
+    def create_parser(self, html_code):
+        """
+        Returns a parser of HTML code.
+
+        :param html_code: The HTML code, not decoded or decoded, or the file
+                          object with the HTML code.
+        :type html_code: str or bytes or mmap.mmap or io.IOBase
+        :return: The parser.
+        :rtype: hatemile.util.html.htmldomparser.HTMLDOMParser
+        """
+
+        raise NotImplementedError()
+
+    def get_ids(self, elements):
+        """
+        Returns the IDs of elements.
+
+        :param elements: The elements.
+        :type elements: list(hatemile.util.html.htmldomelement.HTMLDOMElement)
+        :return: The IDs of elements.
+        :rtype: list(str)
+        """
+        # pylint: disable=no-self-use
+
+        return [element.get_attribute('id') for element in elements]
+
+    def test_find(self):
+        """
+        Check that the elements found are listed in document order and the
+        first and last results follow the order of selector.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        self.assertEqual(
+            self.get_ids(parser.find('h1,h2').list_results()),
+            ['second', 'first']
+        )
+        self.assertEqual(
+            parser.find('h1,h2').first_result().get_attribute('id'),
+            'first'
+        )
+        self.assertEqual(
+            parser.find('h1,h2').last_result().get_attribute('id'),
+            'second'
+        )
+        self.assertEqual(
+            self.get_ids(parser.find('.main [id]').list_results()),
+            ['paragraph']
+        )
+        self.assertIsNone(parser.find('table').first_result())
+        self.assertEqual(parser.find('table').list_results(), [])
+
+    def test_lazy_results(self):
+        """
+        Check that the iteration of results and the check of existence of
+        results agree with the list of results.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        for selector in ['li', 'h1,h2', '[id]', 'div > ul li', 'table']:
+            self.assertEqual(
+                list(parser.find(selector).iter_results()),
+                parser.find(selector).list_results()
+            )
+            self.assertEqual(
+                parser.find(selector).exists(),
+                bool(parser.find(selector).list_results())
+            )
+        container = parser.find('#container').first_result()
+        self.assertTrue(parser.find(container).find_children('ul').exists())
+        self.assertFalse(parser.find(container).find_children('li').exists())
+        self.assertEqual(
+            next(parser.find('li').iter_results()).get_text_content(),
+            '1'
+        )
+
+    def test_find_relatives(self):
+        """
+        Check the search of children, descendants and ancestors of elements
+        found.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        self.assertEqual(
+            len(parser.find('#container').find_children('li').list_results()),
+            0
+        )
+        self.assertEqual(
+            len(
+                parser.find('#container').find_descendants(
+                    'li'
+                ).list_results()
+            ),
+            2
+        )
+        self.assertEqual(
+            self.get_ids(
+                parser.find('#container').find_children('p').list_results()
+            ),
+            ['paragraph']
+        )
+        self.assertEqual(
+            self.get_ids(
+                parser.find('b').find_ancestors('[id]').list_results()
+            ),
+            ['container', 'paragraph']
+        )
+        paragraph = parser.find('#paragraph').first_result()
+        self.assertEqual(
+            parser.find('#container').find_children(
+                paragraph
+            ).first_result(),
+            paragraph
+        )
+        self.assertEqual(
+            parser.find('b').find_ancestors(paragraph).first_result(),
+            paragraph
+        )
+
+    def test_lookups(self):
+        """
+        Check the search of elements by ID and of labels by field, before and
+        after changes of document.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        self.assertEqual(
+            parser.get_element_by_id('field').get_tag_name(),
+            'INPUT'
+        )
+        self.assertIsNone(parser.get_element_by_id('none'))
+        self.assertEqual(len(parser.get_labels_for('field')), 1)
+
+        label = parser.create_element('label')
+        label.set_attribute('for', 'field')
+        parser.find('form').first_result().append_element(label)
+        self.assertEqual(len(parser.get_labels_for('field')), 2)
+        label.set_attribute('id', 'new-label')
+        self.assertEqual(parser.get_element_by_id('new-label'), label)
+        self.assertEqual(parser.find('#new-label').first_result(), label)
+        label.remove_node()
+        self.assertIsNone(parser.get_element_by_id('new-label'))
+        self.assertIsNone(parser.find('#new-label').first_result())
+        self.assertEqual(len(parser.get_labels_for('field')), 1)
+
+    def test_attributes(self):
+        """
+        Check the access of attributes of elements.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        container = parser.find('#container').first_result()
+        self.assertEqual(container.get_tag_name(), 'DIV')
+        self.assertEqual(container.get_attribute('class'), 'box main')
+        self.assertIsNone(container.get_attribute('title'))
+        self.assertTrue(container.has_attributes())
+        container.set_attribute('data-value', 'x')
+        self.assertTrue(container.has_attribute('data-value'))
+        self.assertEqual(
+            parser.find('[data-value="x"]').first_result(),
+            container
+        )
+        container.remove_attribute('data-value')
+        self.assertFalse(container.has_attribute('data-value'))
+        self.assertIsNone(parser.find('[data-value]').first_result())
+        self.assertFalse(parser.create_element('span').has_attributes())
+
+    def test_children(self):
+        """
+        Check the access of children and text of elements.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        paragraph = parser.find('#paragraph').first_result()
+        children = paragraph.get_children()
+        self.assertEqual(len(children), 3)
+        self.assertIsInstance(children[0], HTMLDOMTextNode)
+        self.assertEqual(children[0].get_text_content(), 'a')
+        self.assertEqual(children[1].get_tag_name(), 'B')
+        self.assertEqual(children[2].get_text_content(), 'c')
+        self.assertEqual(children[2].get_parent_element(), paragraph)
+        self.assertEqual(paragraph.get_text_content(), 'abc')
+        self.assertEqual(len(paragraph.get_children_elements()), 1)
+        self.assertTrue(paragraph.has_children())
+        self.assertTrue(paragraph.has_children_elements())
+        self.assertEqual(
+            paragraph.get_first_node_child().get_text_content(),
+            'a'
+        )
+        self.assertEqual(
+            paragraph.get_last_node_child().get_text_content(),
+            'c'
+        )
+        self.assertEqual(
+            paragraph.get_first_element_child().get_tag_name(),
+            'B'
+        )
+        self.assertEqual(
+            paragraph.get_last_element_child().get_tag_name(),
+            'B'
+        )
+        self.assertEqual(
+            paragraph.get_parent_element().get_attribute('id'),
+            'container'
+        )
+        self.assertEqual(paragraph.get_inner_html(), 'a<b>b</b>c')
+        self.assertEqual(
+            paragraph.get_outer_html(),
+            '<p id="paragraph">a<b>b</b>c</p>'
+        )
+        span = parser.create_element('span')
+        self.assertFalse(span.has_children())
+        self.assertIsNone(span.get_first_node_child())
+        self.assertIsNone(span.get_first_element_child())
+
+    def test_insertions(self):
+        """
+        Check the insertion of elements and texts around elements and texts.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        paragraph = parser.find('#paragraph').first_result()
+        bold = parser.find('b').first_result()
+
+        italic = parser.create_element('i')
+        italic.append_text('i')
+        bold.insert_before(italic)
+        self.assertEqual(paragraph.get_inner_html(), 'a<i>i</i><b>b</b>c')
+
+        emphasis = parser.create_element('em')
+        bold.insert_after(emphasis)
+        self.assertEqual(
+            paragraph.get_inner_html(),
+            'a<i>i</i><b>b</b><em></em>c'
+        )
+
+        strong = parser.create_element('strong')
+        paragraph.get_last_node_child().insert_before(strong)
+        self.assertEqual(
+            paragraph.get_inner_html(),
+            'a<i>i</i><b>b</b><em></em><strong></strong>c'
+        )
+
+        small = parser.create_element('small')
+        paragraph.get_first_node_child().insert_after(small)
+        self.assertEqual(
+            paragraph.get_inner_html(),
+            'a<small></small><i>i</i><b>b</b><em></em><strong></strong>c'
+        )
+
+        paragraph.prepend_text('<')
+        paragraph.append_text('>')
+        self.assertEqual(paragraph.get_text_content(), '<aibc>')
+        self.assertEqual(
+            parser.find('#paragraph i').first_result(),
+            italic
+        )
+
+    def test_removals(self):
+        """
+        Check the removal and the replacement of elements and texts.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        paragraph = parser.find('#paragraph').first_result()
+        bold = parser.find('b').first_result()
+
+        italic = parser.create_element('i')
+        bold.replace_node(italic)
+        self.assertEqual(paragraph.get_inner_html(), 'a<i></i>c')
+        self.assertIsNone(parser.find('b').first_result())
+        self.assertEqual(parser.find('#paragraph i').first_result(), italic)
+
+        italic.remove_node()
+        self.assertEqual(paragraph.get_inner_html(), 'ac')
+        self.assertIsNone(parser.find('i').first_result())
+
+        paragraph.normalize()
+        self.assertEqual(len(paragraph.get_children()), 1)
+        paragraph.get_first_node_child().remove_node()
+        self.assertFalse(paragraph.has_children())
+        paragraph.append_text('c')
+
+        span = parser.create_element('span')
+        span.append_text('s')
+        paragraph.prepend_element(span)
+        self.assertEqual(paragraph.get_inner_html(), '<span>s</span>c')
+        span.replace_node(span.get_first_node_child())
+        self.assertEqual(paragraph.get_text_content(), 'sc')
+        self.assertIsNone(parser.find('span').first_result())
+
+        list_element = parser.find('ul').first_result()
+        list_element.get_first_element_child().replace_node(
+            list_element.get_last_element_child()
+        )
+        self.assertEqual(list_element.get_inner_html(), '<li>2</li>')
+        self.assertEqual(len(parser.find('li').list_results()), 1)
+
+    def test_clone(self):
+        """
+        Check that a clone of element not changes the element.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        paragraph = parser.find('#paragraph').first_result()
+        clone = paragraph.clone_element()
+        clone.set_attribute('id', 'clone')
+        clone.append_text('d')
+        self.assertEqual(paragraph.get_text_content(), 'abc')
+        self.assertEqual(clone.get_text_content(), 'abcd')
+        self.assertIsNone(parser.get_element_by_id('clone'))
+        parser.find('#container').first_result().append_element(clone)
+        self.assertEqual(parser.get_element_by_id('clone'), clone)
+        self.assertEqual(
+            self.get_ids(parser.find('#container p').list_results()),
+            ['paragraph', 'clone']
+        )
+
+    def test_matches(self):
+        """
+        Check that the elements are matched by the same selectors that find
+        them.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        paragraph = parser.find('#paragraph').first_result()
+        self.assertTrue(paragraph.matches('p'))
+        self.assertTrue(paragraph.matches('.main > [id="paragraph"]'))
+        self.assertTrue(paragraph.matches('table,div p'))
+        self.assertFalse(paragraph.matches('form p'))
+        self.assertFalse(paragraph.matches('[id="container"]'))
+        field = parser.get_element_by_id('field')
+        self.assertTrue(field.matches('input[type="text"][required]'))
+        self.assertFalse(field.matches('input[type="checkbox"]'))
+
+    def test_write_html(self):
+        """
+        Check that the HTML code written in files is the HTML code of parser.
+        """
+
+        parser = self.create_parser(
+            HTML_CODE.replace('Second', 'S\u00e9cond').replace(
+                '<li>1</li>',
+                '<li><a href="#">1</a></li>' * 2000
+            )
+        )
+        text_file = io.StringIO()
+        parser.write_html(text_file)
+        self.assertEqual(text_file.getvalue(), parser.get_html())
+        binary_file = io.BytesIO()
+        parser.write_html(binary_file, 'utf-8')
+        self.assertEqual(
+            binary_file.getvalue().decode('utf-8'),
+            parser.get_html()
+        )
+        ascii_file = io.BytesIO()
+        parser.write_html(ascii_file, 'ascii')
+        self.assertIn(
+            'S\u00e9cond',
+            html.unescape(ascii_file.getvalue().decode('ascii'))
+        )
+
+    def test_encoded_input(self):
+        """
+        Check that the HTML code is parsed from bytes, file objects and
+        memory-mapped files, decoded by its declared encoding or by UTF-8.
+        """
+
+        code = HTML_CODE.replace('Second', 'S\u00e9cond')
+        expected = self.create_parser(code).get_html()
+        self.assertEqual(
+            self.create_parser(code.encode('utf-8')).get_html(),
+            expected
+        )
+        self.assertEqual(
+            self.create_parser(b'\xef\xbb\xbf' + code.encode('utf-8'))
+            .get_html(),
+            expected
+        )
+        self.assertEqual(
+            self.create_parser(io.BytesIO(code.encode('utf-8'))).get_html(),
+            expected
+        )
+        with tempfile.TemporaryFile() as html_file:
+            html_file.write(code.encode('utf-8'))
+            html_file.flush()
+            with mmap.mmap(
+                html_file.fileno(),
+                0,
+                access=mmap.ACCESS_READ
+            ) as buffer:
+                self.assertEqual(
+                    self.create_parser(buffer).get_html(),
+                    expected
+                )
+        parser = self.create_parser(
+            '<html><head><meta charset="iso-8859-1" /></head>'.encode('ascii')
+            + '<body><p id="text">S\u00e9cond</p></body></html>'.encode(
+                'iso-8859-1'
+            )
+        )
+        self.assertEqual(
+            parser.get_element_by_id('text').get_text_content(),
+            'S\u00e9cond'
+        )
+        self.assertIsNone(self.create_parser(b' ').find('p').first_result())
+
+    def test_identity(self):
+        """
+        Check that the objects that encapsulate the same element are reused,
+        equal and hashable, and that equal elements in different places are
+        distinct.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        items = parser.find('li').list_results()
+        first_item = parser.find('ul').first_result().get_first_element_child()
+        self.assertIs(items[0], first_item)
+        self.assertIn(first_item, set(items))
+        self.assertEqual(len(set(items + items)), 2)
+        clone = first_item.clone_element()
+        self.assertNotEqual(clone, first_item)
+        self.assertNotIn(clone, set(items))
+
+    def test_set_data(self):
+        """
+        Check that the object that encapsulate a element is reused for its new
+        native object and not for the old one.
+        """
+
+        parser = self.create_parser(HTML_CODE)
+        items = parser.find('li').list_results()
+        first_item = items[0]
+        old_data = first_item.get_data()
+        first_item.set_data(items[1].get_data())
+        self.assertEqual(first_item, items[1])
+        self.assertEqual(hash(first_item), hash(items[1]))
+        self.assertIs(parser.find('li').last_result(), first_item)
+        self.assertIs(parser.find('li').first_result().get_data(), old_data)
+        self.assertIsNot(parser.find('li').first_result(), first_item)
+
+
+class TestBeautifulSoupHTMLDOMParser(HTMLDOMParserTest, unittest.TestCase):
+    """
+    Check the behavior of BeautifulSoupHTMLDOMParser.
+    """
+
+    def create_parser(self, html_code):
+        return BeautifulSoupHTMLDOMParser(html_code)
+
+    def test_edit_script(self):
+        """
+        Check that the changes of document are recorded in a edit script that
+        makes the same changes in other document.
+        """
+
+        parser = BeautifulSoupHTMLDOMParser(HTML_CODE, record_edits=True)
+        self.assertEqual(parser.get_edit_script(), [])
+        field = parser.get_element_by_id('field')
+        field.set_attribute('aria-required', 'true')
+        field.remove_attribute('required')
+        span = parser.create_element('span')
+        span.append_text('a')
+        span.append_text('b')
+        field.insert_after(span)
+        span.prepend_text('c')
+        parser.find('li').first_result().remove_node()
+        parser.find('ul').first_result().append_element(field)
+        edit_script = json.loads(json.dumps(parser.get_edit_script()))
+        other_parser = BeautifulSoupHTMLDOMParser(HTML_CODE)
+        other_parser.apply_edit_script(edit_script)
+        self.assertEqual(other_parser.get_html(), parser.get_html())
+        self.assertEqual(
+            [edit[0] for edit in edit_script],
+            [
+                'attribute',
+                'attribute',
+                'insert',
+                'text',
+                'text',
+                'text',
+                'remove',
+                'remove',
+                'insert'
+            ]
+        )
+        self.assertIsNone(
+            BeautifulSoupHTMLDOMParser(HTML_CODE).get_edit_script()
+        )
+
+    def test_get_html_keeps_source(self):
+        """
+        Check that the HTML code of elements not changed is copied of the HTML
+        code parsed and that the elements changed are serialized again.
+        """
+
+        code = (
+            '<!DOCTYPE html>\n<html><head><title>T</title></head><body>\n'
+            + '<P CLASS=\'a\'  id=first>A &amp; B<BR></P>\n'
+            + '<ul><li id=item>1<li>2</ul>\n'
+            + '<div id="target"><span>S</span></div>\n'
+            + '</body></html>'
+        )
+        parser = self.create_parser(code)
+        self.assertEqual(parser.get_html(), code)
+        target = parser.get_element_by_id('target')
+        target.set_attribute('title', 'T')
+        target.append_element(parser.get_element_by_id('item'))
+        html_code = parser.get_html()
+        self.assertIn(
+            '<P CLASS=\'a\'  id=first>A &amp; B<BR></P>\n<ul></ul>\n',
+            html_code
+        )
+        self.assertIn(
+            '<div id="target" title="T"><span>S</span>'
+            + '<li id=item>1<li>2</li></li></div>',
+            html_code
+        )
+        self.assertEqual(
+            str(BeautifulSoup(html_code, 'html.parser')),
+            str(parser.get_parser())
+        )
+
+    def test_beautifulsoup_internals(self):
+        """
+        Check that the internals of BeautifulSoup used to keep the HTML code
+        parsed work with the installed version of BeautifulSoup.
+        """
+
+        document = BeautifulSoup('', 'html.parser')
+        self.assertTrue(
+            hasattr(document, 'tagStack'),
+            'BeautifulSoup.tagStack was removed'
+        )
+        self.assertTrue(
+            hasattr(HTMLParserTreeBuilder(), 'parser_args'),
+            'HTMLParserTreeBuilder.parser_args was removed'
+        )
+        self.assertTrue(
+            hasattr(
+                BeautifulSoupHTMLParser(document),
+                'already_closed_empty_element'
+            ),
+            'BeautifulSoupHTMLParser.already_closed_empty_element was removed'
+        )
+        self.assertTrue(
+            bssourcebuilder.is_supported(),
+            'The places of elements are not recorded'
+        )
+        self.assertIsNotNone(self.create_parser(HTML_CODE).source)
+
+    def test_get_html_without_source(self):
+        """
+        Check that the elements are serialized again, with the same result,
+        when the internals of BeautifulSoup used to keep the HTML code parsed
+        changed.
+        """
+
+        with mock.patch.object(
+            bssourcebuilder.BeautifulSoupSourceHTMLParser,
+            'close_open_elements',
+            side_effect=AttributeError('tagStack')
+        ):
+            self.assertFalse(bssourcebuilder.is_supported.__wrapped__())
+        # BeautifulSoup adds a line break after the doctype when it parses
+        # the HTML code again.
+        code = HTML_CODE.replace('<!DOCTYPE html>', '')
+        with mock.patch.object(
+            bssourcebuilder,
+            'is_supported',
+            return_value=False
+        ):
+            parser = self.create_parser(code)
+        self.assertIsNone(parser.source)
+        source_parser = self.create_parser(code)
+        self.assertIsNotNone(source_parser.source)
+        for current_parser in (parser, source_parser):
+            current_parser.get_element_by_id('first').set_attribute(
+                'title',
+                'T'
+            )
+            current_parser.get_element_by_id('container').append_element(
+                current_parser.get_element_by_id('form')
+            )
+            current_parser.get_element_by_id('paragraph').remove_node()
+        self.assertEqual(
+            str(BeautifulSoup(parser.get_html(), 'html.parser')),
+            str(BeautifulSoup(source_parser.get_html(), 'html.parser'))
+        )
+        self.assertEqual(parser.get_html(), str(parser.get_parser()))
+        self.assertIn('<h1 id="first" title="T">', parser.get_html())
+        self.assertNotIn('id="paragraph"', parser.get_html())
+
+
+class TestBeautifulSoupHTMLDOMParserWithoutIndex(
+    HTMLDOMParserTest,
+    unittest.TestCase
+):
+    """
+    Check the behavior of BeautifulSoupHTMLDOMParser without index.
+    """
+
+    def create_parser(self, html_code):
+        return BeautifulSoupHTMLDOMParser(html_code, False)
+
+
+@unittest.skipIf(LXMLHTMLDOMParser is None, 'lxml is not installed')
+class TestLXMLHTMLDOMParser(HTMLDOMParserTest, unittest.TestCase):
+    """
+    Check the behavior of LXMLHTMLDOMParser.
+    """
+
+    def create_parser(self, html_code):
+        return LXMLHTMLDOMParser(html_code)
+
+    def test_get_html(self):
+        """
+        Check that the HTML code keeps the document type declaration only if
+        the original HTML code has it.
+        """
+
+        self.assertTrue(
+            self.create_parser(HTML_CODE).get_html().startswith(
+                '<!DOCTYPE html>'
+            )
+        )
+        self.assertEqual(
+            self.create_parser('<p>a</p>').get_html(),
+            '<html><body><p>a</p></body></html>'
+        )
+        self.assertEqual(
+            self.create_parser('').get_html(),
+            '<html></html>'
+        )
+
+    def test_same_document_of_beautifulsoup(self):
+        """
+        Check that the changes in a document produce the same document of
+        BeautifulSoupHTMLDOMParser.
+        """
+
+        documents = []
+        for parser in (
+            BeautifulSoupHTMLDOMParser(HTML_CODE),
+            self.create_parser(HTML_CODE)
+        ):
+            paragraph = parser.find('#paragraph').first_result()
+            paragraph.get_first_node_child().insert_after(
+                parser.find('li').first_result()
+            )
+            paragraph.set_attribute('title', 'Paragraph')
+            parser.find('label').first_result().replace_node(
+                parser.find('b').first_result()
+            )
+            document = etree.fromstring(parser.get_html(), etree.HTMLParser())
+            for element in document.iter():
+                attributes = sorted(element.attrib.items())
+                element.attrib.clear()
+                element.attrib.update(attributes)
+            documents.append(etree.tostring(document, method='html'))
+        self.assertEqual(documents[0], documents[1])
+
+
+@unittest.skipIf(LXMLHTMLDOMParser is None, 'lxml is not installed')
+class TestLXMLHTMLDOMParserWithoutIndex(HTMLDOMParserTest, unittest.TestCase):
+    """
+    Check the behavior of LXMLHTMLDOMParser without index.
+    """
+
+    def create_parser(self, html_code):
+        return LXMLHTMLDOMParser(html_code, False)
@@ -0,0 +1,244 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests of behavior of implementations of ResultCache and of the result cache
+of batch processing.
+"""
+
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from hatemile.batch import SOLUTIONS
+from hatemile.batch import get_cache_key
+from hatemile.batch import make_accessible
+from hatemile.util.cache.fileresultcache import FileResultCache
+from hatemile.util.cache.memoryresultcache import MemoryResultCache
+from hatemile.util.configure import Configure
+
+#: The HTML code used by tests.
+HTML_CODE = (
+    '<!DOCTYPE html><html lang="en"><head><title>Test</title></head><body>'
+    + '<a href="#x" accesskey="a">Link</a><p id="x">Text</p></body></html>'
+)
+
+
+class ResultCacheTest:
+    """
+    The behavior that all implementations of ResultCache must have.
+    """
+    # pylint: disable=no-member
+
+    def create_cache(self, max_size):
+        """
+        Returns a empty cache.
+
+        :param max_size: The maximum size of cache.
+        :type max_size: int
+        :return: The cache.
+        :rtype: hatemile.util.cache.resultcache.ResultCache
+        """
+
+        raise NotImplementedError()
+
+    def test_get_and_put(self):
+        """
+        Check that the HTML codes are found by its key and that the hit rate
+        counts the searches.
+        """
+
+        cache = self.create_cache(100)
+        self.assertEqual(cache.get_hit_rate(), 0.0)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', '<p>á</p>')
+        cache.put('b', '<p>b\r\n</p>')
+        self.assertEqual(cache.get('a'), '<p>á</p>')
+        self.assertEqual(cache.get('b'), '<p>b\r\n</p>')
+        self.assertEqual(cache.get_hit_rate(), 2 / 3)
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_size(), 0)
+        self.assertEqual(cache.get_hit_rate(), 0.0)
+
+    def test_eviction(self):
+        """
+        Check that the least recently used HTML codes are removed when the
+        cache exceeds its maximum size.
+        """
+
+        cache = self.create_cache(30)
+        cache.put('a', 'a' * 10)
+        cache.put('b', 'b' * 10)
+        cache.put('c', 'c' * 10)
+        self.assertEqual(cache.get('a'), 'a' * 10)
+        cache.put('d', 'd' * 10)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'a' * 10)
+        self.assertEqual(cache.get('c'), 'c' * 10)
+        self.assertEqual(cache.get('d'), 'd' * 10)
+        self.assertEqual(cache.get_size(), 30)
+        cache.put('e', 'e' * 40)
+        self.assertIsNone(cache.get('e'))
+        self.assertEqual(cache.get_size(), 30)
+
+    def test_make_accessible(self):
+        """
+        Check that make_accessible returns the result kept in cache and that
+        the key changes with the options of processing.
+        """
+
+        configure = Configure()
+        cache = self.create_cache(1024 * 1024)
+        html = make_accessible(HTML_CODE, configure, cache=cache)
+        key = get_cache_key(HTML_CODE, configure)
+        self.assertEqual(cache.get(key), html)
+        cache.put(key, 'cached')
+        self.assertEqual(
+            make_accessible(HTML_CODE, configure, cache=cache),
+            'cached'
+        )
+        self.assertNotEqual(
+            make_accessible(
+                HTML_CODE,
+                configure,
+                user_agent='Mozilla/5.0 (Windows NT 10.0) Firefox/60.0',
+                cache=cache
+            ),
+            'cached'
+        )
+        self.assertEqual(
+            key,
+            get_cache_key(
+                HTML_CODE,
+                configure,
+                solutions=list(reversed(SOLUTIONS))
+            )
+        )
+        self.assertNotEqual(
+            key,
+            get_cache_key(HTML_CODE.encode('utf-8'), configure)
+        )
+        self.assertNotEqual(
+            key,
+            get_cache_key(HTML_CODE, configure, solutions=['display'])
+        )
+        self.assertNotEqual(
+            key,
+            get_cache_key(HTML_CODE, configure, 'https://example.com/')
+        )
+        self.assertNotEqual(
+            key,
+            get_cache_key(HTML_CODE, Configure(locale_configuration=(
+                'pt_BR',
+                'UTF-8'
+            )))
+        )
+
+
+class TestMemoryResultCache(ResultCacheTest, unittest.TestCase):
+    """
+    Check the behavior of MemoryResultCache.
+    """
+
+    def create_cache(self, max_size):
+        return MemoryResultCache(max_size)
+
+
+class TestFileResultCache(ResultCacheTest, unittest.TestCase):
+    """
+    Check the behavior of FileResultCache.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_cache(self, max_size):
+        return FileResultCache(self.directory, max_size)
+
+    def test_persistence(self):
+        """
+        Check that the HTML codes are kept between instances of cache, with
+        the order of use.
+        """
+
+        cache = self.create_cache(30)
+        cache.put('a', 'a' * 10)
+        cache.put('b', 'b' * 10)
+        cache.put('c', 'c' * 10)
+        cache = self.create_cache(30)
+        self.assertEqual(cache.get_size(), 30)
+        self.assertEqual(cache.get('b'), 'b' * 10)
+        cache.put('d', 'd' * 10)
+        self.assertEqual(cache.get_size(), 30)
+        self.assertEqual(self.create_cache(30).get('b'), 'b' * 10)
+
+    def test_shared_directory(self):
+        """
+        Check that the maximum size is respected by many caches that share
+        the directory, as the copies of cache in the processes of batch
+        processing, when the directory is scanned at each HTML code kept.
+        """
+
+        first_cache = FileResultCache(self.directory, 30, 1)
+        second_cache = pickle.loads(pickle.dumps(first_cache))
+        first_cache.put('a', 'a' * 10)
+        second_cache.put('b', 'b' * 10)
+        first_cache.put('c', 'c' * 10)
+        self.assertEqual(second_cache.get('a'), 'a' * 10)
+        second_cache.put('d', 'd' * 10)
+        first_cache.put('e', 'e' * 10)
+        self.assertEqual(first_cache.get_size(), 30)
+        self.assertEqual(second_cache.get_size(), 30)
+        self.assertIsNone(first_cache.get('b'))
+        self.assertIsNone(second_cache.get('c'))
+        self.assertEqual(first_cache.get('a'), 'a' * 10)
+        self.assertEqual(first_cache.get('d'), 'd' * 10)
+        self.assertEqual(first_cache.get('e'), 'e' * 10)
+
+    def test_scan_interval(self):
+        """
+        Check that the directory is scanned only after a number of HTML codes
+        kept or when the size of cache exceeds the maximum size.
+        """
+
+        cache = FileResultCache(self.directory, 100, 10)
+        with mock.patch.object(
+            cache,
+            '_load_entries',
+            wraps=cache._load_entries  # pylint: disable=protected-access
+        ) as load_entries:
+            for index in range(25):
+                cache.put(format(index, 'x'), 'a')
+            self.assertEqual(load_entries.call_count, 2)
+            cache.put('ff', 'a' * 90)
+            self.assertEqual(load_entries.call_count, 3)
+        self.assertEqual(cache.get_size(), 100)
+        self.assertIsNone(cache.get('e'))
+        self.assertEqual(cache.get('f'), 'a')
+
+    def test_invalid_key(self):
+        """
+        Check that the keys that are not hexadecimal digests are rejected.
+        """
+
+        cache = self.create_cache(100)
+        for key in ['', '../a', 'a/b', 'a.b', 'A', '.a']:
+            with self.assertRaises(ValueError):
+                cache.put(key, 'a')
+            with self.assertRaises(ValueError):
+                cache.get(key)
+        self.assertEqual(cache.get_size(), 0)
@@ -0,0 +1,166 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests of behavior of StyleSheetCache, with the stylesheets downloaded of a
+local HTTP server.
+"""
+
+import email.utils
+import shutil
+import tempfile
+import time
+import requests
+from hatemile.util.cache.stylesheetcache import StyleSheetCache
+from hatemile.util.css.tinycss.tinycssparser import TinyCSSParser
+from hatemile.util.html.bs.bshtmldomparser import BeautifulSoupHTMLDOMParser
+from . import httpserver
+
+#: The headers of responses of each path of local HTTP server.
+HEADERS = {
+    '/fresh.css': {'Cache-Control': 'max-age=3600'},
+    '/etag.css': {'Cache-Control': 'no-cache', 'ETag': '"v1"'},
+    '/modified.css': {
+        'Last-Modified': email.utils.formatdate(
+            time.time() - 3600,
+            usegmt=True
+        ),
+        'Cache-Control': 'max-age=0'
+    },
+    '/expired.css': {
+        'Expires': email.utils.formatdate(time.time() - 60, usegmt=True)
+    },
+    '/private.css': {'Cache-Control': 'no-store', 'ETag': '"v1"'}
+}
+
+
+class StyleSheetHandler(httpserver.RecordingHandler):
+    """
+    The StyleSheetHandler class responds the stylesheets with the cache
+    headers of its path. The conditional requests are responded with
+    304 Not Modified.
+    """
+
+    def respond(self):
+        if (
+            ('If-None-Match' in self.headers)
+            or ('If-Modified-Since' in self.headers)
+        ):
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self.send_stylesheet('.a{speak:none}', HEADERS[self.path])
+
+
+class TestStyleSheetCache(httpserver.HTTPServerTestCase):
+    """
+    Check the behavior of StyleSheetCache.
+    """
+
+    handler_class = StyleSheetHandler
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.session = requests.Session()
+
+    def tearDown(self):
+        self.session.close()
+        shutil.rmtree(self.directory)
+
+    def download(self, cache, path):
+        """
+        Returns the CSS code of a stylesheet of local HTTP server.
+
+        :param cache: The cache of stylesheets.
+        :type cache: hatemile.util.cache.stylesheetcache.StyleSheetCache
+        :param path: The path of stylesheet.
+        :type path: str
+        :return: The CSS code.
+        :rtype: str
+        """
+
+        return cache.download(self.session, self.url + path, 10)
+
+    def test_fresh(self):
+        """
+        Check that a fresh stylesheet is used without requests, also by other
+        cache with the same directory.
+        """
+
+        cache = StyleSheetCache(self.directory)
+        for _ in range(3):
+            self.assertEqual(
+                self.download(cache, '/fresh.css'),
+                '.a{speak:none}'
+            )
+        self.assertEqual(
+            self.download(StyleSheetCache(self.directory), '/fresh.css'),
+            '.a{speak:none}'
+        )
+        self.assertEqual(len(self.get_paths()), 1)
+        self.assertEqual(cache.get_hit_rate(), 2 / 3)
+
+    def test_revalidation(self):
+        """
+        Check that a stale stylesheet is revalidated by its validators.
+        """
+
+        cache = StyleSheetCache()
+        for path in ('/etag.css', '/modified.css', '/expired.css'):
+            self.download(cache, path)
+            self.assertEqual(self.download(cache, path), '.a{speak:none}')
+        self.assertEqual([
+            (
+                path,
+                headers.get('If-None-Match'),
+                headers.get('If-Modified-Since')
+            )
+            for path, headers in self.server.requests
+        ], [
+            ('/etag.css', None, None),
+            ('/etag.css', '"v1"', None),
+            ('/modified.css', None, None),
+            ('/modified.css', None, HEADERS['/modified.css']['Last-Modified']),
+            ('/expired.css', None, None),
+            ('/expired.css', None, None)
+        ])
+        self.assertEqual(cache.get_hit_rate(), 2 / 6)
+
+    def test_no_store(self):
+        """
+        Check that a stylesheet with Cache-Control: no-store is not kept.
+        """
+
+        cache = StyleSheetCache(self.directory)
+        self.download(cache, '/private.css')
+        self.assertIsNone(cache.get_entry(self.url + '/private.css'))
+        cache.clear()
+        self.assertEqual(cache.get_hit_rate(), 0.0)
+
+    def test_parser(self):
+        """
+        Check that the parsers of many pages share the stylesheets kept.
+        """
+
+        cache = StyleSheetCache()
+        for _ in range(3):
+            parser = TinyCSSParser(
+                BeautifulSoupHTMLDOMParser(
+                    '<html><head><link rel="stylesheet" href="fresh.css">'
+                    + '</head></html>'
+                ),
+                self.url + '/page.html',
+                cache=cache
+            )
+            self.assertEqual(len(parser.get_rules(['speak'])), 1)
+        self.assertEqual(len(self.get_paths()), 1)
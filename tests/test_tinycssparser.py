@@ -0,0 +1,313 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests of behavior of TinyCSSParser, with linked stylesheets downloaded of a
+local HTTP server, and of the cache of parsed stylesheets.
+"""
+
+import threading
+import unittest
+from hatemile.util.css.tinycss import tinycssparser
+from hatemile.util.css.tinycss.tinycssparser import TinyCSSParser
+from hatemile.util.html.bs.bshtmldomparser import BeautifulSoupHTMLDOMParser
+from . import httpserver
+
+#: The maximum time, in seconds, that the local HTTP server waits the other
+#: requests or the end of test.
+MAX_WAIT = 10
+
+
+class StyleSheetHandler(httpserver.RecordingHandler):
+    """
+    The StyleSheetHandler class responds the CSS code of stylesheets. The path
+    /N.css returns a rule with the speak property N, the path /missing.css is
+    not found and the path /slow.css is responded only at the end of test.
+    """
+
+    #: The barrier that the requests wait before respond, or None.
+    barrier = None
+
+    #: The event of end of test, that releases the slow requests.
+    release = threading.Event()
+
+    def respond(self):
+        name = self.path.strip('/').split('.')[0]
+        if name == 'slow':
+            StyleSheetHandler.release.wait(MAX_WAIT)
+        elif StyleSheetHandler.barrier is not None:
+            try:
+                StyleSheetHandler.barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+        if name == 'missing':
+            self.send_response(404)
+            self.end_headers()
+        else:
+            self.send_stylesheet('.' + name + '{speak:' + name + '}')
+
+
+class TestTinyCSSParser(httpserver.HTTPServerTestCase):
+    """
+    Check the behavior of TinyCSSParser with linked stylesheets.
+    """
+
+    handler_class = StyleSheetHandler
+
+    def setUp(self):
+        super().setUp()
+        StyleSheetHandler.release.clear()
+
+    def tearDown(self):
+        StyleSheetHandler.release.set()
+        StyleSheetHandler.barrier = None
+
+    def get_speak_values(self, html_code, **kwargs):
+        """
+        Returns the values of speak property of rules of a page.
+
+        :param html_code: The HTML code of page.
+        :type html_code: str
+        :return: The values of speak property, in order of rules.
+        :rtype: list(str)
+        """
+
+        parser = TinyCSSParser(
+            BeautifulSoupHTMLDOMParser(html_code),
+            self.url + '/page.html',
+            **kwargs
+        )
+        return [
+            rule.get_declarations('speak')[0].get_value()
+            for rule in parser.get_rules(['speak'])
+        ]
+
+    def test_concurrent_download(self):
+        """
+        Check that the linked stylesheets are downloaded at same time, once
+        by URL, and concatenated in order of page.
+        """
+
+        StyleSheetHandler.barrier = threading.Barrier(5, timeout=MAX_WAIT)
+        values = self.get_speak_values(
+            '<html><head>'
+            + '<link rel="stylesheet" href="a.css">'
+            + '<style>.b{speak:b}</style>'
+            + '<link rel="stylesheet" href="c.css">'
+            + '<link rel="stylesheet" href="/d.css">'
+            + '<link rel="stylesheet" href="missing.css">'
+            + '<link rel="stylesheet" href="e.css">'
+            + '<link rel="stylesheet" href="a.css">'
+            + '</head><body></body></html>'
+        )
+        self.assertEqual(values, ['a', 'b', 'c', 'd', 'e', 'a'])
+        self.assertEqual(len(self.get_paths()), 5)
+        self.assertEqual(self.server.peak, 5)
+
+    def test_timeouts(self):
+        """
+        Check that the stylesheets not downloaded in time are ignored.
+        """
+
+        html_code = (
+            '<html><head><link rel="stylesheet" href="slow.css">'
+            + '<link rel="stylesheet" href="a.css"></head></html>'
+        )
+        self.assertEqual(
+            self.get_speak_values(html_code, timeout=0.5),
+            ['a']
+        )
+        self.assertEqual(
+            self.get_speak_values(html_code, total_timeout=0.5),
+            ['a']
+        )
+
+    def test_close_downloader(self):
+        """
+        Check that a parser creates a new downloader after the downloader was
+        closed.
+        """
+
+        html_code = '<html><head><link rel="stylesheet" href="a.css"></head>'
+        tinycssparser.close_downloader()
+        self.assertEqual(self.get_speak_values(html_code), ['a'])
+        tinycssparser.close_downloader()
+        self.assertEqual(self.get_speak_values(html_code), ['a'])
+
+
+class TestParsedStyleSheets(unittest.TestCase):
+    """
+    Check the behavior of the cache of parsed stylesheets.
+    """
+
+    def test_shared_stylesheet(self):
+        """
+        Check that a stylesheet shared by many pages is parsed once and that
+        each stylesheet of page is parsed apart.
+        """
+
+        rules = []
+        for text in ('a', 'b'):
+            parser = TinyCSSParser(BeautifulSoupHTMLDOMParser(
+                '<html><head><style>.x{speak:none}.y{speak:none</style>'
+                + '<style>.z{speak:none}</style></head><body>'
+                + text
+                + '</body></html>'
+            ))
+            rules.append(parser.get_rules(['speak']))
+        self.assertEqual(
+            [rule.get_selector() for rule in rules[0]],
+            ['.x', '.y', '.z']
+        )
+        for rule, other_rule in zip(rules[0], rules[1]):
+            self.assertIs(rule, other_rule)
+
+    def test_eviction(self):
+        """
+        Check that the least recently used stylesheets are removed when the
+        cache exceeds its maximum number of stylesheets.
+        """
+
+        maximum = tinycssparser.MAX_PARSED_STYLESHEETS
+        rules = tinycssparser.parse_stylesheet('.first{speak:none}')
+        for index in range(maximum - 1):
+            tinycssparser.parse_stylesheet('.a' + str(index) + '{}')
+        self.assertIs(
+            tinycssparser.parse_stylesheet('.first{speak:none}'),
+            rules
+        )
+        for index in range(maximum):
+            tinycssparser.parse_stylesheet('.b' + str(index) + '{}')
+        self.assertLessEqual(
+            len(tinycssparser.PARSED_STYLESHEETS),
+            maximum
+        )
+        self.assertIsNot(
+            tinycssparser.parse_stylesheet('.first{speak:none}'),
+            rules
+        )
+
+
+class TestStyleSheetFilter(unittest.TestCase):
+    """
+    Check the behavior of the lexical filter of stylesheets.
+    """
+
+    def test_split_statements(self):
+        """
+        Check that the statements are split only at the end of top-level
+        blocks, outside of comments, strings and URLs.
+        """
+
+        self.assertEqual(
+            tinycssparser.split_statements(
+                '@import "a;b";.a[title="}"]{b:url(})}/*}*/'
+                + '@media x{.c{d:e}}.f{g:url("}")}'
+            ),
+            [
+                ('@import "a;b";.a[title="}"]{b:url(})}', False),
+                ('/*}*/@media x{.c{d:e}}', False),
+                ('.f{g:url("}")}', False),
+                ('', False)
+            ]
+        )
+        self.assertEqual(
+            tinycssparser.split_statements('.a{b:"\\}"}.c{\\64:e}'),
+            [('.a{b:"\\}"}', False), ('.c{\\64:e}', True), ('', False)]
+        )
+        for css_code in ('.a{b:c', '.a{b:"c}', '.a{b:c)}', '/*.a{}'):
+            self.assertIsNone(tinycssparser.split_statements(css_code))
+
+    def test_filter_stylesheet(self):
+        """
+        Check that only the statements that can contain the properties are
+        kept.
+        """
+
+        properties = ('speak', 'speak-as')
+        self.assertEqual(
+            tinycssparser.filter_stylesheet('.a{color:red}', properties),
+            ''
+        )
+        self.assertEqual(
+            tinycssparser.filter_stylesheet(
+                '.a{color:red}.b{SPEAK:none}.c{x:"\\f101"}.d{\\6d:0}',
+                properties
+            ),
+            '.b{SPEAK:none}.d{\\6d:0}'
+        )
+        self.assertEqual(
+            tinycssparser.filter_stylesheet(
+                '.a{color:red}.b{speak:none',
+                properties
+            ),
+            '.a{color:red}.b{speak:none'
+        )
+        parser = TinyCSSParser(
+            '.a{color:red}.b{sp\\65 ak:none}.c{speak-as:digits}'
+        )
+        self.assertEqual(
+            [rule.get_selector() for rule in parser.get_rules(['speak'])],
+            ['.b']
+        )
+        self.assertEqual(
+            [
+                rule.get_selector()
+                for rule in parser.get_rules(['speak', 'speak-as'])
+            ],
+            ['.b', '.c']
+        )
+
+
+class TestRuleIndex(unittest.TestCase):
+    """
+    Check the behavior of the index of rules and declarations by property.
+    """
+
+    def test_index(self):
+        """
+        Check that the rules found by index keep the order of stylesheets and
+        that the declarations keep the order of rule.
+        """
+
+        parser = TinyCSSParser(
+            '.a{speak:none}.b{color:red;speak-as:digits}'
+            + '.c{speak-as:spell-out;speak:normal;speak-as:digits}'
+            + '@media x{.d{speak:none}}.e{speak-header:once}'
+        )
+        self.assertEqual(
+            [rule.get_selector() for rule in parser.get_rules(['speak-as'])],
+            ['.b', '.c']
+        )
+        self.assertEqual(
+            [
+                rule.get_selector()
+                for rule in parser.get_rules(['speak', 'speak-as'])
+            ],
+            ['.a', '.b', '.c']
+        )
+        rules = parser.get_rules(['speak-header', 'speak', 'color'])
+        self.assertEqual(
+            [rule.get_selector() for rule in rules],
+            ['.a', '.b', '.c', '.e']
+        )
+        self.assertEqual(
+            [
+                declaration.get_value()
+                for declaration in rules[2].get_declarations('speak-as')
+            ],
+            ['spell-out', 'digits']
+        )
+        self.assertTrue(rules[1].has_property('color'))
+        self.assertFalse(rules[0].has_property('color'))
+        self.assertEqual(rules[0].get_declarations('color'), [])
+        self.assertEqual(parser.get_rules([]), [])